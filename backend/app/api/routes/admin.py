@@ -4,45 +4,129 @@ Admin API Routes
 API endpoints for managing custom song lists (admin features).
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from typing import Any, Dict, List, Literal, Optional, Union
+from datetime import datetime
 import random
 
 from app.custom_lists_models import (
     CustomSongList, CustomSong, CustomListSummary,
     CreateCustomListRequest, AddSongToListRequest,
     SearchSongRequest, FilterCustomListRequest,
-    GuestSubmissionRequest
+    GuestSubmissionRequest, BulkSongUpsertRequest,
+    BulkSongResult, BulkSongUpsertResponse, CustomSongPage,
+    ArtistAliasRequest, ArtistAliasImportRequest
 )
-from app.custom_list_manager import custom_list_manager
-from app.metadata_library import metadata_library
-from app.music_enrichment import local_enricher
-from src.spotify_client import SpotifyClient
-from src.deezer_client import DeezerClient
+from app.custom_list_manager import CustomListManager
+from app.artist_aliases import ArtistAliasStore
+from app.dependencies import (
+    get_artist_aliases, get_custom_list_manager, get_local_enricher, get_metadata_library
+)
+from app.pagination import (
+    NDJSON_MEDIA_TYPE, MAX_PAGE_SIZE,
+    paginate, parse_fields, project, ndjson_lines
+)
+from app.metadata_library import MetadataLibrary
+from app.library_stream import (
+    ImportFormatError, iter_import_records, export_chunks, gzip_chunks
+)
+from app.serialization import json_response
+from app.http_cache import (
+    STATIC_CACHE_CONTROL, make_etag, query_variant,
+    is_not_modified, not_modified_response
+)
+from app.music_enrichment import LocalMusicEnricher
 
 router = APIRouter()
 
 
+def songs_page_response(
+    list_id: str,
+    songs: List[CustomSong],
+    cursor: Optional[str],
+    page_size: Optional[int],
+    fields: Optional[Union[str, List[str]]],
+    format: str,
+    headers: Optional[dict] = None
+):
+    """
+    Build a paginated JSON or streamed NDJSON response for a song list.
+    
+    Args:
+        list_id: List the songs belong to
+        songs: All songs matching the request
+        cursor: Cursor from the previous page
+        page_size: Songs per page (None for DEFAULT_PAGE_SIZE)
+        fields: Song fields to include (None for all)
+        format: "json" for a CustomSongPage, "ndjson" for one song per line
+        headers: Extra response headers (e.g. ETag)
+        
+    Returns:
+        Pre-serialized JSON response or StreamingResponse
+    """
+    try:
+        field_names = parse_fields(fields, CustomSong)
+        page, next_cursor = paginate(songs, cursor, page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = dict(headers or {})
+    
+    if format == "ndjson":
+        headers["X-Total-Count"] = str(len(songs))
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return StreamingResponse(
+            ndjson_lines(page, field_names),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers
+        )
+    
+    body = CustomSongPage(
+        list_id=list_id,
+        total=len(songs),
+        songs=[project(song, field_names) for song in page],
+        next_cursor=next_cursor
+    )
+    return json_response(body.model_dump(), headers=headers)
+
+
 @router.get("/lists", response_model=List[CustomListSummary])
-async def list_all_custom_lists(active_only: bool = False):
+def list_all_custom_lists(
+    request: Request,
+    active_only: bool = False,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
     """
     Get all custom song lists (summaries).
     
+    Supports conditional GET: a matching If-None-Match returns 304.
+    
     Args:
         active_only: Only return active lists
         
     Returns:
         List of custom list summaries
     """
+    etag = make_etag("lists", custom_list_manager.get_index_version(), query_variant(request))
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
     try:
         summaries = custom_list_manager.list_all_summaries(active_only=active_only)
-        return summaries
+        return json_response([s.model_dump() for s in summaries], headers={"ETag": etag})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list custom lists: {str(e)}")
 
 
 @router.post("/lists", response_model=CustomSongList)
-async def create_custom_list(request: CreateCustomListRequest):
+def create_custom_list(
+    request: CreateCustomListRequest,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
     """
     Create a new custom song list.
     
@@ -65,32 +149,65 @@ async def create_custom_list(request: CreateCustomListRequest):
         raise HTTPException(status_code=500, detail=f"Failed to create list: {str(e)}")
 
 
-@router.get("/lists/{list_id}", response_model=CustomSongList)
-async def get_custom_list(list_id: str):
+@router.get("/lists/{list_id}", response_model=Union[CustomSongList, CustomSongPage])
+def get_custom_list(
+    request: Request,
+    list_id: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
     """
     Get a custom list by ID (with full song details).
     
+    Without paging options the whole list is returned. With `cursor`,
+    `limit` or `fields` the songs come back as a CustomSongPage of `limit`
+    songs (100 by default), and `format=ndjson` streams one page with one
+    song per line. Supports conditional GET.
+    
     Args:
         list_id: List ID
+        cursor: Cursor from the previous page
+        limit: Songs per page (default 100)
+        fields: Comma-separated song fields to include (e.g. "id,name,artist")
+        format: json or ndjson
         
     Returns:
-        The custom list
+        The custom list, or a page of its songs
     """
+    etag = make_etag(
+        "list", list_id, custom_list_manager.get_list_version(list_id), query_variant(request)
+    )
+    
+    # A deleted list must be a 404 even to a client holding its old ETag
     custom_list = custom_list_manager.get_list(list_id)
     if not custom_list:
         raise HTTPException(status_code=404, detail="Custom list not found")
-    return custom_list
+    
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    if cursor is None and limit is None and fields is None and format == "json":
+        return json_response(custom_list.model_dump(), headers={"ETag": etag})
+    
+    return songs_page_response(
+        list_id, custom_list.songs, cursor, limit, fields, format,
+        headers={"ETag": etag}
+    )
 
 
 @router.put("/lists/{list_id}", response_model=CustomSongList)
-async def update_custom_list(
+def update_custom_list(
     list_id: str,
     name: Optional[str] = None,
     description: Optional[str] = None,
     target_audience: Optional[str] = None,
     primary_decade: Optional[str] = None,
     primary_genre: Optional[str] = None,
-    is_active: Optional[bool] = None
+    is_active: Optional[bool] = None,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
 ):
     """
     Update a custom list's metadata.
@@ -124,7 +241,10 @@ async def update_custom_list(
 
 
 @router.delete("/lists/{list_id}")
-async def delete_custom_list(list_id: str):
+def delete_custom_list(
+    list_id: str,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
     """
     Delete a custom list.
     
@@ -142,7 +262,11 @@ async def delete_custom_list(list_id: str):
 
 
 @router.post("/lists/{list_id}/songs", response_model=CustomSongList)
-async def add_song_to_list(list_id: str, song: CustomSong):
+def add_song_to_list(
+    list_id: str,
+    song: CustomSong,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
     """
     Add a song to a custom list.
     
@@ -160,8 +284,77 @@ async def add_song_to_list(list_id: str, song: CustomSong):
     return custom_list
 
 
+@router.post("/lists/{list_id}/songs:bulk", response_model=BulkSongUpsertResponse)
+def bulk_upsert_songs(
+    list_id: str,
+    request: BulkSongUpsertRequest,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
+    """
+    Add or update many songs in a custom list with a single write.
+    
+    Each song is validated on its own, so one bad entry does not reject
+    the whole import.
+    
+    Args:
+        list_id: List ID
+        request: Songs to upsert
+        
+    Returns:
+        Per-song created, updated or rejected results
+    """
+    results: List[Optional[BulkSongResult]] = []
+    valid_songs = []
+    
+    for index, raw_song in enumerate(request.songs):
+        song_id = raw_song.get("id")
+        error = None
+        try:
+            song = CustomSong(**raw_song)
+            if not song.id.strip():
+                error = "id: Song ID must not be empty"
+        except ValidationError as e:
+            error = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            )
+        
+        if error:
+            results.append(BulkSongResult(
+                index=index,
+                id=str(song_id) if song_id is not None else None,
+                status="rejected",
+                error=error
+            ))
+            continue
+        
+        results.append(None)
+        valid_songs.append((index, song))
+    
+    upserted = custom_list_manager.upsert_songs(list_id, [song for _, song in valid_songs])
+    if not upserted:
+        raise HTTPException(status_code=404, detail="Custom list not found")
+    
+    custom_list, statuses = upserted
+    for (index, song), status in zip(valid_songs, statuses):
+        results[index] = BulkSongResult(index=index, id=song.id, status=status)
+    
+    return BulkSongUpsertResponse(
+        list_id=list_id,
+        song_count=len(custom_list.songs),
+        created=statuses.count("created"),
+        updated=statuses.count("updated"),
+        rejected=len(request.songs) - len(valid_songs),
+        results=results
+    )
+
+
 @router.delete("/lists/{list_id}/songs/{song_id}", response_model=CustomSongList)
-async def remove_song_from_list(list_id: str, song_id: str):
+def remove_song_from_list(
+    list_id: str,
+    song_id: str,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
     """
     Remove a song from a custom list.
     
@@ -179,16 +372,23 @@ async def remove_song_from_list(list_id: str, song_id: str):
     return custom_list
 
 
-@router.post("/lists/filter", response_model=List[CustomSong])
-async def filter_custom_list_songs(request: FilterCustomListRequest):
+@router.post("/lists/filter", response_model=Union[List[CustomSong], CustomSongPage])
+def filter_custom_list_songs(
+    request: FilterCustomListRequest,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
     """
     Filter songs from a custom list by criteria.
     
+    Setting `cursor`, `page_size` or `fields` returns a CustomSongPage
+    (100 songs unless `page_size` says otherwise) instead of a plain list;
+    `format=ndjson` streams one page with one song per line.
+    
     Args:
         request: Filter parameters
         
     Returns:
-        Filtered list of songs
+        Filtered list of songs, or a page of them
     """
     songs = custom_list_manager.filter_songs(
         list_id=request.list_id,
@@ -199,7 +399,39 @@ async def filter_custom_list_songs(request: FilterCustomListRequest):
         difficulty=request.difficulty,
         limit=request.limit
     )
-    return songs
+    
+    if (request.cursor is None and request.page_size is None
+            and request.fields is None and request.format == "json"):
+        return songs
+    
+    return songs_page_response(
+        request.list_id, songs, request.cursor,
+        request.page_size, request.fields, request.format
+    )
+
+
+@router.get("/search")
+def fuzzy_search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    metadata_library: MetadataLibrary = Depends(get_metadata_library),
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
+    """
+    Approximate search over the metadata library and every custom list.
+    
+    Finds artists and titles within a small edit distance of the query
+    (case, accents and punctuation ignored), e.g. to spot "Guns N Roses"
+    when the library already has "Guns N' Roses".
+    
+    Returns:
+        Library and list matches, closest first
+    """
+    return {
+        "query": q,
+        "library": metadata_library.fuzzy_search(q, limit),
+        "lists": custom_list_manager.fuzzy_search(q, limit)
+    }
 
 
 @router.post("/search-songs", response_model=List[dict])
@@ -219,6 +451,7 @@ async def search_songs_for_admin(request: SearchSongRequest):
         songs = []
         
         if request.provider == "deezer":
+            from src.deezer_client import DeezerClient
             client = DeezerClient()
             if request.mode == "genre":
                 songs = client.get_songs_by_genre(request.query, limit=25)
@@ -247,8 +480,9 @@ async def search_songs_for_admin(request: SearchSongRequest):
 
 
 @router.get("/categories/decades", response_model=List[str])
-async def get_decades():
+async def get_decades(response: Response):
     """Get list of available decades for categorization."""
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
     return [
         "1950s", "1960s", "1970s", "1980s", "1990s",
         "2000s", "2010s", "2020s"
@@ -256,8 +490,9 @@ async def get_decades():
 
 
 @router.get("/categories/genres", response_model=List[str])
-async def get_genres():
+async def get_genres(response: Response):
     """Get list of common genres for categorization."""
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
     return [
         "Rock", "Pop", "Hip Hop", "R&B", "Jazz",
         "Country", "Electronic", "Classical", "Blues",
@@ -267,8 +502,9 @@ async def get_genres():
 
 
 @router.get("/categories/styles", response_model=List[str])
-async def get_styles():
+async def get_styles(response: Response):
     """Get list of common styles for categorization."""
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
     return [
         "Classic", "Modern", "Alternative", "Mainstream",
         "Underground", "Experimental", "Traditional", "Contemporary"
@@ -276,8 +512,9 @@ async def get_styles():
 
 
 @router.get("/categories/moods", response_model=List[str])
-async def get_moods():
+async def get_moods(response: Response):
     """Get list of common moods for categorization."""
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
     return [
         "Upbeat", "Mellow", "Energetic", "Relaxing",
         "Happy", "Sad", "Romantic", "Party", "Chill",
@@ -288,9 +525,16 @@ async def get_moods():
 # ============================================================================
 # Metadata Library Endpoints
 # ============================================================================
+# Plain `def` handlers run in FastAPI's threadpool, so a slow export or
+# statistics read does not block the event loop; MetadataLibrary's
+# reader-writer lock keeps them consistent with concurrent saves.
 
 @router.get("/library/song/{provider}/{song_id}")
-async def get_library_song(provider: str, song_id: str):
+def get_library_song(
+    provider: str,
+    song_id: str,
+    metadata_library: MetadataLibrary = Depends(get_metadata_library)
+):
     """
     Check if a song exists in user's metadata library.
     
@@ -315,7 +559,7 @@ async def get_library_song(provider: str, song_id: str):
 
 
 @router.post("/library/song")
-async def save_library_song(
+def save_library_song(
     song_id: str,
     provider: str,
     name: str,
@@ -327,7 +571,8 @@ async def save_library_song(
     style: Optional[str] = None,
     mood: Optional[str] = None,
     difficulty: Optional[str] = None,
-    notes: Optional[str] = None
+    notes: Optional[str] = None,
+    metadata_library: MetadataLibrary = Depends(get_metadata_library)
 ):
     """
     Save song metadata to user's library.
@@ -360,8 +605,33 @@ async def save_library_song(
     }
 
 
+@router.delete("/library/song/{provider}/{song_id}")
+def delete_library_song(
+    provider: str,
+    song_id: str,
+    metadata_library: MetadataLibrary = Depends(get_metadata_library)
+):
+    """
+    Remove a song from user's metadata library.
+    
+    Args:
+        provider: Music provider (deezer, spotify, etc.)
+        song_id: Song ID from provider
+        
+    Returns:
+        Success message
+    """
+    if not metadata_library.delete_song(song_id, provider):
+        raise HTTPException(status_code=404, detail="Song not found in library")
+    
+    return {"message": "Song removed from library"}
+
+
 @router.get("/library/artist/{artist_name}")
-async def get_artist_suggestions(artist_name: str):
+def get_artist_suggestions(
+    artist_name: str,
+    metadata_library: MetadataLibrary = Depends(get_metadata_library)
+):
     """
     Get metadata suggestions based on user's history with this artist.
     
@@ -372,37 +642,123 @@ async def get_artist_suggestions(artist_name: str):
     return suggestions
 
 
+@router.get("/library/autocomplete")
+def autocomplete_library(
+    q: str = Query(..., max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    metadata_library: MetadataLibrary = Depends(get_metadata_library)
+):
+    """
+    As-you-type suggestions of artists and song titles from the library.
+    
+    Matches the start of any word (case and accents ignored); results are
+    ranked by how often each song has been used.
+    """
+    return metadata_library.autocomplete(q, limit)
+
+
 @router.get("/library/stats")
-async def get_library_statistics():
+def get_library_statistics(
+    request: Request,
+    metadata_library: MetadataLibrary = Depends(get_metadata_library)
+):
     """
     Get comprehensive statistics about user's metadata library.
     
+    Supports conditional GET: a matching If-None-Match returns 304.
+    
     Returns:
         Statistics including song count, genres, artists, etc.
     """
+    etag = make_etag("library-stats", metadata_library.get_version())
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
     stats = metadata_library.get_statistics()
-    return stats
+    return json_response(stats, headers={"ETag": etag})
 
 
 @router.get("/library/songs")
-async def get_all_library_songs():
-    """Get all songs in user's metadata library."""
+def get_all_library_songs(
+    request: Request,
+    format: Literal["json", "ndjson"] = "json",
+    metadata_library: MetadataLibrary = Depends(get_metadata_library)
+):
+    """
+    Get all songs in user's metadata library (supports conditional GET).
+    
+    format=ndjson streams one song per line instead of building the whole
+    response body in memory.
+    """
+    etag = make_etag("library-songs", metadata_library.get_version(), format)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    if format == "ndjson":
+        return StreamingResponse(
+            export_chunks(metadata_library.iter_songs(), "ndjson"),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"ETag": etag}
+        )
+    
     songs = metadata_library.get_all_songs()
-    return {
+    return json_response({
         "songs": songs,
         "count": len(songs)
-    }
+    }, headers={"ETag": etag})
 
 
 @router.get("/library/export")
-async def export_library():
-    """Export user's entire metadata library."""
-    library_data = metadata_library.export_library()
-    return library_data
+def export_library(
+    format: Literal["json", "array", "ndjson"] = "json",
+    since: Optional[str] = None,
+    gzip: bool = False,
+    metadata_library: MetadataLibrary = Depends(get_metadata_library)
+):
+    """
+    Export user's metadata library as a stream.
+    
+    Songs are serialized one at a time, so memory use does not grow with
+    the size of the library.
+    
+    Args:
+        format: "json" for the library object (same shape as before),
+            "array" for a JSON array of songs, "ndjson" for one song per line
+        since: Only include songs updated at or after this ISO timestamp
+            (use the X-Export-Timestamp of the previous export for
+            incremental backups)
+        gzip: Compress the download (.gz file)
+        
+    Returns:
+        Streaming export, importable by /library/import/stream
+    """
+    if since:
+        try:
+            datetime.fromisoformat(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="since must be an ISO timestamp")
+    
+    header = metadata_library.get_export_header()
+    chunks = export_chunks(metadata_library.iter_songs(since), format, header)
+    
+    extension = "ndjson" if format == "ndjson" else "json"
+    media_type = NDJSON_MEDIA_TYPE if format == "ndjson" else "application/json"
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        extension += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(chunks, media_type=media_type, headers={
+        "Content-Disposition": f'attachment; filename="metadata_library.{extension}"',
+        "X-Export-Timestamp": datetime.now().isoformat()
+    })
 
 
 @router.post("/library/import")
-async def import_library(data: dict):
+def import_library(
+    data: dict,
+    metadata_library: MetadataLibrary = Depends(get_metadata_library)
+):
     """
     Import metadata library data (merges with existing).
     
@@ -419,6 +775,177 @@ async def import_library(data: dict):
     }
 
 
+# Progress of the running (or most recent) streaming import
+import_progress: Dict[str, Any] = {"status": "idle"}
+
+
+@router.post("/library/import/stream")
+async def import_library_stream(
+    request: Request,
+    batch_size: int = Query(500, ge=1, le=5000),
+    metadata_library: MetadataLibrary = Depends(get_metadata_library)
+):
+    """
+    Import a large metadata library without loading it into memory.
+    
+    The body is parsed as it arrives and merged in batches, each batch
+    committed to the library log as one unit; a single checkpoint is
+    written at the end. Send NDJSON (Content-Type: application/x-ndjson,
+    one song per line) or JSON (an array of songs, or the object returned
+    by /library/export).
+    
+    Args:
+        batch_size: Songs merged per commit
+        
+    Returns:
+        Import summary (progress is available from /library/import/status)
+    """
+    if import_progress.get("status") == "running":
+        raise HTTPException(status_code=409, detail="An import is already running")
+    
+    content_type = request.headers.get("content-type", "")
+    import_progress.clear()
+    import_progress.update({
+        "status": "running",
+        "started": datetime.now().isoformat(),
+        "received": 0,
+        "imported": 0,
+        "skipped": 0,
+        "batches": 0
+    })
+    
+    batch = []
+    
+    async def merge_batch():
+        # Merging takes the library's write lock; wait for it off the event loop
+        import_progress["imported"] += await run_in_threadpool(
+            metadata_library.merge_songs, list(batch), allow_checkpoint=False
+        )
+        import_progress["batches"] += 1
+        batch.clear()
+    
+    try:
+        async for record in iter_import_records(request.stream(), ndjson="ndjson" in content_type):
+            import_progress["received"] += 1
+            if record is None:
+                import_progress["skipped"] += 1
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                await merge_batch()
+        if batch:
+            await merge_batch()
+    except ImportFormatError as e:
+        import_progress.update({"status": "failed", "error": str(e)})
+        raise HTTPException(status_code=400, detail=f"{e} (batches already merged are kept)")
+    except BaseException as e:
+        import_progress.update({"status": "failed", "error": str(e) or type(e).__name__})
+        raise
+    finally:
+        # Fold the appended batches into one snapshot
+        await run_in_threadpool(metadata_library.checkpoint)
+    
+    import_progress.update({"status": "completed", "finished": datetime.now().isoformat()})
+    return {
+        "success": True,
+        "imported_count": import_progress["imported"],
+        "received": import_progress["received"],
+        "skipped": import_progress["skipped"],
+        "batches": import_progress["batches"]
+    }
+
+
+@router.get("/library/import/status")
+async def get_import_status():
+    """Progress of the running or most recent streaming import."""
+    return dict(import_progress)
+
+
+# ============================================================================
+# Artist Alias Endpoints
+# ============================================================================
+
+@router.get("/aliases")
+def list_artist_aliases(artist_aliases: ArtistAliasStore = Depends(get_artist_aliases)):
+    """
+    Get every artist's aliases.
+    
+    Returns:
+        Canonical artist name -> aliases, and the number of artists
+    """
+    artists = artist_aliases.get_all()
+    return {"artists": artists, "count": len(artists)}
+
+
+@router.get("/aliases/{artist}")
+def get_artist_aliases_for(
+    artist: str,
+    artist_aliases: ArtistAliasStore = Depends(get_artist_aliases)
+):
+    """
+    Get the aliases of one artist (matched ignoring case, accents and "The").
+    """
+    return {"artist": artist, "aliases": artist_aliases.aliases_for(artist)}
+
+
+@router.put("/aliases/{artist}")
+def set_artist_aliases(
+    artist: str,
+    request: ArtistAliasRequest,
+    artist_aliases: ArtistAliasStore = Depends(get_artist_aliases)
+):
+    """
+    Replace an artist's aliases; an empty list removes the artist.
+    
+    Games started afterwards accept any alias of any credited artist.
+    """
+    aliases = artist_aliases.set_aliases(artist, request.aliases)
+    return {"artist": artist, "aliases": aliases}
+
+
+@router.delete("/aliases/{artist}")
+def delete_artist_aliases(
+    artist: str,
+    artist_aliases: ArtistAliasStore = Depends(get_artist_aliases)
+):
+    """Remove all aliases of an artist."""
+    if not artist_aliases.delete_artist(artist):
+        raise HTTPException(status_code=404, detail="Artist has no aliases")
+    return {"message": "Aliases removed"}
+
+
+@router.post("/aliases/import")
+def import_artist_aliases(
+    request: ArtistAliasImportRequest,
+    artist_aliases: ArtistAliasStore = Depends(get_artist_aliases)
+):
+    """
+    Import many artists' aliases in one write (merged unless replace=true).
+    
+    Returns:
+        Number of aliases added
+    """
+    added = artist_aliases.import_aliases(request.artists, replace=request.replace)
+    return {"success": True, "added_count": added}
+
+
+@router.post("/aliases/seed")
+def seed_artist_aliases(
+    metadata_library: MetadataLibrary = Depends(get_metadata_library),
+    artist_aliases: ArtistAliasStore = Depends(get_artist_aliases)
+):
+    """
+    Add the initials of every multi-word artist in the metadata library
+    as an alias ("Red Hot Chili Peppers" -> "RHCP").
+    
+    Returns:
+        Number of aliases added
+    """
+    artists = {song.get('artist') for _, song in metadata_library.iter_songs() if song.get('artist')}
+    added = artist_aliases.seed_from_artists(sorted(artists))
+    return {"success": True, "added_count": added, "artists_scanned": len(artists)}
+
+
 # ============================================================================
 # Enrichment Endpoint
 # ============================================================================
@@ -427,7 +954,8 @@ async def import_library(data: dict):
 async def enrich_song_metadata(
     artist: str,
     track: str,
-    release_year: Optional[int] = None
+    release_year: Optional[int] = None,
+    local_enricher: LocalMusicEnricher = Depends(get_local_enricher)
 ):
     """
     Enrich song metadata using local music knowledge.
@@ -469,7 +997,10 @@ async def enrich_song_metadata(
 # ============================================================================
 
 @router.post("/submit-playlist", response_model=CustomSongList)
-async def submit_guest_playlist(request: GuestSubmissionRequest):
+def submit_guest_playlist(
+    request: GuestSubmissionRequest,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
     """
     Submit a playlist from a guest contributor.
     
@@ -502,7 +1033,11 @@ async def submit_guest_playlist(request: GuestSubmissionRequest):
 
 
 @router.put("/lists/{list_id}/status", response_model=CustomSongList)
-async def update_list_status(list_id: str, status: str):
+def update_list_status(
+    list_id: str,
+    status: str,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager)
+):
     """
     Update the status of a playlist (for admin approval workflow).
     
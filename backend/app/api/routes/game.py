@@ -5,7 +5,10 @@ Endpoints for managing game sessions and processing guesses.
 Supports multiple music providers: Spotify, Deezer, and Demo mode.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import sys
 import os
 import random
@@ -13,40 +16,28 @@ import random
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
-from src.spotify_client import SpotifyClient
-from src.deezer_client import DeezerClient
 from app.models import (
     GameStartRequest, GameSession, GuessRequest, GuessResponse,
+    BatchGuessRequest, BatchGuessResponse, PlayerGuessResult,
     GameStats, Track, ErrorResponse
 )
-from app.game_manager import session_manager
+from app.game_manager import GameSessionManager
 from app.mock_data import filter_mock_songs
-from app.custom_list_manager import custom_list_manager
-import requests
+from app.custom_list_manager import CustomListManager
+from app.artist_aliases import ArtistAliasStore
+from app.leaderboard import LeaderboardService
+from app.deck_pool import DeckPool, deck_key
+from app.dependencies import (
+    get_artist_aliases, get_custom_list_manager, get_deck_pool, get_leaderboard,
+    get_session_manager
+)
+from app.serialization import dumps
+from src.guess_matcher import match_guess, match_guesses
 
 router = APIRouter()
 
-
-def refresh_deezer_preview_url(track_id: str) -> str | None:
-    """
-    Fetch a fresh preview URL from Deezer for a given track ID.
-    
-    Deezer preview URLs expire, so we need to fetch fresh ones when playing.
-    
-    Args:
-        track_id: Deezer track ID
-        
-    Returns:
-        Fresh preview URL or None if not available
-    """
-    try:
-        response = requests.get(f"https://api.deezer.com/track/{track_id}")
-        if response.ok:
-            data = response.json()
-            return data.get('preview')
-    except Exception as e:
-        print(f"Failed to refresh Deezer preview URL for track {track_id}: {e}")
-    return None
+# Seconds between keep-alive comments on an idle event stream
+EVENT_STREAM_KEEPALIVE = 15
 
 
 def get_music_client(provider: str, credentials: dict):
@@ -66,10 +57,14 @@ def get_music_client(provider: str, credentials: dict):
     if provider == "spotify":
         if not credentials.client_id or not credentials.client_secret:
             raise ValueError("Spotify requires client_id and client_secret")
+        # Provider SDKs are imported on first use so Deezer-only
+        # deployments never load spotipy
+        from src.spotify_client import SpotifyClient
         return SpotifyClient(credentials.client_id, credentials.client_secret)
     
     elif provider == "deezer":
         # Deezer doesn't require credentials for public API
+        from src.deezer_client import DeezerClient
         return DeezerClient()
     
     elif provider == "demo":
@@ -80,7 +75,13 @@ def get_music_client(provider: str, credentials: dict):
 
 
 @router.post("/start", response_model=GameSession)
-async def start_game(request: GameStartRequest):
+async def start_game(
+    request: GameStartRequest,
+    custom_list_manager: CustomListManager = Depends(get_custom_list_manager),
+    session_manager: GameSessionManager = Depends(get_session_manager),
+    artist_aliases: ArtistAliasStore = Depends(get_artist_aliases),
+    deck_pool: DeckPool = Depends(get_deck_pool)
+):
     """
     Start a new game session with the selected music provider.
     
@@ -99,55 +100,31 @@ async def start_game(request: GameStartRequest):
     Raises:
         HTTPException: If game creation fails
     """
+    tracks = None
     try:
         # Handle custom list mode
         if request.mode == "custom" or request.provider == "custom":
             if not request.custom_list_id:
                 raise HTTPException(status_code=400, detail="custom_list_id required for custom mode")
             
-            # Get filters if provided
-            filters = request.custom_filters or {}
+            # Take a prepared deck (songs, dicts and Track models ready); the
+            # pool is refilled in the background when it runs low. A deck is
+            # only built here when none is ready (the first game with these
+            # filters, or after an edit or DECK_MAX_AGE).
+            key = deck_key(request.custom_list_id, request.custom_filters, request.num_rounds)
+            deck = deck_pool.take(key)
+            if deck is None:
+                deck = await run_in_threadpool(deck_pool.build_deck, key)
             
-            # Get songs from custom list
-            songs = custom_list_manager.filter_songs(
-                list_id=request.custom_list_id,
-                decade=filters.get("decade"),
-                genre=filters.get("genre"),
-                style=filters.get("style"),
-                mood=filters.get("mood"),
-                difficulty=filters.get("difficulty")
-            )
-            
-            if not songs:
+            if deck is None:
                 raise HTTPException(
                     status_code=404,
                     detail="No songs found in custom list with the specified filters"
                 )
             
-            # Convert CustomSong to dict format expected by game
-            # Refresh Deezer preview URLs as they expire
-            converted_songs = []
-            for song in songs:
-                preview_url = song.preview_url
-                
-                # Refresh Deezer preview URLs (they expire)
-                if song.provider == 'deezer' and song.id:
-                    fresh_url = refresh_deezer_preview_url(song.id)
-                    if fresh_url:
-                        preview_url = fresh_url
-                
-                converted_songs.append({
-                    'id': song.id,
-                    'name': song.name,
-                    'artists': [{'name': song.artist}],
-                    'album': {'name': song.album or 'Unknown Album', 'release_date': 'Unknown'},
-                    'preview_url': preview_url,
-                    'provider': song.provider
-                })
-            
-            songs = converted_songs
-            random.shuffle(songs)
-            num_rounds = min(request.num_rounds, len(songs))
+            songs = deck.songs
+            tracks = deck.tracks
+            num_rounds = len(songs)
             
             # Increment play count for this list
             custom_list_manager.increment_play_count(request.custom_list_id)
@@ -156,7 +133,11 @@ async def start_game(request: GameStartRequest):
                 client_id="custom",
                 client_secret="",
                 songs=songs,
-                total_rounds=num_rounds
+                total_rounds=num_rounds,
+                aliases=artist_aliases,
+                leniency=request.leniency,
+                list_id=request.custom_list_id,
+                player_name=request.player_name
             )
         
         # Handle demo mode
@@ -172,7 +153,9 @@ async def start_game(request: GameStartRequest):
                 client_id="demo",
                 client_secret="demo",
                 songs=songs,
-                total_rounds=num_rounds
+                total_rounds=num_rounds,
+                aliases=artist_aliases,
+                leniency=request.leniency
             )
         
         else:
@@ -205,17 +188,20 @@ async def start_game(request: GameStartRequest):
                 client_id=request.provider,  # Pass provider name instead
                 client_secret="",
                 songs=songs,
-                total_rounds=num_rounds
+                total_rounds=num_rounds,
+                aliases=artist_aliases,
+                leniency=request.leniency
             )
             
             # Use the songs directly (already normalized)
             songs = songs[:num_rounds]
         
-        # Convert songs to Track models
-        tracks = [
-            session_manager.convert_track_to_model(song) 
-            for song in songs[:num_rounds]
-        ]
+        # Convert songs to Track models (custom decks come with them)
+        if tracks is None:
+            tracks = [
+                session_manager.convert_track_to_model(song) 
+                for song in songs[:num_rounds]
+            ]
         
         return GameSession(
             session_id=session_id,
@@ -225,6 +211,8 @@ async def start_game(request: GameStartRequest):
             songs=tracks
         )
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -232,7 +220,11 @@ async def start_game(request: GameStartRequest):
 
 
 @router.post("/guess", response_model=GuessResponse)
-async def submit_guess(request: GuessRequest):
+def submit_guess(
+    request: GuessRequest,
+    session_manager: GameSessionManager = Depends(get_session_manager),
+    leaderboard: LeaderboardService = Depends(get_leaderboard)
+):
     """
     Submit a guess for the current round.
     
@@ -249,74 +241,187 @@ async def submit_guess(request: GuessRequest):
     if not session:
         raise HTTPException(status_code=404, detail="Game session not found")
     
-    try:
-        # Get current song
-        if session.current_round >= len(session.songs):
-            raise HTTPException(status_code=400, detail="Game already completed")
-        
-        current_song = session.songs[session.current_round]
-        song_title = current_song['name']
-        # Get artist name(s) - primary artist for validation
-        primary_artist = current_song['artists'][0]['name'] if current_song['artists'] else 'Unknown Artist'
-        all_artists = ", ".join([a['name'] for a in current_song['artists']])
-        
-        # Validate guess against artist name (not song title)
-        is_correct = session.game_engine._validate_guess(request.guess, primary_artist)
-        
-        points_earned = 0.0
-        artist_hint = None
-        is_final_guess = False
-        
-        if not session.first_guess_made:
-            # First guess
-            session.first_guess_made = True
+    # Guesses run in the threadpool; a double-submitted guess must not
+    # score twice
+    with session.guess_lock:
+        try:
+            # Get current song
+            if session.current_round >= len(session.songs):
+                raise HTTPException(status_code=400, detail="Game already completed")
             
-            if is_correct:
-                # Correct on first try
-                session.game_engine.score += session.game_engine.FIRST_GUESS_SCORE
-                session.game_engine.total_questions += 1
-                points_earned = 2.0
+            current_song = session.songs[session.current_round]
+            song_title = current_song['name']
+            all_artists = ", ".join([a['name'] for a in current_song['artists']])
+            
+            # Validate guess against the precomputed key (any credited artist or alias)
+            is_correct = match_guess(
+                request.guess,
+                session.answer_keys[session.current_round],
+                session.leniency
+            )
+            
+            points_earned = 0.0
+            artist_hint = None
+            is_final_guess = False
+            
+            if not session.first_guess_made:
+                # First guess
+                session.first_guess_made = True
+                
+                if is_correct:
+                    # Correct on first try
+                    session.game_engine.score += session.game_engine.FIRST_GUESS_SCORE
+                    session.game_engine.total_questions += 1
+                    points_earned = 2.0
+                    is_final_guess = True
+                    
+                    # Move to next round
+                    session.current_round += 1
+                    session.first_guess_made = False
+                else:
+                    # Incorrect, give hint for second guess
+                    artist_hint = song_title  # Hint with the song title
+                    points_earned = 0.0
+            else:
+                # Second guess
                 is_final_guess = True
+                session.game_engine.total_questions += 1
+                
+                if is_correct:
+                    # Correct on second try
+                    session.game_engine.score += session.game_engine.SECOND_GUESS_SCORE
+                    points_earned = 1.0
+                else:
+                    # Incorrect on second try
+                    points_earned = 0.0
                 
                 # Move to next round
                 session.current_round += 1
                 session.first_guess_made = False
-            else:
-                # Incorrect, give hint for second guess
-                artist_hint = song_title  # Hint with the song title
-                points_earned = 0.0
-        else:
-            # Second guess
-            is_final_guess = True
-            session.game_engine.total_questions += 1
             
-            if is_correct:
-                # Correct on second try
-                session.game_engine.score += session.game_engine.SECOND_GUESS_SCORE
-                points_earned = 1.0
-            else:
-                # Incorrect on second try
-                points_earned = 0.0
+            # Finished custom-list games go on the list's leaderboard
+            if is_final_guess and session.list_id and session.current_round >= len(session.songs):
+                leaderboard.record(
+                    session.list_id,
+                    session.game_engine.score,
+                    session.game_engine.total_questions,
+                    player_name=session.player_name,
+                    session_id=session.session_id
+                )
+            
+            publish_guess_events(session, is_correct, points_earned, is_final_guess)
             
-            # Move to next round
-            session.current_round += 1
-            session.first_guess_made = False
+            return GuessResponse(
+                correct=is_correct,
+                points_earned=points_earned,
+                correct_answer=all_artists if is_final_guess and not is_correct else None,
+                artist_hint=song_title,  # Now we hint with the song title instead
+                total_score=session.game_engine.score,
+                is_final_guess=is_final_guess
+            )
+            
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to process guess: {str(e)}")
+
+
+def final_stats(session) -> GameStats:
+    """Statistics of a session's game so far."""
+    stats = session.game_engine._get_game_stats()
+    return GameStats(
+        total_rounds=stats['total'],
+        score=stats['score'],
+        percentage=stats['percentage'],
+        rank=stats['rank']
+    )
+
+
+def publish_guess_events(session, is_correct: bool, points_earned: float, is_final_guess: bool):
+    """
+    Push a guess and the state change it caused to the session's event streams.
+    
+    Events are published even with no stream open, so a client that
+    reconnects with Last-Event-ID catches up on what it missed.
+    """
+    round_number = session.current_round - 1 if is_final_guess else session.current_round
+    session.publish("guess_result", {
+        "round": round_number,
+        "correct": is_correct,
+        "points_earned": points_earned,
+        "is_final_guess": is_final_guess
+    })
+    session.publish("score", {
+        "score": session.game_engine.score,
+        "total_questions": session.game_engine.total_questions
+    })
+    if not is_final_guess:
+        return
+    if session.current_round >= len(session.songs):
+        session.publish("game_over", final_stats(session).model_dump())
+    else:
+        session.publish("round_start", {
+            "round": session.current_round,
+            "total_rounds": session.total_rounds
+        })
+
+
+@router.post("/guess/batch", response_model=BatchGuessResponse)
+def submit_guess_batch(
+    request: BatchGuessRequest,
+    session_manager: GameSessionManager = Depends(get_session_manager)
+):
+    """
+    Score every player's guess for one round in a single call (event mode).
+    
+    The host's session supplies the song and its precomputed answer key;
+    the session itself is not advanced or scored, so the host keeps
+    control of the rounds and the caller keeps each player's total.
+    
+    Args:
+        request: Session, round and the players' guesses
         
-        return GuessResponse(
+    Returns:
+        BatchGuessResponse: Per-player results, in request order
+        
+    Raises:
+        HTTPException: If the session or round does not exist
+    """
+    session = session_manager.get_session(request.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Game session not found")
+    
+    round_number = session.current_round if request.round_number is None else request.round_number
+    if round_number >= len(session.songs):
+        raise HTTPException(status_code=400, detail="Round not found")
+    
+    song = session.songs[round_number]
+    correct = match_guesses(
+        (player.guess for player in request.guesses),
+        session.answer_keys[round_number],
+        session.leniency
+    )
+    
+    results = [
+        PlayerGuessResult(
+            player_id=player.player_id,
             correct=is_correct,
-            points_earned=points_earned,
-            correct_answer=all_artists if is_final_guess and not is_correct else None,
-            artist_hint=song_title,  # Now we hint with the song title instead
-            total_score=session.game_engine.score,
-            is_final_guess=is_final_guess
+            points_earned=(1.0 if player.second_guess else 2.0) if is_correct else 0.0
         )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to process guess: {str(e)}")
+        for player, is_correct in zip(request.guesses, correct)
+    ]
+    
+    return BatchGuessResponse(
+        round_number=round_number,
+        correct_answer=", ".join(a['name'] for a in song['artists']),
+        correct_count=sum(correct),
+        results=results
+    )
 
 
 @router.get("/session/{session_id}", response_model=dict)
-async def get_session_info(session_id: str):
+async def get_session_info(
+    session_id: str,
+    session_manager: GameSessionManager = Depends(get_session_manager)
+):
     """
     Get current session information.
     
@@ -339,8 +444,76 @@ async def get_session_info(session_id: str):
     }
 
 
+@router.get("/session/{session_id}/events")
+async def stream_session_events(
+    session_id: str,
+    request: Request,
+    last_event_id: int | None = Header(default=None),
+    session_manager: GameSessionManager = Depends(get_session_manager)
+):
+    """
+    Stream session changes as Server-Sent Events instead of polling.
+    
+    The stream opens with a "state" event (the same fields as
+    /session/{id}), then sends round_start, guess_result, score and
+    game_over events as they happen and ends after game_over or when the
+    session is deleted. Idle streams get a keep-alive comment every
+    EVENT_STREAM_KEEPALIVE seconds. Browsers reconnect automatically
+    with Last-Event-ID and receive the events they missed.
+    
+    Args:
+        session_id: Session identifier
+        
+    Returns:
+        StreamingResponse: text/event-stream
+    """
+    session = session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Game session not found")
+    
+    queue, missed = session.subscribe(last_event_id)
+    
+    def encode(event_id, event_type, data) -> bytes:
+        # Snapshots carry no ID, so they do not move the client's Last-Event-ID
+        head = b"" if event_id is None else b"id: %d\n" % event_id
+        return head + b"event: %s\ndata: %s\n\n" % (event_type.encode(), dumps(data))
+    
+    async def events():
+        try:
+            yield encode(None, "state", {"session_id": session_id, **session.state()})
+            for event in missed:
+                yield encode(*event)
+            if session.current_round >= len(session.songs):
+                if not any(event[1] == "game_over" for event in missed):
+                    yield encode(None, "game_over", final_stats(session).model_dump())
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), EVENT_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield b": keep-alive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield encode(*event)
+                if event[1] == "game_over":
+                    return
+        finally:
+            session.unsubscribe(queue)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+
 @router.get("/stats/{session_id}", response_model=GameStats)
-async def get_game_stats(session_id: str):
+async def get_game_stats(
+    session_id: str,
+    session_manager: GameSessionManager = Depends(get_session_manager)
+):
     """
     Get final game statistics.
     
@@ -354,18 +527,45 @@ async def get_game_stats(session_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="Game session not found")
     
-    stats = session.game_engine._get_game_stats()
+    return final_stats(session)
+
+
+@router.get("/leaderboard/{list_id}", response_model=dict)
+def get_leaderboard_for_list(
+    list_id: str,
+    window: str = Query(default="all", pattern="^(all|today)$"),
+    limit: int = Query(default=10, ge=1, le=100),
+    session_id: str | None = None,
+    leaderboard: LeaderboardService = Depends(get_leaderboard)
+):
+    """
+    Best final scores of games played from a custom list.
     
-    return GameStats(
-        total_rounds=stats['total'],
-        score=stats['score'],
-        percentage=stats['percentage'],
-        rank=stats['rank']
-    )
+    Args:
+        list_id: Custom list ID
+        window: "all" for every game, "today" for games finished today
+        limit: Number of top scores
+        session_id: A finished game to include as "you" with its rank
+        
+    Returns:
+        dict: total_entries, top (rank, player_name, score, total_rounds,
+            recorded_at) and you
+    """
+    if not leaderboard.is_valid_list_id(list_id):
+        raise HTTPException(status_code=400, detail="Invalid list ID")
+    
+    return {
+        "list_id": list_id,
+        "window": window,
+        **leaderboard.top(list_id, window=window, limit=limit, session_id=session_id)
+    }
 
 
 @router.delete("/session/{session_id}")
-async def end_game(session_id: str):
+async def end_game(
+    session_id: str,
+    session_manager: GameSessionManager = Depends(get_session_manager)
+):
     """
     End a game session and clean up.
     
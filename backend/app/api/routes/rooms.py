@@ -0,0 +1,213 @@
+"""
+Room API Routes
+
+Multiplayer rooms for events: the host opens a room on a game session and
+advances the rounds, players join by code and guess over a WebSocket.
+
+WebSocket protocol (/api/rooms/{code}/ws), JSON text frames:
+    connect    ?name=Alice (player), &rejoin_token=... to rejoin with the
+               token from a previous welcome, or ?host_token=... (host)
+    receive    welcome, round_started, guess_result, round_ended,
+               scoreboard, game_over, error
+    send       {"type": "guess", "guess": "Queen"}          (players)
+               {"type": "next_round"} / {"type": "end_round"} (host)
+"""
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+
+from app.models import RoomCreateRequest, RoomCreateResponse, RoomHostRequest
+from app.game_manager import GameSessionManager
+from app.rooms import Connection, Room, RoomManager, encode_event
+from app.dependencies import get_room_manager, get_session_manager
+from app.serialization import loads
+
+router = APIRouter()
+
+
+def get_room_or_404(code: str, room_manager: RoomManager) -> Room:
+    """Look up a room or raise 404."""
+    room = room_manager.get_room(code)
+    if not room:
+        raise HTTPException(status_code=404, detail="Room not found")
+    return room
+
+
+def run_host_action(room: Room, action: str) -> bool:
+    """
+    Apply a host action to a room.
+    
+    Returns:
+        False if the action is unknown
+    """
+    if action == "next_round":
+        room.next_round()
+    elif action == "end_round":
+        room.end_round()
+    else:
+        return False
+    return True
+
+
+@router.post("", response_model=RoomCreateResponse)
+async def create_room(
+    request: RoomCreateRequest,
+    session_manager: GameSessionManager = Depends(get_session_manager),
+    room_manager: RoomManager = Depends(get_room_manager)
+):
+    """
+    Open a room on a game session started with /api/game/start.
+    
+    The room shares the session's songs, answer keys and leniency; the
+    host plays the audio and advances the rounds.
+    
+    Args:
+        request: Host session ID
+    
+    Returns:
+        RoomCreateResponse: Room code and host token
+    """
+    session = session_manager.get_session(request.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Game session not found")
+    
+    room = room_manager.create_room(session)
+    return RoomCreateResponse(
+        code=room.code,
+        host_token=room.host_token,
+        total_rounds=room.total_rounds
+    )
+
+
+@router.get("/{code}", response_model=dict)
+async def get_room(code: str, room_manager: RoomManager = Depends(get_room_manager)):
+    """
+    Get a room's state and scoreboard.
+    
+    Args:
+        code: Room code
+    
+    Returns:
+        dict: Round state, player count and top players
+    """
+    room = get_room_or_404(code, room_manager)
+    return {**room.state(), "scoreboard": room.scoreboard()}
+
+
+@router.post("/{code}/{action}", response_model=dict)
+async def host_action(
+    code: str,
+    action: str,
+    request: RoomHostRequest,
+    room_manager: RoomManager = Depends(get_room_manager)
+):
+    """
+    Advance a room without a WebSocket ("next_round" or "end_round").
+    
+    Args:
+        code: Room code
+        action: Host action
+        request: Host token
+    
+    Returns:
+        dict: Room state after the action
+    """
+    room = get_room_or_404(code, room_manager)
+    if not room.is_host(request.host_token):
+        raise HTTPException(status_code=403, detail="Invalid host token")
+    if not run_host_action(room, action):
+        raise HTTPException(status_code=404, detail=f"Unknown action: {action}")
+    return room.state()
+
+
+@router.delete("/{code}")
+async def close_room(
+    code: str,
+    request: RoomHostRequest,
+    room_manager: RoomManager = Depends(get_room_manager)
+):
+    """
+    Close a room and disconnect everyone.
+    
+    Args:
+        code: Room code
+        request: Host token
+    """
+    room = get_room_or_404(code, room_manager)
+    if not room.is_host(request.host_token):
+        raise HTTPException(status_code=403, detail="Invalid host token")
+    for connection in list(room.broadcaster.connections):
+        room.broadcaster.disconnect(connection)
+    room_manager.delete_room(code)
+    return {"message": "Room closed"}
+
+
+@router.websocket("/{code}/ws")
+async def room_socket(
+    websocket: WebSocket,
+    code: str,
+    name: str = "",
+    rejoin_token: Optional[str] = None,
+    host_token: Optional[str] = None,
+    room_manager: RoomManager = Depends(get_room_manager)
+):
+    """
+    Join a room as a player (or as the host, with its token).
+    
+    Room-wide updates arrive as they are published; guess results are
+    sent only to the player who guessed. The welcome carries the player's
+    rejoin token, which is never broadcast: player IDs are on the public
+    scoreboard, so reconnecting by ID would let anyone take a seat.
+    """
+    room = room_manager.get_room(code)
+    if not room:
+        await websocket.close(code=4404)
+        return
+    
+    is_host = room.is_host(host_token)
+    player = None
+    if not is_host:
+        try:
+            player = room.join(name, rejoin_token)
+        except ValueError:
+            await websocket.close(code=4409)
+            return
+    
+    await websocket.accept()
+    connection = Connection(websocket, player.player_id if player else None)
+    sender = asyncio.create_task(connection.run_sender())
+    connection.send(encode_event({
+        "type": "welcome",
+        "player_id": connection.player_id,
+        "rejoin_token": player.rejoin_token if player else None,
+        "name": player.name if player else None,
+        "score": player.score if player else None,
+        "is_host": is_host,
+        **room.state()
+    }))
+    room.broadcaster.connect(connection)
+    
+    try:
+        while True:
+            try:
+                message = loads(await websocket.receive_text())
+                kind = message.get("type")
+            except (ValueError, AttributeError):
+                connection.send(encode_event({"type": "error", "detail": "Invalid message"}))
+                continue
+            
+            if kind == "guess" and player is not None:
+                result = room.guess(player, str(message.get("guess", "")))
+                connection.send(encode_event(result))
+            elif is_host and run_host_action(room, kind):
+                continue
+            else:
+                connection.send(encode_event({"type": "error", "detail": f"Unknown message: {kind}"}))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # The client is gone, so anything still queued can be dropped
+        room.broadcaster.disconnect(connection)
+        sender.cancel()
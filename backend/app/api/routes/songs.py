@@ -4,7 +4,7 @@ Songs API Routes
 Endpoints for searching and retrieving songs from Spotify.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 import sys
 import os
@@ -12,15 +12,18 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
-from src.spotify_client import SpotifyClient
 from app.models import Track, SongSearchRequest, ErrorResponse
-from app.game_manager import session_manager
+from app.game_manager import GameSessionManager
+from app.dependencies import get_session_manager
 
 router = APIRouter()
 
 
 @router.post("/search", response_model=List[Track])
-async def search_songs(request: SongSearchRequest):
+async def search_songs(
+    request: SongSearchRequest,
+    session_manager: GameSessionManager = Depends(get_session_manager)
+):
     """
     Search for songs based on mode and query.
     
@@ -35,6 +38,7 @@ async def search_songs(request: SongSearchRequest):
     """
     try:
         # Initialize Spotify client
+        from src.spotify_client import SpotifyClient
         spotify_client = SpotifyClient(
             request.credentials.client_id,
             request.credentials.client_secret
@@ -0,0 +1,233 @@
+"""
+Artist Alias Store
+
+Other names players use for artists ("GNR" for Guns N' Roses, "MJ" for
+Michael Jackson), so a guess may name any credited artist by any alias.
+
+Aliases are stored in ``artist_aliases.json`` as canonical artist name ->
+list of aliases. They are edited through the admin API and compiled into
+hash maps keyed by normalized name (see src.guess_matcher.normalize_answer),
+so "The Beatles", "beatles" and "BEATLES" share one entry. Writes replace
+the file atomically under a file lock, and other workers reload it when
+its signature changes.
+"""
+
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, TypeVar
+
+from app.file_storage import atomic_write_json, file_lock, file_signature
+from app.serialization import read_json_file
+from src.guess_matcher import normalize_answer
+from src.text_utils import normalize_text
+
+T = TypeVar("T")
+
+
+def artist_initials(artist: Optional[str]) -> Optional[str]:
+    """
+    Initials of a multi-word artist name ("Guns N' Roses" -> "GNR").
+    
+    A leading "The" and "and"/"&" are skipped.
+    
+    Args:
+        artist: Artist name
+    
+    Returns:
+        Upper-case initials, or None for single-word names
+    """
+    words = [word for word in normalize_text(artist).split() if word != "and"]
+    if words and words[0] == "the":
+        words = words[1:]
+    if len(words) < 2:
+        return None
+    return "".join(word[0] for word in words).upper()
+
+
+class ArtistAliasStore:
+    """
+    Admin-editable aliases compiled into O(1) lookups.
+    
+    _aliases maps a normalized canonical artist to its alias names, and
+    _canonical maps a normalized alias to the canonical artists it names.
+    """
+    
+    def __init__(self, data_dir: str = "data"):
+        """
+        Initialize the alias store.
+        
+        Args:
+            data_dir: Directory holding artist_aliases.json
+        """
+        self.path = Path(data_dir) / "artist_aliases.json"
+        self._lock_path = Path(data_dir) / ".locks" / "artist_aliases.lock"
+        self._reload_lock = threading.Lock()
+        self._signature: Optional[tuple] = None
+        self._artists: Dict[str, List[str]] = {}
+        self._aliases: Dict[str, List[str]] = {}
+        self._canonical: Dict[str, Set[str]] = {}
+    
+    def _read_file(self) -> Dict[str, List[str]]:
+        """Aliases as stored on disk (empty if there is no file yet)."""
+        try:
+            return read_json_file(self.path).get("artists", {})
+        except FileNotFoundError:
+            return {}
+    
+    def _install(self, artists: Dict[str, List[str]], signature: Optional[tuple]):
+        """Compile stored aliases into the lookup tables."""
+        aliases: Dict[str, List[str]] = {}
+        canonical: Dict[str, Set[str]] = {}
+        for artist, names in artists.items():
+            artist_key = normalize_answer(artist)
+            aliases.setdefault(artist_key, []).extend(names)
+            for name in names:
+                canonical.setdefault(normalize_answer(name), set()).add(artist)
+        self._artists, self._aliases, self._canonical = artists, aliases, canonical
+        self._signature = signature
+    
+    def _refresh(self):
+        """Reload the aliases if another worker changed the file."""
+        if file_signature(self.path) == self._signature:
+            return
+        with self._reload_lock:
+            signature = file_signature(self.path)
+            if signature != self._signature:
+                self._install(self._read_file(), signature)
+    
+    def _update(self, change: Callable[[Dict[str, List[str]]], T]) -> T:
+        """Apply a change to the stored aliases and write them back."""
+        with self._reload_lock, file_lock(self._lock_path):
+            artists = self._read_file()
+            result = change(artists)
+            atomic_write_json(self.path, {"version": "1.0", "artists": artists})
+            self._install(artists, file_signature(self.path))
+            return result
+    
+    @staticmethod
+    def _clean(artist: str, aliases: Iterable[str]) -> List[str]:
+        """Trimmed aliases without duplicates or restatements of the artist."""
+        seen = {normalize_answer(artist)}
+        cleaned = []
+        for alias in aliases:
+            alias = (alias or "").strip()
+            key = normalize_answer(alias)
+            if key and key not in seen:
+                seen.add(key)
+                cleaned.append(alias)
+        return cleaned
+    
+    @staticmethod
+    def _find(artists: Dict[str, List[str]], artist: str) -> Optional[str]:
+        """Stored spelling of an artist, matched by normalized name."""
+        if artist in artists:
+            return artist
+        key = normalize_answer(artist)
+        return next((name for name in artists if normalize_answer(name) == key), None)
+    
+    def get_all(self) -> Dict[str, List[str]]:
+        """All canonical artists and their aliases."""
+        self._refresh()
+        return self._artists
+    
+    def aliases_for(self, artist: str) -> List[str]:
+        """
+        Aliases of an artist.
+        
+        Args:
+            artist: Artist name (any case or spelling variant)
+        
+        Returns:
+            Alias names (empty if none are defined)
+        """
+        self._refresh()
+        return self._aliases.get(normalize_answer(artist), [])
+    
+    def canonical_artists(self, alias: str) -> Set[str]:
+        """
+        Artists an alias stands for.
+        
+        Args:
+            alias: Alias or guess text
+        
+        Returns:
+            Canonical artist names (empty if the alias is unknown)
+        """
+        self._refresh()
+        return self._canonical.get(normalize_answer(alias), set())
+    
+    def set_aliases(self, artist: str, aliases: Iterable[str]) -> List[str]:
+        """
+        Replace an artist's aliases (an empty list removes the artist).
+        
+        Args:
+            artist: Canonical artist name
+            aliases: New alias names
+        
+        Returns:
+            Aliases stored after cleaning
+        """
+        cleaned = self._clean(artist, aliases)
+        
+        def change(artists):
+            artists.pop(self._find(artists, artist), None)
+            if cleaned:
+                artists[artist] = cleaned
+            return cleaned
+        return self._update(change)
+    
+    def delete_artist(self, artist: str) -> bool:
+        """
+        Remove all aliases of an artist.
+        
+        Returns:
+            True if the artist had aliases
+        """
+        def change(artists):
+            return artists.pop(self._find(artists, artist), None) is not None
+        return self._update(change)
+    
+    def import_aliases(self, entries: Dict[str, List[str]], replace: bool = False) -> int:
+        """
+        Merge many artists' aliases in one write.
+        
+        Args:
+            entries: Canonical artist name -> aliases
+            replace: True to discard every existing alias first
+        
+        Returns:
+            Number of aliases added
+        """
+        def change(artists):
+            if replace:
+                artists.clear()
+            added = 0
+            for artist, aliases in entries.items():
+                stored = self._find(artists, artist) or artist
+                existing = artists.get(stored, [])
+                merged = self._clean(stored, [*existing, *aliases])
+                added += len(merged) - len(existing)
+                if merged:
+                    artists[stored] = merged
+            return added
+        return self._update(change)
+    
+    def seed_from_artists(self, artist_names: Iterable[str]) -> int:
+        """
+        Add the initials of multi-word artists as aliases ("RHCP").
+        
+        Used to seed the store from the metadata library; generated
+        aliases can be edited or removed like any other.
+        
+        Args:
+            artist_names: Artist names to derive aliases from
+        
+        Returns:
+            Number of aliases added
+        """
+        entries: Dict[str, List[str]] = {}
+        for artist in artist_names:
+            initials = artist_initials(artist)
+            if initials:
+                entries.setdefault(artist, []).append(initials)
+        return self.import_aliases(entries) if entries else 0
@@ -3,61 +3,287 @@ Custom Song List Manager
 
 Manages storage and retrieval of admin-created custom song lists.
 Uses JSON file storage for simplicity and portability.
+
+Files are written as compact JSON through app.serialization (optionally
+zstd-compressed); older pretty-printed files still load.
+
+Play counts are kept in memory and flushed in batches to a separate
+``play_counts.json`` file, so starting a game never rewrites a list.
+
+Writes take per-list and index file locks and replace files atomically,
+and ``generation.json`` carries change counters so caches in other worker
+processes stay coherent.
+
+Songs themselves live once in the shared song store (app.song_store);
+list files reference them and keep only per-list overrides.
 """
 
-import json
 import os
+import threading
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from pathlib import Path
 
 from app.custom_lists_models import CustomSongList, CustomSong, CustomListSummary
+from app.serialization import read_json_file
+from app.file_storage import atomic_write_json, file_lock, file_signature
+from app.search_index import TrigramIndex
+from app.song_store import MissingSongError, SongStore
+
+
+# How often buffered play counts are written to disk (seconds)
+PLAY_COUNT_FLUSH_INTERVAL = 30.0
 
 
 class CustomListManager:
-    """Manages custom song lists with file-based storage."""
+    """
+    Manages custom song lists with file-based storage.
+    
+    Safe to share one storage directory between several worker processes:
+    every read-modify-write happens under an advisory file lock, files are
+    replaced atomically, and a shared generation file tells each worker
+    when its cached lists and summaries are stale.
+    """
     
-    def __init__(self, storage_dir: str = "data/custom_lists"):
+    def __init__(self, storage_dir: str = "data/custom_lists", song_store: Optional[SongStore] = None):
         """
         Initialize the custom list manager.
         
         Args:
             storage_dir: Directory to store list JSON files
+            song_store: Shared songs (defaults to the store next to storage_dir)
         """
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.song_store = song_store or SongStore(str(self.storage_dir.parent))
         self._ensure_index_file()
+        
+        # Plays not yet written to disk (per process). The pending version
+        # only ever grows until a flush, so it can be part of a version token.
+        # A flush swaps the buffer out and writes it without holding
+        # _play_counts_lock, so counting a play never waits on file I/O.
+        self._play_counts_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending_plays: Dict[str, int] = {}
+        self._flushing_plays: Dict[str, int] = {}
+        self._pending_version = 0
+        self._instance_token = uuid.uuid4().hex[:8]
+        
+        # Worker caches, invalidated through the shared generation file
+        # (file signature, counters), replaced as one so request threads
+        # never pair a signature with another read's counters
+        self._generations: Tuple[Optional[tuple], Dict[str, Any]] = (None, {})
+        self._list_cache: Dict[str, Tuple[int, CustomSongList]] = {}
+        self._summaries_cache: Optional[Tuple[int, List[CustomListSummary]]] = None
+        self._play_counts_cache: Optional[Tuple[int, Dict[str, int]]] = None
+        
+        # Fuzzy search index over all lists, refreshed per list generation
+        self._search_lock = threading.Lock()
+        self._search_index = TrigramIndex()
+        self._search_generation: Optional[Tuple[str, int]] = None
+        self._search_lists: Dict[str, Tuple[int, List[Tuple[str, tuple]]]] = {}
     
     def _ensure_index_file(self):
-        """Ensure the index file exists."""
-        index_path = self.storage_dir / "index.json"
-        if not index_path.exists():
-            index_path.write_text(json.dumps({"lists": []}, indent=2))
+        """Ensure the index and generation files exist."""
+        with self._lock("index"):
+            index_path = self._get_index_path()
+            if not index_path.exists():
+                atomic_write_json(index_path, {"lists": []})
+            
+            generations_path = self._get_generations_path()
+            if not generations_path.exists():
+                atomic_write_json(generations_path, {
+                    "epoch": uuid.uuid4().hex[:8],
+                    "index": 0,
+                    "lists": {},
+                    "content": {}
+                })
+    
+    def _get_index_path(self) -> Path:
+        """Get the file path for the list index."""
+        return self.storage_dir / "index.json"
     
     def _get_list_path(self, list_id: str) -> Path:
         """Get the file path for a list."""
         return self.storage_dir / f"{list_id}.json"
     
+    def _get_play_counts_path(self) -> Path:
+        """Get the file path for the play counter store."""
+        return self.storage_dir / "play_counts.json"
+    
+    def _get_generations_path(self) -> Path:
+        """Get the file path for the shared generation counters."""
+        return self.storage_dir / "generation.json"
+    
+    def _lock(self, name: str):
+        """Exclusive cross-process lock (lock order: list, play_counts, index)."""
+        return file_lock(self.storage_dir / ".locks" / f"{name}.lock")
+    
+    def _read_generations(self) -> Dict[str, Any]:
+        """Current generation counters, re-read only when the file changes."""
+        path = self._get_generations_path()
+        signature = file_signature(path)
+        cached_signature, generations = self._generations
+        if signature != cached_signature:
+            generations = read_json_file(path)
+            self._generations = (signature, generations)
+        return generations
+    
+    def _bump_generations(self, list_ids: List[str], content_changed: bool = True) -> int:
+        """
+        Advance the shared generation counters. Caller must hold the index lock.
+        
+        Args:
+            list_ids: Lists whose content or play count changed
+            content_changed: False if only play counts changed
+            
+        Returns:
+            The new index generation
+        """
+        path = self._get_generations_path()
+        generations = read_json_file(path)
+        generations["index"] += 1
+        for list_id in list_ids:
+            generations["lists"][list_id] = generations["index"]
+            if content_changed:
+                generations.setdefault("content", {})[list_id] = generations["index"]
+        atomic_write_json(path, generations)
+        return generations["index"]
+    
+    def _pending_token(self) -> str:
+        """Version suffix for plays this process has not flushed yet."""
+        with self._play_counts_lock:
+            if not self._pending_plays and not self._flushing_plays:
+                return ""
+            return f".{self._instance_token}.{self._pending_version}"
+    
+    def get_index_version(self) -> str:
+        """
+        Get a version token for the list index (all summaries).
+        
+        Returns:
+            Token that changes whenever any list or play count changes
+        """
+        generations = self._read_generations()
+        return f"{generations['epoch']}.{generations['index']}{self._pending_token()}"
+    
+    def get_list_version(self, list_id: str) -> str:
+        """
+        Get a version token for a single list.
+        
+        Args:
+            list_id: List ID
+            
+        Returns:
+            Token that changes whenever the list or its play count changes
+        """
+        generations = self._read_generations()
+        generation = generations["lists"].get(list_id, 0)
+        return f"{generations['epoch']}.{generation}{self._pending_token()}"
+    
+    def get_content_version(self, list_id: str) -> str:
+        """
+        Get a version token for a list's songs and settings only.
+        
+        Unlike get_list_version it ignores play counts, so data derived
+        from the songs (e.g. prepared game decks) survives games being
+        played.
+        
+        Args:
+            list_id: List ID
+            
+        Returns:
+            Token that changes whenever the list itself changes
+        """
+        generations = self._read_generations()
+        # Generation files written before content counters existed
+        generation = generations.get("content", {}).get(
+            list_id, generations["lists"].get(list_id, 0)
+        )
+        return f"{generations['epoch']}.{generation}"
+    
+    def _load_list(self, list_id: str) -> Optional[CustomSongList]:
+        """Load a list exactly as stored on disk (no play count overlay)."""
+        try:
+            data = read_json_file(self._get_list_path(list_id))
+        except FileNotFoundError:
+            return None
+        
+        # Lists saved before the song store existed hold full songs; adding
+        # them to the store lets them share objects before their next save
+        entries = [
+            entry if "ref" in entry else CustomSong.model_validate(entry)
+            for entry in data.get("songs", [])
+        ]
+        legacy = [entry for entry in entries if isinstance(entry, CustomSong)]
+        if legacy:
+            self.song_store.add_songs(legacy)
+        
+        custom_list = CustomSongList.model_validate({**data, "songs": []})
+        custom_list.songs = [
+            self.song_store.share(entry) if isinstance(entry, CustomSong)
+            else self.song_store.from_entry(entry)
+            for entry in entries
+        ]
+        return custom_list
+    
+    def _get_cached_list(self, list_id: str) -> Optional[CustomSongList]:
+        """Parsed list shared between readers. Never mutate the result."""
+        # Read the generation before the file, so a concurrent write can only
+        # make the cache entry look older than it is, never newer.
+        generation = self._read_generations()["lists"].get(list_id, 0)
+        cached = self._list_cache.get(list_id)
+        if cached and cached[0] == generation:
+            return cached[1]
+        
+        custom_list = self._load_list(list_id)
+        if custom_list is None:
+            self._list_cache.pop(list_id, None)
+            return None
+        
+        self._list_cache[list_id] = (generation, custom_list)
+        return custom_list
+    
+    def _save_list(self, custom_list: CustomSongList):
+        """
+        Write a list to its file and refresh its index entry.
+        
+        Caller must hold the list's lock.
+        """
+        data = custom_list.model_dump(exclude={"songs"})
+        data["songs"] = self.song_store.to_entries(custom_list.songs)
+        atomic_write_json(self._get_list_path(custom_list.id), data)
+        
+        # Keep the shared song objects in the cached copy
+        custom_list.songs = [self.song_store.from_entry(entry) for entry in data["songs"]]
+        
+        with self._lock("index"):
+            summary = self._list_to_summary(custom_list)
+            self._update_index(summary)
+            generation = self._bump_generations([custom_list.id])
+        
+        self._list_cache[custom_list.id] = (generation, custom_list)
+    
     def _update_index(self, list_summary: CustomListSummary):
-        """Update the index with list summary."""
-        index_path = self.storage_dir / "index.json"
-        index = json.loads(index_path.read_text())
+        """Update the index with list summary. Caller must hold the index lock."""
+        index_path = self._get_index_path()
+        index = read_json_file(index_path)
         
         # Remove existing entry if present
         index["lists"] = [l for l in index["lists"] if l["id"] != list_summary.id]
         
         # Add updated entry
-        index["lists"].append(list_summary.dict())
+        index["lists"].append(list_summary.model_dump())
         
-        index_path.write_text(json.dumps(index, indent=2))
+        atomic_write_json(index_path, index)
     
     def _remove_from_index(self, list_id: str):
-        """Remove a list from the index."""
-        index_path = self.storage_dir / "index.json"
-        index = json.loads(index_path.read_text())
+        """Remove a list from the index. Caller must hold the index lock."""
+        index_path = self._get_index_path()
+        index = read_json_file(index_path)
         index["lists"] = [l for l in index["lists"] if l["id"] != list_id]
-        index_path.write_text(json.dumps(index, indent=2))
+        atomic_write_json(index_path, index)
     
     def create_list(
         self,
@@ -108,13 +334,8 @@ class CustomListManager:
             times_played=0
         )
         
-        # Save to file
-        list_path = self._get_list_path(list_id)
-        list_path.write_text(json.dumps(custom_list.dict(), indent=2))
-        
-        # Update index
-        summary = self._list_to_summary(custom_list)
-        self._update_index(summary)
+        with self._lock(f"list-{list_id}"):
+            self._save_list(custom_list)
         
         return custom_list
     
@@ -129,23 +350,18 @@ class CustomListManager:
         Returns:
             Updated CustomSongList or None if not found
         """
-        custom_list = self.get_list(list_id)
-        if not custom_list:
-            return None
-        
-        custom_list.status = status
-        custom_list.is_active = (status == "approved")
-        custom_list.updated_at = datetime.utcnow().isoformat()
-        
-        # Save
-        list_path = self._get_list_path(list_id)
-        list_path.write_text(json.dumps(custom_list.dict(), indent=2))
-        
-        # Update index
-        summary = self._list_to_summary(custom_list)
-        self._update_index(summary)
+        with self._lock(f"list-{list_id}"):
+            custom_list = self._load_list(list_id)
+            if not custom_list:
+                return None
+            
+            custom_list.status = status
+            custom_list.is_active = (status == "approved")
+            custom_list.updated_at = datetime.utcnow().isoformat()
+            
+            self._save_list(custom_list)
         
-        return custom_list
+        return self._with_play_count(custom_list)
     
     def get_list(self, list_id: str) -> Optional[CustomSongList]:
         """
@@ -157,12 +373,10 @@ class CustomListManager:
         Returns:
             CustomSongList or None if not found
         """
-        list_path = self._get_list_path(list_id)
-        if not list_path.exists():
+        custom_list = self._get_cached_list(list_id)
+        if not custom_list:
             return None
-        
-        data = json.loads(list_path.read_text())
-        return CustomSongList(**data)
+        return self._with_play_count(custom_list)
     
     def list_all_summaries(self, active_only: bool = False) -> List[CustomListSummary]:
         """
@@ -174,10 +388,15 @@ class CustomListManager:
         Returns:
             List of CustomListSummary objects
         """
-        index_path = self.storage_dir / "index.json"
-        index = json.loads(index_path.read_text())
+        generation = self._read_generations()["index"]
+        if self._summaries_cache and self._summaries_cache[0] == generation:
+            summaries = self._summaries_cache[1]
+        else:
+            index = read_json_file(self._get_index_path())
+            summaries = [CustomListSummary.model_validate(l) for l in index["lists"]]
+            self._summaries_cache = (generation, summaries)
         
-        summaries = [CustomListSummary(**l) for l in index["lists"]]
+        summaries = [self._with_play_count(s) for s in summaries]
         
         if active_only:
             summaries = [s for s in summaries if s.is_active]
@@ -209,35 +428,30 @@ class CustomListManager:
         Returns:
             Updated CustomSongList or None if not found
         """
-        custom_list = self.get_list(list_id)
-        if not custom_list:
-            return None
-        
-        # Update fields
-        if name is not None:
-            custom_list.name = name
-        if description is not None:
-            custom_list.description = description
-        if target_audience is not None:
-            custom_list.target_audience = target_audience
-        if primary_decade is not None:
-            custom_list.primary_decade = primary_decade
-        if primary_genre is not None:
-            custom_list.primary_genre = primary_genre
-        if is_active is not None:
-            custom_list.is_active = is_active
-        
-        custom_list.updated_at = datetime.utcnow().isoformat()
-        
-        # Save
-        list_path = self._get_list_path(list_id)
-        list_path.write_text(json.dumps(custom_list.dict(), indent=2))
-        
-        # Update index
-        summary = self._list_to_summary(custom_list)
-        self._update_index(summary)
+        with self._lock(f"list-{list_id}"):
+            custom_list = self._load_list(list_id)
+            if not custom_list:
+                return None
+            
+            # Update fields
+            if name is not None:
+                custom_list.name = name
+            if description is not None:
+                custom_list.description = description
+            if target_audience is not None:
+                custom_list.target_audience = target_audience
+            if primary_decade is not None:
+                custom_list.primary_decade = primary_decade
+            if primary_genre is not None:
+                custom_list.primary_genre = primary_genre
+            if is_active is not None:
+                custom_list.is_active = is_active
+            
+            custom_list.updated_at = datetime.utcnow().isoformat()
+            
+            self._save_list(custom_list)
         
-        return custom_list
+        return self._with_play_count(custom_list)
     
     def delete_list(self, list_id: str) -> bool:
         """
@@ -249,12 +463,19 @@ class CustomListManager:
         Returns:
             True if deleted, False if not found
         """
-        list_path = self._get_list_path(list_id)
-        if not list_path.exists():
-            return False
+        with self._lock(f"list-{list_id}"):
+            list_path = self._get_list_path(list_id)
+            if not list_path.exists():
+                return False
+            
+            list_path.unlink()
+            self._forget_play_counts(list_id)
+            
+            with self._lock("index"):
+                self._remove_from_index(list_id)
+                self._bump_generations([list_id])
         
-        list_path.unlink()
-        self._remove_from_index(list_id)
+        self._list_cache.pop(list_id, None)
         return True
     
     def add_song(self, list_id: str, song: CustomSong) -> Optional[CustomSongList]:
@@ -263,34 +484,58 @@ class CustomListManager:
         
         Args:
             list_id: List ID
-            song: Song to add
+            song: Song to add (replaces an existing song with the same ID)
             
         Returns:
             Updated CustomSongList or None if not found
         """
-        custom_list = self.get_list(list_id)
-        if not custom_list:
+        result = self.upsert_songs(list_id, [song])
+        if not result:
             return None
+        return result[0]
+    
+    def upsert_songs(
+        self,
+        list_id: str,
+        songs: List[CustomSong]
+    ) -> Optional[Tuple[CustomSongList, List[str]]]:
+        """
+        Add or replace many songs in a list and persist once.
         
-        # Check if song already exists
-        if any(s.id == song.id for s in custom_list.songs):
-            # Update existing song
-            custom_list.songs = [song if s.id == song.id else s for s in custom_list.songs]
-        else:
-            # Add new song
-            custom_list.songs.append(song)
-        
-        custom_list.updated_at = datetime.utcnow().isoformat()
-        
-        # Save
-        list_path = self._get_list_path(list_id)
-        list_path.write_text(json.dumps(custom_list.dict(), indent=2))
+        Existing songs are matched by ID through a position map, so the
+        whole batch costs O(n + k) instead of a scan per song.
         
-        # Update index
-        summary = self._list_to_summary(custom_list)
-        self._update_index(summary)
+        Args:
+            list_id: List ID
+            songs: Songs to upsert, in order
+            
+        Returns:
+            Tuple of (updated CustomSongList, per-song status "created" or
+            "updated"), or None if the list was not found
+        """
+        with self._lock(f"list-{list_id}"):
+            custom_list = self._load_list(list_id)
+            if not custom_list:
+                return None
+            
+            positions = {s.id: i for i, s in enumerate(custom_list.songs)}
+            statuses = []
+            
+            for song in songs:
+                position = positions.get(song.id)
+                if position is None:
+                    positions[song.id] = len(custom_list.songs)
+                    custom_list.songs.append(song)
+                    statuses.append("created")
+                else:
+                    custom_list.songs[position] = song
+                    statuses.append("updated")
+            
+            if songs:
+                custom_list.updated_at = datetime.utcnow().isoformat()
+                self._save_list(custom_list)
         
-        return custom_list
+        return self._with_play_count(custom_list), statuses
     
     def remove_song(self, list_id: str, song_id: str) -> Optional[CustomSongList]:
         """
@@ -303,22 +548,17 @@ class CustomListManager:
         Returns:
             Updated CustomSongList or None if not found
         """
-        custom_list = self.get_list(list_id)
-        if not custom_list:
-            return None
-        
-        custom_list.songs = [s for s in custom_list.songs if s.id != song_id]
-        custom_list.updated_at = datetime.utcnow().isoformat()
-        
-        # Save
-        list_path = self._get_list_path(list_id)
-        list_path.write_text(json.dumps(custom_list.dict(), indent=2))
-        
-        # Update index
-        summary = self._list_to_summary(custom_list)
-        self._update_index(summary)
+        with self._lock(f"list-{list_id}"):
+            custom_list = self._load_list(list_id)
+            if not custom_list:
+                return None
+            
+            custom_list.songs = [s for s in custom_list.songs if s.id != song_id]
+            custom_list.updated_at = datetime.utcnow().isoformat()
+            
+            self._save_list(custom_list)
         
-        return custom_list
+        return self._with_play_count(custom_list)
     
     def filter_songs(
         self,
@@ -345,11 +585,11 @@ class CustomListManager:
         Returns:
             Filtered list of songs
         """
-        custom_list = self.get_list(list_id)
+        custom_list = self._get_cached_list(list_id)
         if not custom_list:
             return []
         
-        filtered = custom_list.songs
+        filtered = list(custom_list.songs)
         
         if decade:
             filtered = [s for s in filtered if s.decade == decade]
@@ -367,23 +607,169 @@ class CustomListManager:
         
         return filtered
     
+    def _refresh_search_index(self):
+        """Reindex lists whose generation changed since the last search."""
+        generations = self._read_generations()
+        current = (generations["epoch"], generations["index"])
+        if current == self._search_generation:
+            return
+        
+        list_ids = {summary.id for summary in self.list_all_summaries()}
+        for list_id in list(self._search_lists):
+            if list_id not in list_ids:
+                for text, ref in self._search_lists.pop(list_id)[1]:
+                    self._search_index.remove(text, ref)
+        
+        for list_id in list_ids:
+            generation = generations["lists"].get(list_id, 0)
+            indexed = self._search_lists.get(list_id)
+            if indexed and indexed[0] == generation:
+                continue
+            
+            if indexed:
+                for text, ref in indexed[1]:
+                    self._search_index.remove(text, ref)
+            
+            try:
+                custom_list = self._get_cached_list(list_id)
+            except MissingSongError as e:
+                # One damaged list should not break search across the others
+                print(f"Not indexing list {list_id}: {e}")
+                custom_list = None
+            entries = []
+            if custom_list:
+                for song in custom_list.songs:
+                    entries.append((song.name, ("song", list_id, song.id)))
+                    entries.append((song.artist, ("artist", list_id)))
+            for text, ref in entries:
+                self._search_index.add(text, ref)
+            self._search_lists[list_id] = (generation, entries)
+        
+        self._search_generation = current
+    
+    def fuzzy_search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Find songs and artists in any list whose names approximately match.
+        
+        Args:
+            query: Name to look for (case, accents and punctuation ignored)
+            limit: Maximum number of results
+            
+        Returns:
+            Matches ordered by edit distance, each with the list it is in
+        """
+        with self._search_lock:
+            self._refresh_search_index()
+            matches = self._search_index.search(query, limit)
+        
+        names = {summary.id: summary.name for summary in self.list_all_summaries()}
+        results = []
+        for match in matches:
+            for ref, count in match.refs.items():
+                result = {
+                    "source": "list",
+                    "list_id": ref[1],
+                    "list_name": names.get(ref[1]),
+                    "value": match.text,
+                    "distance": match.distance,
+                    "similarity": match.similarity
+                }
+                if ref[0] == "artist":
+                    result.update({"field": "artist", "song_count": count})
+                else:
+                    result.update({"field": "name", "song_id": ref[2]})
+                results.append(result)
+                if len(results) >= limit:
+                    return results
+        return results
+    
     def increment_play_count(self, list_id: str):
         """
         Increment the play count for a list.
         
+        Only bumps an in-memory counter; the count is persisted by the
+        next flush_play_counts() call. The list file and its updated_at
+        timestamp are left untouched.
+        
         Args:
             list_id: List ID
         """
-        custom_list = self.get_list(list_id)
-        if custom_list:
-            custom_list.times_played += 1
-            custom_list.updated_at = datetime.utcnow().isoformat()
+        with self._play_counts_lock:
+            self._pending_plays[list_id] = self._pending_plays.get(list_id, 0) + 1
+            self._pending_version += 1
+    
+    def flush_play_counts(self) -> int:
+        """
+        Add buffered play counts to the shared play counter store.
+        
+        Returns:
+            Number of plays flushed
+        """
+        with self._flush_lock:
+            with self._play_counts_lock:
+                if not self._pending_plays:
+                    return 0
+                flushing = self._flushing_plays = self._pending_plays
+                self._pending_plays = {}
             
-            list_path = self._get_list_path(list_id)
-            list_path.write_text(json.dumps(custom_list.dict(), indent=2))
+            try:
+                with self._lock("play_counts"):
+                    counts = self._load_play_counts()
+                    for list_id, plays in flushing.items():
+                        if self._get_list_path(list_id).exists():
+                            counts[list_id] = counts.get(list_id, 0) + plays
+                    atomic_write_json(self._get_play_counts_path(), {"counts": counts})
+                    
+                    with self._lock("index"):
+                        self._bump_generations(list(flushing), content_changed=False)
+            except Exception:
+                # Keep the plays for the next flush
+                with self._play_counts_lock:
+                    for list_id, plays in flushing.items():
+                        self._pending_plays[list_id] = self._pending_plays.get(list_id, 0) + plays
+                raise
+            finally:
+                with self._play_counts_lock:
+                    self._flushing_plays = {}
             
-            summary = self._list_to_summary(custom_list)
-            self._update_index(summary)
+            return sum(flushing.values())
+    
+    def _with_play_count(self, item):
+        """Copy of a list or summary with flushed and pending plays added."""
+        flushed = self._read_play_counts().get(item.id, 0)
+        with self._play_counts_lock:
+            pending = self._pending_plays.get(item.id, 0) + self._flushing_plays.get(item.id, 0)
+        
+        if not flushed and not pending:
+            return item
+        return item.model_copy(update={"times_played": item.times_played + flushed + pending})
+    
+    def _load_play_counts(self) -> Dict[str, int]:
+        """Load flushed play counts from disk."""
+        try:
+            return read_json_file(self._get_play_counts_path()).get("counts", {})
+        except FileNotFoundError:
+            return {}
+    
+    def _read_play_counts(self) -> Dict[str, int]:
+        """Flushed play counts, re-read when the index generation changes."""
+        generation = self._read_generations()["index"]
+        if self._play_counts_cache and self._play_counts_cache[0] == generation:
+            return self._play_counts_cache[1]
+        
+        counts = self._load_play_counts()
+        self._play_counts_cache = (generation, counts)
+        return counts
+    
+    def _forget_play_counts(self, list_id: str):
+        """Drop all play counts for a deleted list. Caller must hold the list's lock."""
+        with self._play_counts_lock:
+            self._pending_plays.pop(list_id, None)
+        
+        with self._lock("play_counts"):
+            counts = self._load_play_counts()
+            if counts.pop(list_id, None) is not None:
+                atomic_write_json(self._get_play_counts_path(), {"counts": counts})
     
     def _list_to_summary(self, custom_list: CustomSongList) -> CustomListSummary:
         """Convert a CustomSongList to a summary."""
@@ -403,6 +789,3 @@ class CustomListManager:
             submitted_by=getattr(custom_list, 'submitted_by', None)
         )
 
-
-# Global manager instance
-custom_list_manager = CustomListManager()
@@ -4,10 +4,12 @@ Custom Song List Models
 Data models for admin-created custom song lists with categorization.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Literal
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+from app.pagination import MAX_PAGE_SIZE
+
 
 class CustomSong(BaseModel):
     """A song in a custom list with metadata."""
@@ -74,6 +76,29 @@ class AddSongToListRequest(BaseModel):
     song: CustomSong
 
 
+class BulkSongUpsertRequest(BaseModel):
+    """Request to add or update many songs in a custom list at once."""
+    songs: List[Dict[str, Any]] = Field(description="Songs to upsert (CustomSong fields)")
+
+
+class BulkSongResult(BaseModel):
+    """Outcome of one song in a bulk upsert."""
+    index: int = Field(description="Position of the song in the request")
+    id: Optional[str] = Field(default=None, description="Song ID, if one was given")
+    status: str = Field(description="created, updated, or rejected")
+    error: Optional[str] = Field(default=None, description="Why the song was rejected")
+
+
+class BulkSongUpsertResponse(BaseModel):
+    """Result of a bulk song upsert."""
+    list_id: str
+    song_count: int = Field(description="Songs in the list after the upsert")
+    created: int
+    updated: int
+    rejected: int
+    results: List[BulkSongResult]
+
+
 class SearchSongRequest(BaseModel):
     """Request to search for songs to add to a list."""
     provider: str = Field(description="spotify, deezer, or demo")
@@ -90,6 +115,20 @@ class FilterCustomListRequest(BaseModel):
     mood: Optional[str] = None
     difficulty: Optional[str] = None
     limit: Optional[int] = Field(default=None, description="Max songs to return")
+    
+    # Pagination / projection (optional)
+    cursor: Optional[str] = Field(default=None, description="Cursor from the previous page")
+    page_size: Optional[int] = Field(default=None, ge=1, le=MAX_PAGE_SIZE, description="Songs per page")
+    fields: Optional[List[str]] = Field(default=None, description="Only return these song fields")
+    format: Literal["json", "ndjson"] = Field(default="json", description="json or ndjson (streamed)")
+
+
+class CustomSongPage(BaseModel):
+    """One page of songs from a custom list."""
+    list_id: str
+    total: int = Field(description="Total songs matching the request")
+    songs: List[Dict[str, Any]] = Field(description="Songs in this page (projected)")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page, if any")
 
 
 class CustomListSummary(BaseModel):
@@ -115,3 +154,14 @@ class GuestSubmissionRequest(BaseModel):
     description: Optional[str] = Field(default=None, description="Playlist description")
     submitted_by: str = Field(description="Name or email of contributor")
     songs: List[CustomSong] = Field(description="Songs in the playlist")
+
+
+class ArtistAliasRequest(BaseModel):
+    """Request to replace one artist's aliases."""
+    aliases: List[str] = Field(description="Alternative names accepted as guesses (empty to remove)")
+
+
+class ArtistAliasImportRequest(BaseModel):
+    """Request to import many artists' aliases at once."""
+    artists: Dict[str, List[str]] = Field(description="Canonical artist name -> aliases")
+    replace: bool = Field(default=False, description="Discard all existing aliases first")
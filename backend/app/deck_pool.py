@@ -0,0 +1,241 @@
+"""
+Game Deck Pool
+
+Ready-made shuffled decks for custom-list games, so starting a game does
+not re-read, refilter, shuffle and convert the whole list.
+
+A deck is the songs of one game, already converted to the dicts the game
+session uses and to Track models for the response. A few decks are kept
+per (list, filters, round count). start_game takes one, and once fewer
+than DECK_LOW_WATER are left a background thread tops the pool up. Decks
+are tagged with the list's content version (see
+CustomListManager.get_content_version) and thrown away when the list
+changes, or after DECK_MAX_AGE seconds since Deezer preview URLs expire.
+
+Only warm starts are fast: when a pool is empty (the first game with
+given filters, after an edit or after the decks expired) start_game
+still builds its deck while the player waits.
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.custom_list_manager import CustomListManager
+from app.models import Album, Artist, Track
+from app.serialization import dumps, loads
+
+# Decks kept ready per (list, filters, rounds)
+DECK_POOL_SIZE = 3
+
+# Refill a pool only when fewer decks than this are left, so a busy list
+# does not make a batch of Deezer requests for every game started
+DECK_LOW_WATER = 1
+
+# Seconds a deck stays usable (Deezer preview URLs expire)
+DECK_MAX_AGE = 600
+
+# Distinct (list, filters, rounds) combinations kept, least recently used dropped
+MAX_POOLS = 64
+
+# Seconds to wait for Deezer when refreshing a preview URL
+PREVIEW_REFRESH_TIMEOUT = 5
+
+FILTER_NAMES = ("decade", "genre", "style", "mood", "difficulty")
+
+# (list_id, JSON of the filters that are set, num_rounds)
+DeckKey = Tuple[str, str, int]
+
+
+def refresh_deezer_preview_url(track_id: str) -> str | None:
+    """
+    Fetch a fresh preview URL from Deezer for a given track ID.
+    
+    Deezer preview URLs expire, so we need to fetch fresh ones when playing.
+    
+    Args:
+        track_id: Deezer track ID
+    
+    Returns:
+        Fresh preview URL or None if not available
+    """
+    import requests
+    
+    try:
+        response = requests.get(
+            f"https://api.deezer.com/track/{track_id}",
+            timeout=PREVIEW_REFRESH_TIMEOUT
+        )
+        if response.ok:
+            data = response.json()
+            return data.get('preview')
+    except Exception as e:
+        print(f"Failed to refresh Deezer preview URL for track {track_id}: {e}")
+    return None
+
+
+class Deck(NamedTuple):
+    """The songs of one game, ready to start."""
+    songs: List[Dict[str, Any]]
+    tracks: List[Track]
+    version: str
+    built_at: float
+
+
+def deck_key(list_id: str, filters: Optional[dict], num_rounds: int) -> DeckKey:
+    """
+    Pool key for a game request.
+    
+    Filters are encoded as JSON in FILTER_NAMES order, so equal filters
+    give equal keys and any JSON value (even a list) can be part of one.
+    Unknown and empty filters are ignored.
+    """
+    filters = filters or {}
+    used = {name: filters[name] for name in FILTER_NAMES if filters.get(name)}
+    return (list_id, dumps(used).decode("utf-8"), num_rounds)
+
+
+class DeckPool:
+    """Keeps a few shuffled decks ready per list, filters and round count."""
+    
+    def __init__(
+        self,
+        custom_list_manager: CustomListManager,
+        pool_size: int = DECK_POOL_SIZE,
+        max_age: float = DECK_MAX_AGE,
+        low_water: int = DECK_LOW_WATER
+    ):
+        """
+        Initialize the deck pool.
+        
+        Args:
+            custom_list_manager: Source of the lists
+            pool_size: Decks kept ready per key
+            max_age: Seconds before a deck is rebuilt
+            low_water: Ready decks below which a pool is refilled
+        """
+        self.custom_list_manager = custom_list_manager
+        self.pool_size = pool_size
+        self.low_water = low_water
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._pools: "OrderedDict[DeckKey, deque]" = OrderedDict()
+        self._refilling: set = set()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="deck-builder")
+    
+    def build_deck(self, key: DeckKey) -> Optional[Deck]:
+        """
+        Build one deck from the current list (blocking).
+        
+        Only the songs that will be played are converted and have their
+        preview URLs refreshed.
+        
+        Args:
+            key: Deck key
+        
+        Returns:
+            The deck, or None if no song matches the filters
+        """
+        list_id, filters, num_rounds = key
+        version = self.custom_list_manager.get_content_version(list_id)
+        songs = self.custom_list_manager.filter_songs(list_id=list_id, **loads(filters))
+        if not songs:
+            return None
+        
+        chosen = random.sample(songs, min(num_rounds, len(songs)))
+        converted_songs = []
+        for song in chosen:
+            preview_url = song.preview_url
+            
+            # Refresh Deezer preview URLs (they expire)
+            if song.provider == 'deezer' and song.id:
+                fresh_url = refresh_deezer_preview_url(song.id)
+                if fresh_url:
+                    preview_url = fresh_url
+            
+            converted_songs.append({
+                'id': song.id,
+                'name': song.name,
+                'artists': [{'name': song.artist}],
+                'album': {'name': song.album or 'Unknown Album', 'release_date': 'Unknown'},
+                'preview_url': preview_url,
+                'provider': song.provider
+            })
+        
+        tracks = [
+            Track(
+                id=song['id'] or '',
+                name=song['name'],
+                artists=[Artist(name=a['name']) for a in song['artists']],
+                album=Album(**song['album']),
+                preview_url=song['preview_url']
+            )
+            for song in converted_songs
+        ]
+        return Deck(converted_songs, tracks, version, time.monotonic())
+    
+    def take(self, key: DeckKey) -> Optional[Deck]:
+        """
+        Pop a ready deck for the list's current version (O(1)), and start
+        refilling the pool in the background if it is running low.
+        
+        Returns:
+            A deck, or None if none is ready (build one with build_deck)
+        """
+        version = self.custom_list_manager.get_content_version(key[0])
+        now = time.monotonic()
+        deck = None
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                self._pools.move_to_end(key)
+                while pool:
+                    candidate = pool.popleft()
+                    if candidate.version == version and now - candidate.built_at < self.max_age:
+                        deck = candidate
+                        break
+            else:
+                pool = self._pools[key] = deque()
+                while len(self._pools) > MAX_POOLS:
+                    self._pools.popitem(last=False)
+            running_low = len(pool) < self.low_water
+        if running_low:
+            self._schedule_refill(key)
+        return deck
+    
+    def _schedule_refill(self, key: DeckKey):
+        """Top up a pool in a background thread (once per key at a time)."""
+        with self._lock:
+            if key in self._refilling:
+                return
+            self._refilling.add(key)
+        self._executor.submit(self._refill, key)
+    
+    def _refill(self, key: DeckKey):
+        try:
+            while True:
+                with self._lock:
+                    pool = self._pools.get(key)
+                    if pool is None or len(pool) >= self.pool_size:
+                        return
+                deck = self.build_deck(key)
+                if deck is None:
+                    return
+                with self._lock:
+                    pool = self._pools.get(key)
+                    if pool is None:
+                        return
+                    # Decks built before a list change are dropped on take()
+                    pool.append(deck)
+        except Exception as e:
+            print(f"Failed to prepare game decks for list {key[0]}: {e}")
+        finally:
+            with self._lock:
+                self._refilling.discard(key)
+    
+    def shutdown(self):
+        """Stop building decks."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,111 @@
+"""
+Shared Service Providers
+
+Process-wide services (metadata library, custom lists, game sessions,
+multiplayer rooms, leaderboards, artist aliases, local enrichment) are
+created on first use rather than at import time and handed to routes
+through FastAPI dependencies:
+    
+    @router.get("/library/stats")
+    def get_library_stats(metadata_library: MetadataLibrary = Depends(get_metadata_library)):
+        ...
+
+Importing the API therefore does not read any data files, and tests can
+swap a service with app.dependency_overrides.
+"""
+
+import threading
+from functools import wraps
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def lazy_singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """
+    Turn a factory into a provider that builds its instance once.
+    
+    The returned provider also has is_created(), to act on the instance
+    (e.g. flush it on shutdown) only if something has used it, and reset(),
+    to drop it in tests.
+    
+    Args:
+        factory: Function building the instance
+    
+    Returns:
+        Thread-safe provider returning the same instance on every call
+    """
+    lock = threading.Lock()
+    instance = []
+    
+    @wraps(factory)
+    def provider() -> T:
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+    
+    def reset():
+        with lock:
+            instance.clear()
+    
+    provider.is_created = lambda: bool(instance)
+    provider.reset = reset
+    return provider
+
+
+@lazy_singleton
+def get_metadata_library():
+    """Metadata library for the configured backend (JSON or SQLite)."""
+    from app.metadata_library import create_metadata_library
+    return create_metadata_library()
+
+
+@lazy_singleton
+def get_custom_list_manager():
+    """Custom song list storage."""
+    from app.custom_list_manager import CustomListManager
+    return CustomListManager()
+
+
+@lazy_singleton
+def get_deck_pool():
+    """Ready-made shuffled decks for custom-list games."""
+    from app.deck_pool import DeckPool
+    return DeckPool(get_custom_list_manager())
+
+
+@lazy_singleton
+def get_session_manager():
+    """In-memory store of active game sessions."""
+    from app.game_manager import GameSessionManager
+    return GameSessionManager()
+
+
+@lazy_singleton
+def get_room_manager():
+    """In-memory store of open multiplayer rooms."""
+    from app.rooms import RoomManager
+    return RoomManager()
+
+
+@lazy_singleton
+def get_leaderboard():
+    """Per-list leaderboards of finished games."""
+    from app.leaderboard import LeaderboardService
+    return LeaderboardService()
+
+
+@lazy_singleton
+def get_artist_aliases():
+    """Admin-editable artist aliases accepted as guesses."""
+    from app.artist_aliases import ArtistAliasStore
+    return ArtistAliasStore()
+
+
+@lazy_singleton
+def get_local_enricher():
+    """Offline genre/style/mood guesser used when adding songs."""
+    from app.music_enrichment import LocalMusicEnricher
+    return LocalMusicEnricher()
@@ -0,0 +1,117 @@
+"""
+File Storage Primitives
+
+Advisory file locks and atomic writes so several uvicorn worker processes
+can share the JSON storage directories safely.
+"""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+from app.serialization import encode_file_bytes
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+# Process umask, read once (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+_thread_locks: dict = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock_for(path: Path) -> threading.Lock:
+    """In-process lock used when fcntl is not available."""
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(str(path), threading.Lock())
+
+
+@contextmanager
+def file_lock(lock_path: Union[str, Path]) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on a lock file.
+    
+    The lock is released when the block exits (or the process dies), so a
+    crashed worker never leaves storage locked.
+    
+    Args:
+        lock_path: Path of the lock file (created if missing)
+    """
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    if fcntl is None:
+        with _thread_lock_for(lock_path):
+            yield
+        return
+    
+    with open(lock_path, "a+b") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes):
+    """
+    Replace a file's contents atomically.
+    
+    Data goes to a temporary file in the same directory, is fsynced, and is
+    then renamed over the destination, so readers see either the old or the
+    new file, never a truncated one. The new file keeps the old file's
+    permissions (mkstemp creates it 0600).
+    
+    Args:
+        path: Destination file
+        data: New contents
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write_json(path: Union[str, Path], obj: Any, compress: Optional[bool] = None):
+    """Atomically write an object as a storage file (see app.serialization)."""
+    atomic_write_bytes(path, encode_file_bytes(obj, compress))
+
+
+def file_signature(path: Union[str, Path]) -> Optional[tuple]:
+    """
+    Cheap identity of a file's current contents, for cache invalidation.
+    
+    Atomic writes always install a new inode, so the tuple changes on every
+    write without reading the file.
+    
+    Returns:
+        (inode, mtime_ns, size) or None if the file does not exist
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
@@ -2,10 +2,18 @@
 Game Session Manager
 
 Manages active game sessions with in-memory storage.
+
+Each session also publishes its state changes (round start, guess
+result, score, game over) to any clients streaming them, so the frontend
+does not need to poll.
 """
 
+import asyncio
+import re
+import threading
 import uuid
-from typing import Dict, Optional
+from collections import deque
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 import sys
@@ -14,9 +22,69 @@ import os
 # Add parent directory to path to import src modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.spotify_client import SpotifyClient
 from src.game_engine import GameEngine
+from src.guess_matcher import DEFAULT_LENIENCY, AnswerKey, build_answer_key
 from app.models import Track, Artist, Album
+from app.artist_aliases import ArtistAliasStore
+
+if TYPE_CHECKING:
+    from src.spotify_client import SpotifyClient
+
+
+# Events kept per session so a reconnecting client (Last-Event-ID) misses none
+EVENT_HISTORY = 50
+# Events a slow client may have waiting before its stream is ended
+EVENT_QUEUE_SIZE = 100
+
+# (id, type, data) of one published session event
+SessionEvent = Tuple[int, str, Dict[str, Any]]
+
+
+def _end_stream(queue: asyncio.Queue):
+    """Tell a stream to finish, dropping its backlog if the queue is full."""
+    if queue.full():
+        while not queue.empty():
+            queue.get_nowait()
+    queue.put_nowait(None)
+
+
+# A guest credited in the artist name ("A feat. B"). Commas and "&" are
+# not separators: they are part of names like "Earth, Wind & Fire" or
+# "Tyler, The Creator", and providers list real co-artists separately.
+_CREDIT_SEPARATORS = re.compile(r"\s+(?:feat\.?|ft\.|featuring)\s+", re.IGNORECASE)
+
+
+def credited_artists(song: dict) -> List[str]:
+    """Names of every artist credited on a track, primary artist first."""
+    names = []
+    for artist in song.get('artists') or []:
+        names.extend(name for name in _CREDIT_SEPARATORS.split(artist['name']) if name)
+    return names or ['Unknown Artist']
+
+
+def build_artist_key(
+    song: dict,
+    aliases: Optional[ArtistAliasStore] = None,
+    phonetic: bool = False
+) -> AnswerKey:
+    """
+    Answer key accepting any credited artist of a track or any of their aliases.
+    
+    Args:
+        song: Track with an 'artists' list
+        aliases: Alias store to include aliases from (None for names only)
+        phonetic: Also accept names that sound like the artist (easy games)
+        
+    Returns:
+        Key whose answer is the full primary artist credit
+    """
+    artists = credited_artists(song)
+    alternatives = list(artists)
+    if aliases is not None:
+        for artist in artists:
+            alternatives.extend(aliases.aliases_for(artist))
+    primary = song['artists'][0]['name'] if song.get('artists') else artists[0]
+    return build_answer_key(primary, alternatives, phonetic=phonetic)
 
 
 class GameSessionData:
@@ -25,21 +93,117 @@ class GameSessionData:
     def __init__(
         self, 
         session_id: str, 
-        spotify_client: SpotifyClient,
+        spotify_client: Optional['SpotifyClient'],
         game_engine: GameEngine,
         songs: list,
-        total_rounds: int
+        total_rounds: int,
+        aliases: Optional[ArtistAliasStore] = None,
+        leniency: str = DEFAULT_LENIENCY,
+        list_id: Optional[str] = None,
+        player_name: Optional[str] = None
     ):
         self.session_id = session_id
         self.spotify_client = spotify_client
         self.game_engine = game_engine
         self.songs = songs
+        self.leniency = leniency
+        # Custom list the songs came from; its leaderboard gets the final score
+        self.list_id = list_id
+        self.player_name = player_name
+        # Guesses name any credited artist (or an alias); normalized once
+        # per round here so checking a guess is a hash lookup. Phonetic
+        # keys are only needed when easy games accept sound-alike names.
+        self.answer_keys: List[AnswerKey] = [
+            build_artist_key(song, aliases, phonetic=leniency == "easy")
+            for song in songs
+        ]
         self.total_rounds = total_rounds
         self.current_round = 0
         self.current_song = None
         self.first_guess_made = False
         self.created_at = datetime.now()
         self.last_activity = datetime.now()
+        # Guesses arrive on threadpool threads; one at a time per session
+        self.guess_lock = threading.Lock()
+        self.event_id = 0
+        self.event_history: deque = deque(maxlen=EVENT_HISTORY)
+        self.subscribers: set = set()
+        self._events_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def state(self) -> Dict[str, Any]:
+        """Current round and score, as sent to a newly connected stream."""
+        return {
+            "total_rounds": self.total_rounds,
+            "current_round": self.current_round,
+            "first_guess_made": self.first_guess_made,
+            "score": self.game_engine.score,
+            "total_questions": self.game_engine.total_questions
+        }
+    
+    def publish(self, event_type: str, data: Dict[str, Any]):
+        """
+        Send an event to every client streaming this session.
+        
+        Safe to call from any thread: the event is numbered and kept in the
+        history here, and handed to the streams' queues on their event
+        loop. A client whose queue is full has its stream ended; it
+        reconnects and catches up from the history.
+        
+        Args:
+            event_type: Event name (round_start, guess_result, score, game_over)
+            data: JSON-compatible payload
+        """
+        with self._events_lock:
+            self.event_id += 1
+            event = (self.event_id, event_type, data)
+            self.event_history.append(event)
+            if not self.subscribers:
+                return
+            queues = list(self.subscribers)
+        self._loop.call_soon_threadsafe(self._deliver, event, queues)
+    
+    def _deliver(self, event: SessionEvent, queues: List[asyncio.Queue]):
+        """Queue an event for streams (runs on the event loop)."""
+        for queue in queues:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.unsubscribe(queue)
+                _end_stream(queue)
+    
+    def subscribe(self, last_event_id: Optional[int] = None) -> Tuple[asyncio.Queue, List[SessionEvent]]:
+        """
+        Start receiving this session's events.
+        
+        Args:
+            last_event_id: ID of the last event a reconnecting client saw
+            
+        Returns:
+            Queue of new events (None when the stream should end), and the
+            missed events still in the history
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        missed = []
+        with self._events_lock:
+            self._loop = asyncio.get_running_loop()
+            self.subscribers.add(queue)
+            if last_event_id is not None:
+                missed = [event for event in self.event_history if event[0] > last_event_id]
+        return queue, missed
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Stop sending events to a queue."""
+        with self._events_lock:
+            self.subscribers.discard(queue)
+    
+    def close_streams(self):
+        """End every open event stream (the session is going away)."""
+        with self._events_lock:
+            queues = list(self.subscribers)
+            self.subscribers.clear()
+        for queue in queues:
+            self._loop.call_soon_threadsafe(_end_stream, queue)
     
     def update_activity(self):
         """Update last activity timestamp."""
@@ -61,7 +225,11 @@ class GameSessionManager:
         client_id: str,
         client_secret: str,
         songs: list,
-        total_rounds: int
+        total_rounds: int,
+        aliases: Optional[ArtistAliasStore] = None,
+        leniency: str = DEFAULT_LENIENCY,
+        list_id: Optional[str] = None,
+        player_name: Optional[str] = None
     ) -> str:
         """
         Create a new game session.
@@ -71,6 +239,10 @@ class GameSessionManager:
             client_secret: Spotify API client secret (empty for Deezer/demo/custom)
             songs: List of songs for the game
             total_rounds: Number of rounds to play
+            aliases: Artist aliases to accept as guesses
+            leniency: How forgiving guess checking is ("strict", "normal" or "easy")
+            list_id: Custom list the songs came from (for its leaderboard)
+            player_name: Name shown on the leaderboard
             
         Returns:
             str: Session ID
@@ -83,6 +255,7 @@ class GameSessionManager:
             spotify_client = None
         else:
             # Assume it's Spotify if client_secret is provided
+            from src.spotify_client import SpotifyClient
             spotify_client = SpotifyClient(client_id, client_secret)
             
         game_engine = GameEngine()
@@ -93,7 +266,11 @@ class GameSessionManager:
             spotify_client=spotify_client,
             game_engine=game_engine,
             songs=songs[:total_rounds],
-            total_rounds=total_rounds
+            total_rounds=total_rounds,
+            aliases=aliases,
+            leniency=leniency,
+            list_id=list_id,
+            player_name=player_name
         )
         
         self.sessions[session_id] = session
@@ -108,17 +285,20 @@ class GameSessionManager:
     
     def delete_session(self, session_id: str):
         """Delete a session."""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        session = self.sessions.pop(session_id, None)
+        if session:
+            session.close_streams()
     
     def cleanup_expired_sessions(self, timeout_minutes: int = 30):
         """Remove expired sessions."""
         expired = [
-            sid for sid, session in self.sessions.items()
+            sid for sid, session in list(self.sessions.items())
             if session.is_expired(timeout_minutes)
         ]
         for sid in expired:
-            del self.sessions[sid]
+            session = self.sessions.pop(sid, None)
+            if session:
+                session.close_streams()
     
     def convert_track_to_model(self, track: dict) -> Track:
         """Convert Spotify track dict to Pydantic model."""
@@ -133,6 +313,3 @@ class GameSessionManager:
             preview_url=track.get('preview_url')
         )
 
-
-# Global session manager instance
-session_manager = GameSessionManager()
@@ -0,0 +1,63 @@
+"""
+HTTP Caching Helpers
+
+Strong ETags built from in-memory resource version counters (never from
+hashing the response body) and conditional GET handling.
+"""
+
+import zlib
+from typing import Any
+
+from fastapi import Request, Response
+
+# Cache-Control for endpoints whose content only changes with a deploy
+STATIC_CACHE_CONTROL = "public, max-age=86400"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from resource identifiers and version tokens.
+    
+    Args:
+        *parts: Resource name, version token and any response variant keys
+    
+    Returns:
+        Quoted ETag value
+    """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def query_variant(request: Request) -> str:
+    """Short, stable key for the query string so each variant gets its own ETag."""
+    query = request.url.query
+    if not query:
+        return "0"
+    return format(zlib.crc32(query.encode()), "x")
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check whether the client's If-None-Match header matches the ETag.
+    
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+    
+    Returns:
+        True if the client already has the current representation
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    
+    if header.strip() == "*":
+        return True
+    
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified_response(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag."""
+    return Response(status_code=304, headers={"ETag": etag})
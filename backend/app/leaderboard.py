@@ -0,0 +1,218 @@
+"""
+Per-List Leaderboards
+
+Final scores of finished custom-list games, for "top 10 tonight" and
+"your rank" per list.
+
+Each list's scores are kept in memory in lists sorted by
+(-score, recorded_at), one for all time and one per day, so ranks are
+found by binary search (bisect) and the top k is a slice. Scores are
+persisted incrementally: each one is appended as a line to
+``data/leaderboards/{list_id}.ndjson``, and a list's file is read back
+the first time its leaderboard is used.
+
+Workers share the files: appends happen under an advisory file lock, and
+each worker reads the lines other workers appended before it ranks or
+records a score.
+"""
+
+import os
+import re
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.file_storage import file_lock
+from app.serialization import dumps, loads
+
+# Leaderboard windows: every score, or those recorded today
+WINDOWS = ("all", "today")
+
+# List IDs become file names
+_LIST_ID = re.compile(r"^[\w-]{1,64}$")
+
+# (-score, recorded_at, entry) - sorts best score first, earliest first on ties
+RankedEntry = Tuple[float, str, Dict[str, Any]]
+
+
+class ListLeaderboard:
+    """Sorted scores of one list."""
+    
+    def __init__(self):
+        self.all_time: List[RankedEntry] = []
+        self.by_day: Dict[str, List[RankedEntry]] = {}
+        self.by_session: Dict[str, Dict[str, Any]] = {}
+        # Bytes of the list's log already added
+        self.offset = 0
+    
+    def add(self, entry: Dict[str, Any]):
+        """Insert a score in O(log n) comparisons."""
+        ranked = (-entry["score"], entry["recorded_at"], entry)
+        insort(self.all_time, ranked, key=lambda item: item[:2])
+        insort(self.by_day.setdefault(entry["recorded_at"][:10], []), ranked, key=lambda item: item[:2])
+        if entry.get("session_id"):
+            self.by_session[entry["session_id"]] = entry
+    
+    def entries(self, window: str) -> List[RankedEntry]:
+        """Sorted scores in a window."""
+        if window == "today":
+            return self.by_day.get(datetime.now().date().isoformat(), [])
+        return self.all_time
+    
+    @staticmethod
+    def in_window(entry: Dict[str, Any], window: str) -> bool:
+        """Check whether a score falls in a window."""
+        return window != "today" or entry["recorded_at"][:10] == datetime.now().date().isoformat()
+    
+    @staticmethod
+    def rank_of(entries: List[RankedEntry], score: float) -> int:
+        """1-based rank of a score (ties share the best rank)."""
+        return bisect_left(entries, -score, key=lambda item: item[0]) + 1
+
+
+class LeaderboardService:
+    """Records and queries per-list leaderboards."""
+    
+    def __init__(self, data_dir: str = "data/leaderboards"):
+        """
+        Initialize the leaderboard service.
+        
+        Args:
+            data_dir: Directory holding one NDJSON score log per list
+        """
+        self.data_dir = data_dir
+        self._lock = threading.Lock()
+        self._boards: Dict[str, ListLeaderboard] = {}
+    
+    @staticmethod
+    def is_valid_list_id(list_id: str) -> bool:
+        """Check that a list ID is safe to use as a file name."""
+        return bool(_LIST_ID.match(list_id or ""))
+    
+    def _path(self, list_id: str) -> str:
+        return os.path.join(self.data_dir, f"{list_id}.ndjson")
+    
+    def _board(self, list_id: str) -> ListLeaderboard:
+        """
+        A list's leaderboard with every score logged so far, including
+        those other workers appended (lock held).
+        """
+        board = self._boards.get(list_id)
+        if board is None:
+            board = self._boards[list_id] = ListLeaderboard()
+        
+        path = self._path(list_id)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return board
+        if size <= board.offset:
+            return board
+        
+        with open(path, 'rb') as f:
+            f.seek(board.offset)
+            for line in f:
+                # A line still being written by another worker
+                if not line.endswith(b"\n"):
+                    break
+                board.offset += len(line)
+                try:
+                    board.add(loads(line))
+                except Exception:
+                    # A line torn by a crash mid-append; the rest is kept
+                    continue
+        return board
+    
+    def record(
+        self,
+        list_id: str,
+        score: float,
+        total_rounds: int,
+        player_name: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record the final score of a game.
+        
+        Args:
+            list_id: Custom list the game was played from
+            score: Final score
+            total_rounds: Rounds played
+            player_name: Name to show (anonymous if empty)
+            session_id: Game session, so each game is recorded once
+        
+        Returns:
+            The stored entry with its all-time and today ranks, or None if
+            this session was already recorded or the list ID is invalid
+        """
+        if not self.is_valid_list_id(list_id):
+            return None
+        
+        entry = {
+            "score": float(score),
+            "total_rounds": total_rounds,
+            "player_name": (player_name or "").strip()[:40] or "Anonymous",
+            "session_id": session_id,
+            "recorded_at": datetime.now().isoformat(timespec="seconds")
+        }
+        lock_path = os.path.join(self.data_dir, ".locks", f"{list_id}.lock")
+        with self._lock, file_lock(lock_path):
+            board = self._board(list_id)
+            if session_id and session_id in board.by_session:
+                return None
+            board.add(entry)
+            try:
+                line = dumps(entry) + b"\n"
+                with open(self._path(list_id), 'ab') as f:
+                    # End a line torn by a crash mid-append so ours stays readable
+                    size = f.seek(0, os.SEEK_END)
+                    if size > board.offset:
+                        line = b"\n" + line
+                    f.write(line)
+                board.offset = size + len(line)
+            except Exception as e:
+                print(f"Error saving leaderboard score for {list_id}: {e}")
+            return {
+                **entry,
+                "rank": board.rank_of(board.all_time, entry["score"]),
+                "rank_today": board.rank_of(board.entries("today"), entry["score"])
+            }
+    
+    def top(
+        self,
+        list_id: str,
+        window: str = "all",
+        limit: int = 10,
+        session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Best scores of a list, and optionally one game's rank.
+        
+        Args:
+            list_id: Custom list ID
+            window: One of WINDOWS
+            limit: Number of top scores
+            session_id: Game whose rank to include as "you"
+        
+        Returns:
+            dict: total_entries, top (ranked entries) and you (or None)
+        """
+        with self._lock:
+            board = self._board(list_id)
+            entries = board.entries(window)
+            top = []
+            for neg_score, _, entry in entries[:limit]:
+                top.append({**self._public(entry), "rank": board.rank_of(entries, -neg_score)})
+            
+            you = None
+            mine = board.by_session.get(session_id) if session_id else None
+            if mine is not None and board.in_window(mine, window):
+                you = {**self._public(mine), "rank": board.rank_of(entries, mine["score"])}
+            
+            return {"total_entries": len(entries), "top": top, "you": you}
+    
+    @staticmethod
+    def _public(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Entry fields shown to players (session IDs stay private)."""
+        return {key: value for key, value in entry.items() if key != "session_id"}
@@ -0,0 +1,488 @@
+"""
+Metadata Library Indexes
+
+In-memory secondary indexes kept up to date by MetadataLibrary as songs
+are added, replaced and removed, so lookups never scan the whole library.
+"""
+
+import bisect
+import heapq
+import threading
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from src.text_utils import normalize_text, word_suffixes
+
+# Metadata fields tracked per artist for suggestions
+SUGGESTION_FIELDS = ('genre', 'style', 'mood')
+
+
+def artist_key(artist_name: Optional[str]) -> str:
+    """Normalized form of an artist name used as an index key."""
+    return (artist_name or '').strip().casefold()
+
+
+def _decrement(counter: Counter, value: Any):
+    """Remove one occurrence of a value, dropping it when it reaches zero."""
+    counter[value] -= 1
+    if counter[value] <= 0:
+        del counter[value]
+
+
+class ArtistIndex:
+    """
+    Casefolded artist name -> song keys, with running metadata counters.
+    
+    Each artist keeps genre, style and mood counters that are adjusted on
+    every add/remove, and computed suggestions are cached per artist until
+    that artist's songs change.
+    """
+    
+    def __init__(self):
+        self._songs: Dict[str, Dict[str, None]] = {}
+        self._counters: Dict[str, Dict[str, Counter]] = {}
+        self._suggestions: Dict[str, Dict[str, Any]] = {}
+    
+    def add(self, key: str, song: Dict[str, Any]):
+        """Index a song under its artist."""
+        artist = artist_key(song.get('artist'))
+        self._songs.setdefault(artist, {})[key] = None
+        
+        counters = self._counters.setdefault(
+            artist, {field: Counter() for field in SUGGESTION_FIELDS}
+        )
+        metadata = song.get('metadata') or {}
+        for field in SUGGESTION_FIELDS:
+            value = metadata.get(field)
+            if value:
+                counters[field][value] += 1
+        
+        self._suggestions.pop(artist, None)
+    
+    def remove(self, key: str, song: Dict[str, Any]):
+        """Remove a previously indexed song."""
+        artist = artist_key(song.get('artist'))
+        keys = self._songs.get(artist)
+        if keys is None or key not in keys:
+            return
+        
+        del keys[key]
+        metadata = song.get('metadata') or {}
+        counters = self._counters[artist]
+        for field in SUGGESTION_FIELDS:
+            value = metadata.get(field)
+            if value:
+                _decrement(counters[field], value)
+        
+        if not keys:
+            del self._songs[artist]
+            del self._counters[artist]
+        
+        self._suggestions.pop(artist, None)
+    
+    def song_keys(self, artist_name: str) -> List[str]:
+        """Keys of all songs by an artist (case-insensitive)."""
+        return list(self._songs.get(artist_key(artist_name), ()))
+    
+    def suggestions(self, artist_name: str, songs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Metadata suggestions for an artist, computed once and cached.
+        
+        Args:
+            artist_name: Artist name (any case)
+            songs: Library songs by key, used to return the artist's entries
+        
+        Returns:
+            Same structure as MetadataLibrary.get_artist_suggestions
+        """
+        artist = artist_key(artist_name)
+        cached = self._suggestions.get(artist)
+        if cached is not None:
+            return cached
+        
+        keys = self._songs.get(artist)
+        if not keys:
+            return {
+                'found': False,
+                'count': 0
+            }
+        
+        counters = self._counters[artist]
+        result = {
+            'found': True,
+            'count': len(keys),
+            'songs': [songs[key] for key in keys],
+            'suggestions': {
+                field: counters[field].most_common(1)[0][0] if counters[field] else None
+                for field in SUGGESTION_FIELDS
+            },
+            'genre_distribution': dict(counters['genre']),
+            'style_distribution': dict(counters['style']),
+            'mood_distribution': dict(counters['mood'])
+        }
+        self._suggestions[artist] = result
+        return result
+
+
+class RankedCounter:
+    """
+    Counter that keeps items bucketed by count for cheap top-k queries.
+    
+    Updates by +/-1 move an item between neighbouring buckets, and
+    most_common(k) walks buckets from the highest count down, so neither
+    depends on the number of distinct items.
+    """
+    
+    def __init__(self):
+        self._counts: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, Dict[Hashable, None]] = {}
+        self._levels: List[int] = []  # non-empty bucket counts, ascending
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+    
+    def __bool__(self) -> bool:
+        return bool(self._counts)
+    
+    def add(self, item: Hashable, delta: int = 1):
+        """Change an item's count (items reaching zero are dropped)."""
+        old = self._counts.get(item, 0)
+        new = old + delta
+        
+        if old > 0:
+            bucket = self._buckets[old]
+            del bucket[item]
+            if not bucket:
+                del self._buckets[old]
+                del self._levels[bisect.bisect_left(self._levels, old)]
+        
+        if new > 0:
+            self._counts[item] = new
+            bucket = self._buckets.get(new)
+            if bucket is None:
+                bucket = self._buckets[new] = {}
+                bisect.insort(self._levels, new)
+            bucket[item] = None
+        else:
+            self._counts.pop(item, None)
+    
+    def as_dict(self) -> Dict[Hashable, int]:
+        """All counts as a plain dict."""
+        return dict(self._counts)
+    
+    def most_common(self, k: int) -> List[Tuple[Hashable, int]]:
+        """The k items with the highest counts, highest first."""
+        result = []
+        for count in reversed(self._levels):
+            for item in self._buckets[count]:
+                result.append((item, count))
+                if len(result) == k:
+                    return result
+        return result
+
+
+# Metadata fields counted across the whole library
+STATISTIC_FIELDS = ('genre', 'style', 'mood', 'decade')
+
+
+class LibraryStatistics:
+    """
+    Library-wide aggregates maintained by deltas on every add/remove.
+    
+    total_artists counts distinct artist keys (casefolded, trimmed names),
+    not counting songs without an artist; top_artists lists names as
+    stored. The assembled statistics dict is cached until the next change, so
+    repeated reads cost O(1) regardless of library size.
+    """
+    
+    def __init__(self):
+        self.song_count = 0
+        self.artists = RankedCounter()
+        self.artist_keys: Counter = Counter()
+        self.fields = {field: RankedCounter() for field in STATISTIC_FIELDS}
+        self._snapshot: Optional[Dict[str, Any]] = None
+    
+    def add(self, song: Dict[str, Any]):
+        """Count a song."""
+        self._apply(song, 1)
+    
+    def remove(self, song: Dict[str, Any]):
+        """Stop counting a song."""
+        self._apply(song, -1)
+    
+    def _apply(self, song: Dict[str, Any], delta: int):
+        self.song_count += delta
+        self.artists.add(song.get('artist'), delta)
+        key = artist_key(song.get('artist'))
+        if key:
+            if delta > 0:
+                self.artist_keys[key] += delta
+            else:
+                _decrement(self.artist_keys, key)
+        metadata = song.get('metadata') or {}
+        for field in STATISTIC_FIELDS:
+            value = metadata.get(field)
+            if value:
+                self.fields[field].add(value, delta)
+        self._snapshot = None
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Statistics in the shape returned by MetadataLibrary.get_statistics
+        (without last_updated). Do not mutate the result.
+        """
+        if self._snapshot is not None:
+            return self._snapshot
+        
+        if not self.song_count:
+            self._snapshot = {
+                'total_songs': 0,
+                'total_artists': 0,
+                'genres': {},
+                'styles': {},
+                'moods': {},
+                'decades': {},
+                'top_artists': []
+            }
+            return self._snapshot
+        
+        genres = self.fields['genre']
+        decades = self.fields['decade']
+        self._snapshot = {
+            'total_songs': self.song_count,
+            'total_artists': len(self.artist_keys),
+            'genres': genres.as_dict(),
+            'styles': self.fields['style'].as_dict(),
+            'moods': self.fields['mood'].as_dict(),
+            'decades': decades.as_dict(),
+            'top_artists': [
+                {'artist': artist, 'count': count}
+                for artist, count in self.artists.most_common(10)
+            ],
+            'most_common_genre': genres.most_common(1)[0] if genres else None,
+            'most_common_decade': decades.most_common(1)[0] if decades else None
+        }
+        return self._snapshot
+
+
+class PrefixIndex:
+    """
+    Sorted (term, value) pairs searched by prefix with bisect.
+    
+    Changes are buffered and merged on the next search: a few are inserted
+    in place, a large batch (e.g. an import) triggers one sorted rebuild,
+    so neither single saves nor bulk loads pay per-entry list shifts.
+    """
+    
+    REBUILD_THRESHOLD = 64
+    
+    def __init__(self):
+        self._entries: List[Tuple[str, Hashable]] = []
+        self._changes: Dict[Tuple[str, Hashable], int] = {}
+    
+    def __len__(self) -> int:
+        self._apply_changes()
+        return len(self._entries)
+    
+    def load(self, entries: Iterable[Tuple[str, Hashable]]):
+        """Replace the contents with the given entries."""
+        self._entries = sorted(set(entries))
+        self._changes.clear()
+    
+    def add(self, term: str, value: Hashable):
+        self._change((term, value), 1)
+    
+    def remove(self, term: str, value: Hashable):
+        self._change((term, value), -1)
+    
+    def has_pending_changes(self) -> bool:
+        """True if the next search will first merge buffered changes."""
+        return bool(self._changes)
+    
+    def _change(self, entry: Tuple[str, Hashable], delta: int):
+        net = self._changes.get(entry, 0) + delta
+        if net:
+            self._changes[entry] = net
+        else:
+            self._changes.pop(entry, None)
+    
+    def _apply_changes(self):
+        if not self._changes:
+            return
+        
+        entries = self._entries
+        if len(self._changes) <= self.REBUILD_THRESHOLD:
+            for entry, net in self._changes.items():
+                i = bisect.bisect_left(entries, entry)
+                present = i < len(entries) and entries[i] == entry
+                if net > 0 and not present:
+                    entries.insert(i, entry)
+                elif net < 0 and present:
+                    del entries[i]
+        else:
+            removed = {entry for entry, net in self._changes.items() if net < 0}
+            added = sorted(entry for entry, net in self._changes.items() if net > 0)
+            kept = [entry for entry in entries if entry not in removed] if removed else entries
+            self._entries = list(heapq.merge(kept, added))
+        self._changes.clear()
+    
+    def search(self, prefix: str) -> List[Hashable]:
+        """Values of all terms starting with prefix, in term order."""
+        self._apply_changes()
+        entries = self._entries
+        lo = bisect.bisect_left(entries, (prefix,))
+        hi = bisect.bisect_left(entries, (prefix + "\U0010ffff",), lo)
+        return [value for _, value in entries[lo:hi]]
+
+
+class AutocompleteIndex:
+    """
+    As-you-type suggestions over artist names and song titles.
+    
+    Names are normalized (casefolded, accents and punctuation stripped) and
+    indexed from each word, so "beat" finds "The Beatles" and "rhap" finds
+    "Bohemian Rhapsody". Results are ranked by times_used and cached per
+    prefix; a change only drops the cached prefixes of the names it touches,
+    so short, broad prefixes are not rescanned after unrelated saves.
+    
+    Searches may run concurrently once has_pending_changes() is False;
+    changes (and searches that merge them) must run alone.
+    """
+    
+    CACHE_SIZE = 4096
+    
+    def __init__(self):
+        self._titles = PrefixIndex()
+        self._artists = PrefixIndex()
+        # normalized artist -> [display name, song count, total times_used]
+        self._artist_stats: Dict[str, List[Any]] = {}
+        # prefix -> {limit: suggestions}; the caller's query is added on the way out
+        self._cache: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._cache_max_len = 0
+        self._cache_lock = threading.Lock()
+    
+    def load(self, songs: Iterable[Tuple[str, Dict[str, Any]]]):
+        """Build the index for a whole library at once."""
+        self._artist_stats.clear()
+        title_entries = []
+        for key, song in songs:
+            title_entries.extend((term, key) for term in word_suffixes(song.get('name')))
+            self._count_artist(song, 1)
+        self._titles.load(title_entries)
+        self._cache.clear()
+        self._artists.load(
+            (term, artist)
+            for artist, stats in self._artist_stats.items()
+            for term in word_suffixes(stats[0])
+        )
+    
+    def add(self, key: str, song: Dict[str, Any]):
+        """Index a song."""
+        titles = word_suffixes(song.get('name'))
+        for term in titles:
+            self._titles.add(term, key)
+        artist = self._count_artist(song, 1)
+        artists = word_suffixes(self._artist_stats[artist][0]) if artist else []
+        if artist and self._artist_stats[artist][1] == 1:
+            for term in artists:
+                self._artists.add(term, artist)
+        self._invalidate(titles + artists)
+    
+    def remove(self, key: str, song: Dict[str, Any]):
+        """Remove a previously indexed song."""
+        titles = word_suffixes(song.get('name'))
+        for term in titles:
+            self._titles.remove(term, key)
+        artist = normalize_text(song.get('artist'))
+        stats = self._artist_stats.get(artist)
+        artists = word_suffixes(stats[0]) if stats is not None else []
+        if stats is not None and stats[1] == 1:
+            for term in artists:
+                self._artists.remove(term, artist)
+        self._count_artist(song, -1)
+        self._invalidate(titles + artists)
+    
+    def has_pending_changes(self) -> bool:
+        """True if the next search will modify the prefix indexes."""
+        return self._titles.has_pending_changes() or self._artists.has_pending_changes()
+    
+    def _invalidate(self, terms: List[str]):
+        """Drop cached results for every prefix of the given terms."""
+        if not self._cache:
+            return
+        cache = self._cache
+        for term in terms:
+            for end in range(1, min(len(term), self._cache_max_len) + 1):
+                cache.pop(term[:end], None)
+    
+    def _count_artist(self, song: Dict[str, Any], delta: int) -> str:
+        artist = normalize_text(song.get('artist'))
+        if not artist:
+            return artist
+        stats = self._artist_stats.get(artist)
+        if stats is None:
+            if delta < 0:
+                return artist
+            stats = self._artist_stats[artist] = [song.get('artist'), 0, 0]
+        stats[1] += delta
+        stats[2] += delta * (song.get('times_used') or 0)
+        if stats[1] <= 0:
+            del self._artist_stats[artist]
+        return artist
+    
+    def complete(self, query: str, songs: Dict[str, Dict[str, Any]], limit: int = 10) -> Dict[str, Any]:
+        """
+        Suggest artists and songs whose names start with the query.
+        
+        Args:
+            query: Text typed so far (any case, accents optional)
+            songs: Library songs by key
+            limit: Maximum suggestions of each kind
+        
+        Returns:
+            {"query", "artists": [...], "songs": [...]} ranked by times_used
+        """
+        prefix = normalize_text(query)
+        cached = self._cache.get(prefix, {}).get(limit)
+        if cached is not None:
+            return {'query': query, **cached}
+        
+        if not prefix:
+            result = {'artists': [], 'songs': []}
+        else:
+            song_keys = dict.fromkeys(self._titles.search(prefix))
+            top_songs = heapq.nlargest(
+                limit, song_keys, key=lambda k: songs[k].get('times_used') or 0
+            )
+            artists = dict.fromkeys(self._artists.search(prefix))
+            top_artists = heapq.nlargest(
+                limit, artists, key=lambda a: self._artist_stats[a][2]
+            )
+            result = {
+                'artists': [
+                    {
+                        'artist': self._artist_stats[a][0],
+                        'song_count': self._artist_stats[a][1],
+                        'times_used': self._artist_stats[a][2]
+                    }
+                    for a in top_artists
+                ],
+                'songs': [
+                    {
+                        'id': songs[k].get('id'),
+                        'provider': songs[k].get('provider'),
+                        'name': songs[k].get('name'),
+                        'artist': songs[k].get('artist'),
+                        'times_used': songs[k].get('times_used') or 0
+                    }
+                    for k in top_songs
+                ]
+            }
+        
+        with self._cache_lock:
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.clear()
+                self._cache_max_len = 0
+            self._cache.setdefault(prefix, {})[limit] = result
+            self._cache_max_len = max(self._cache_max_len, len(prefix))
+        return {'query': query, **result}
@@ -0,0 +1,303 @@
+"""
+Metadata Library Streaming
+
+Incremental parsing of library imports and chunked generation of exports,
+so neither holds the whole library (or a second copy of it) in memory.
+
+Accepted import formats (export produces the same ones):
+- NDJSON: one song entry per line
+- JSON array of song entries
+- The JSON object produced by /library/export ({"songs": {key: entry}})
+
+A song entry is either a library song ({"id", "provider", ...}) or a
+{"key": ..., "song": {...}} pair.
+"""
+
+import codecs
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.serialization import dumps, loads
+
+_WHITESPACE = " \t\r\n"
+
+# Target size of each chunk handed to the response
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+class ImportFormatError(ValueError):
+    """Raised when an import stream is not valid NDJSON or JSON."""
+
+
+def song_record(entry: Any, key: Optional[str] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Normalize an import entry to a (key, song) pair.
+    
+    Args:
+        entry: Parsed entry from the stream
+        key: Library key, when the format provides one
+    
+    Returns:
+        (key, song) or None if the entry is not a usable song
+    """
+    if not isinstance(entry, dict):
+        return None
+    
+    if key is None and isinstance(entry.get("song"), dict):
+        key = entry.get("key")
+        entry = entry["song"]
+    
+    if key is None:
+        if not entry.get("id") or not entry.get("provider"):
+            return None
+        key = f"{entry['provider']}_{entry['id']}"
+    
+    if not isinstance(key, str) or not key:
+        return None
+    return key, entry
+
+
+class NDJSONParser:
+    """Splits a byte stream into parsed lines."""
+    
+    def __init__(self):
+        self._buffer = b""
+        self.line_number = 0
+    
+    def feed(self, chunk: bytes) -> Iterator[Any]:
+        """Parse every complete line in the data received so far."""
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            yield from self._parse_line(line)
+    
+    def close(self) -> Iterator[Any]:
+        """Parse a final line without a trailing newline."""
+        line, self._buffer = self._buffer, b""
+        yield from self._parse_line(line)
+    
+    def _parse_line(self, line: bytes) -> Iterator[Any]:
+        self.line_number += 1
+        if not line.strip():
+            return
+        try:
+            yield loads(line)
+        except ValueError as e:
+            raise ImportFormatError(f"Invalid JSON on line {self.line_number}: {e}")
+
+
+class JSONEntryParser:
+    """
+    Incremental parser for a JSON array of entries or an export object.
+    
+    Yields (key, entry) tuples as soon as each entry is complete; key is None
+    for array items. Only one entry is ever held in memory at a time.
+    """
+    
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []  # "array", "object", "songs"
+        self._pending_key: Optional[str] = None
+        self._done = False
+    
+    def feed(self, chunk: bytes) -> Iterator[Tuple[Optional[str], Any]]:
+        """Parse all complete entries in the data received so far."""
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(chunk)
+        self._pos = 0
+        yield from self._parse(final=False)
+    
+    def close(self) -> Iterator[Tuple[Optional[str], Any]]:
+        """Finish parsing; raises if the document is incomplete."""
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(b"", final=True)
+        self._pos = 0
+        yield from self._parse(final=True)
+        if not self._done:
+            raise ImportFormatError("Unexpected end of JSON import")
+    
+    def _skip(self, separators: str = _WHITESPACE) -> Optional[str]:
+        """Skip separators and return the next character (None if buffer is exhausted)."""
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in separators:
+            self._pos += 1
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+    
+    def _value(self, final: bool) -> Tuple[bool, Any]:
+        """Decode one complete JSON value at the current position."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise ImportFormatError(f"Invalid JSON import: {e}")
+            return False, None
+        # A number or literal at the very end of the buffer may continue in the next chunk
+        if end == len(self._buffer) and not final and not isinstance(value, (dict, list, str)):
+            return False, None
+        self._pos = end
+        return True, value
+    
+    def _parse(self, final: bool) -> Iterator[Tuple[Optional[str], Any]]:
+        while not self._done:
+            if not self._stack:
+                char = self._skip()
+                if char is None:
+                    return
+                if char == "[":
+                    self._stack.append("array")
+                elif char == "{":
+                    self._stack.append("object")
+                else:
+                    raise ImportFormatError("JSON import must be an array or an object")
+                self._pos += 1
+                continue
+            
+            state = self._stack[-1]
+            char = self._skip(_WHITESPACE + ",")
+            if char is None:
+                return
+            
+            if state == "array":
+                if char == "]":
+                    self._pos += 1
+                    self._stack.pop()
+                    self._done = True
+                    continue
+                complete, value = self._value(final)
+                if not complete:
+                    return
+                yield None, value
+                continue
+            
+            # Object members: "key": value
+            if char == "}":
+                self._pos += 1
+                self._stack.pop()
+                if not self._stack:
+                    self._done = True
+                continue
+            
+            start = self._pos
+            if self._pending_key is None:
+                complete, key = self._value(final)
+                if not complete:
+                    return
+                if not isinstance(key, str):
+                    raise ImportFormatError("Invalid JSON import: expected an object key")
+                if self._skip() is None:
+                    self._pos = start
+                    return
+                if self._buffer[self._pos] != ":":
+                    raise ImportFormatError("Invalid JSON import: expected ':'")
+                self._pos += 1
+                self._pending_key = key
+            
+            if self._skip() is None:
+                return
+            
+            key = self._pending_key
+            if state == "object" and key == "songs" and self._buffer[self._pos] in "{[":
+                # Stream the members of the songs map (or array) one at a time
+                self._stack.append("songs" if self._buffer[self._pos] == "{" else "array")
+                self._pos += 1
+                self._pending_key = None
+                continue
+            
+            complete, value = self._value(final)
+            if not complete:
+                return
+            self._pending_key = None
+            if state == "songs":
+                yield key, value
+            # Other top-level members (version, statistics, ...) are ignored
+
+
+async def iter_import_records(
+    chunks: AsyncIterator[bytes],
+    ndjson: bool
+) -> AsyncIterator[Optional[Tuple[str, Dict[str, Any]]]]:
+    """
+    Parse an import body incrementally.
+    
+    Args:
+        chunks: Request body chunks
+        ndjson: True for NDJSON, False for a JSON array or export object
+    
+    Yields:
+        (key, song) for each entry, or None if the entry is not a usable song
+    """
+    if ndjson:
+        parser = NDJSONParser()
+        async for chunk in chunks:
+            for entry in parser.feed(chunk):
+                yield song_record(entry)
+        for entry in parser.close():
+            yield song_record(entry)
+    else:
+        parser = JSONEntryParser()
+        async for chunk in chunks:
+            for key, entry in parser.feed(chunk):
+                yield song_record(entry, key)
+        for key, entry in parser.close():
+            yield song_record(entry, key)
+
+
+def export_chunks(
+    songs: Iterable[Tuple[str, Dict[str, Any]]],
+    format: str = "json",
+    header: Optional[Dict[str, Any]] = None
+) -> Iterator[bytes]:
+    """
+    Serialize songs for export one at a time, in chunks of ~64 KB.
+    
+    Args:
+        songs: (key, song) pairs, e.g. MetadataLibrary.iter_songs()
+        format: "json" for the export object ({..header, "songs": {key: song}}),
+            "array" for a JSON array of songs, "ndjson" for one song per line
+        header: Top-level members written before "songs" in json format
+    
+    Yields:
+        Encoded chunks
+    """
+    if format == "ndjson":
+        prefix, separator, suffix = b"", b"", b""
+    elif format == "array":
+        prefix, separator, suffix = b"[", b",", b"]"
+    else:
+        members = b"".join(dumps(k) + b":" + dumps(v) + b"," for k, v in (header or {}).items())
+        prefix, separator, suffix = b"{" + members + b'"songs":{', b",", b"}}"
+    
+    def encode(key: str, song: Dict[str, Any]) -> bytes:
+        if format == "ndjson":
+            return dumps(song) + b"\n"
+        if format == "array":
+            return dumps(song)
+        return dumps(key) + b":" + dumps(song)
+    
+    parts = [prefix]
+    size = len(prefix)
+    first = True
+    for key, song in songs:
+        data = encode(key, song)
+        if not first:
+            parts.append(separator)
+        first = False
+        parts.append(data)
+        size += len(data)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield b"".join(parts)
+            parts = []
+            size = 0
+    parts.append(suffix)
+    yield b"".join(parts)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a chunk stream into a single gzip member as it is produced."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -4,14 +4,52 @@ FastAPI Backend for Music Guessing Game
 Main application entry point with CORS configuration.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import game, songs, admin
+from app.api.routes import game, songs, admin, rooms
+from app.custom_list_manager import PLAY_COUNT_FLUSH_INTERVAL
+from app.dependencies import get_custom_list_manager, get_deck_pool, get_metadata_library
+from app.serialization import CompactJSONResponse
+
+
+async def flush_play_counts_periodically():
+    """Flush buffered custom list play counts on a fixed interval."""
+    while True:
+        await asyncio.sleep(PLAY_COUNT_FLUSH_INTERVAL)
+        if not get_custom_list_manager.is_created():
+            continue
+        try:
+            get_custom_list_manager().flush_play_counts()
+        except Exception as e:
+            print(f"Failed to flush play counts: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run background maintenance tasks and flush state on shutdown."""
+    flush_task = asyncio.create_task(flush_play_counts_periodically())
+    try:
+        yield
+    finally:
+        flush_task.cancel()
+        if get_deck_pool.is_created():
+            get_deck_pool().shutdown()
+        # Services nothing has used were never loaded and have nothing to save
+        if get_custom_list_manager.is_created():
+            get_custom_list_manager().flush_play_counts()
+        if get_metadata_library.is_created():
+            get_metadata_library().checkpoint()
+
 
 app = FastAPI(
     title="Music Guessing Game API",
     description="Backend API for the Music Guessing Game with multi-provider support and custom admin lists",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=CompactJSONResponse
 )
 
 # Configure CORS for Next.js frontend
@@ -30,6 +68,7 @@ app.add_middleware(
 app.include_router(game.router, prefix="/api/game", tags=["game"])
 app.include_router(songs.router, prefix="/api/songs", tags=["songs"])
 app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+app.include_router(rooms.router, prefix="/api/rooms", tags=["rooms"])
 
 
 @app.get("/")
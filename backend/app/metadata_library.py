@@ -3,13 +3,81 @@ Metadata Library Manager
 
 Manages user's personal song metadata database.
 Learns from manual entries and provides intelligent suggestions.
+
+Changes are appended to a write-ahead log (``metadata_library.wal``, one
+JSON entry per line) instead of rewriting the whole library on every save.
+The log is periodically checkpointed into a compact snapshot
+(``metadata_library.json``) and replayed on load, so a crash loses at most
+a partially written final entry.
+
+Several worker processes can share one library: appends and checkpoints
+happen under an advisory file lock, and each worker applies the log
+entries other workers appended (or reloads the snapshot after another
+worker's checkpoint) before it reads or writes.
 """
 
-import json
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
 from datetime import datetime
-from collections import Counter
+
+from app.serialization import dumps, loads, read_json_file
+from app.file_storage import atomic_write_json, file_lock, file_signature
+from app.rwlock import ReadWriteLock
+from app.library_indexes import ArtistIndex, AutocompleteIndex, LibraryStatistics
+from app.search_index import TrigramIndex
+
+# Checkpoint once the log holds this many entries or bytes
+WAL_CHECKPOINT_ENTRIES = 1000
+WAL_CHECKPOINT_BYTES = 8 * 1024 * 1024
+
+# fsync every log append (set LIBRARY_WAL_FSYNC=0 to trade durability for speed)
+WAL_FSYNC = os.getenv("LIBRARY_WAL_FSYNC", "1") != "0"
+
+# Storage backend: "json" (snapshot + log, default) or "sqlite"
+LIBRARY_BACKEND = os.getenv("METADATA_LIBRARY_BACKEND", "json").lower()
+
+
+def build_song_entry(
+    song_id: str,
+    provider: str,
+    name: str,
+    artist: str,
+    album: Optional[str],
+    release_date: Optional[str],
+    metadata: Dict[str, Any],
+    existing: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Build a library entry from user input, carrying over usage history.
+    
+    Args:
+        song_id, provider, name, artist, album, release_date, metadata:
+            As for MetadataLibrary.save_song_metadata
+        existing: Current entry for the same song, if any
+        
+    Returns:
+        Song entry as stored in the library
+    """
+    now = datetime.now().isoformat()
+    return {
+        'id': song_id,
+        'provider': provider,
+        'name': name,
+        'artist': artist,
+        'album': album,
+        'release_date': release_date,
+        'metadata': {
+            'decade': metadata.get('decade'),
+            'genre': metadata.get('genre'),
+            'style': metadata.get('style'),
+            'mood': metadata.get('mood'),
+            'difficulty': metadata.get('difficulty'),
+            'notes': metadata.get('notes', '')
+        },
+        'added_date': existing.get('added_date') if existing else now,
+        'last_updated': now,
+        'times_used': existing.get('times_used', 0) + 1 if existing else 1
+    }
 
 
 class MetadataLibrary:
@@ -18,6 +86,15 @@ class MetadataLibrary:
     
     Stores metadata for songs that have been manually categorized,
     enabling auto-population and consistency across lists.
+    
+    Safe to use from threadpool handlers: changes take the write lock, and
+    reads that walk the songs or the indexes take the read lock, so they
+    run in parallel with each other but never see a half-applied change.
+    Song entries are replaced rather than modified, so single-song lookups
+    need no lock at all.
+    
+    Changes made by other processes are picked up on the next call (see
+    _refresh), so the library can be shared between uvicorn workers.
     """
     
     def __init__(self, data_dir: str = "data"):
@@ -29,14 +106,76 @@ class MetadataLibrary:
         """
         self.data_dir = data_dir
         self.library_path = os.path.join(data_dir, "metadata_library.json")
+        self.wal_path = os.path.join(data_dir, "metadata_library.wal")
+        
+        # Guards the in-memory songs and indexes
+        self._lock = ReadWriteLock()
+        
+        # Serializes log appends and checkpoints across processes (taken
+        # before the write lock)
+        self._file_lock_path = os.path.join(data_dir, ".locks", "metadata_library.lock")
+        
+        # How much of the files on disk the in-memory library reflects:
+        # the snapshot it was loaded from and the log bytes applied since
+        self._snapshot_signature: Optional[tuple] = None
+        self._wal_entries = 0
+        self._wal_bytes = 0
+        
+        with file_lock(self._file_lock_path):
+            self._reload(repair=True)
+    
+    def _reload(self, repair: bool = False):
+        """Load the snapshot and replay the log into fresh in-memory state."""
+        # Signature first: a checkpoint racing with the load can only make
+        # the state look stale and be reloaded again, never look current
+        self._snapshot_signature = file_signature(self.library_path)
         self.library = self._load_library()
+        self._build_indexes()
+        self._wal_entries = 0
+        self._wal_bytes = 0
+        self._replay_wal(repair)
+    
+    def _is_stale(self) -> bool:
+        """Check whether another process changed the files since they were applied."""
+        if file_signature(self.library_path) != self._snapshot_signature:
+            return True
+        try:
+            return os.path.getsize(self.wal_path) != self._wal_bytes
+        except FileNotFoundError:
+            return self._wal_bytes != 0
+    
+    def _sync(self, repair: bool = False):
+        """
+        Apply changes other processes made (write lock held).
+        
+        Args:
+            repair: Truncate a torn final log entry (only with the file lock
+                held, when no other process can be mid-append)
+        """
+        if not self._is_stale():
+            return
+        try:
+            wal_size = os.path.getsize(self.wal_path)
+        except FileNotFoundError:
+            wal_size = 0
+        if (file_signature(self.library_path) != self._snapshot_signature
+                or wal_size < self._wal_bytes):
+            # Another process checkpointed
+            self._reload(repair)
+        else:
+            self._replay_wal(repair)
+    
+    def _refresh(self):
+        """Catch up with other processes before a read (cheap when nothing changed)."""
+        if self._is_stale():
+            with self._lock.write():
+                self._sync()
     
     def _load_library(self) -> Dict[str, Any]:
-        """Load library from disk or create new one."""
+        """Load the library snapshot from disk or create new one."""
         if os.path.exists(self.library_path):
             try:
-                with open(self.library_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return read_json_file(self.library_path)
             except Exception as e:
                 print(f"Error loading metadata library: {e}")
                 return self._create_empty_library()
@@ -56,36 +195,199 @@ class MetadataLibrary:
             }
         }
     
-    def _save_library(self):
-        """Save library to disk."""
+    def _build_indexes(self):
+        """Build the secondary indexes from the loaded library."""
+        self._artist_index = ArtistIndex()
+        self._statistics = LibraryStatistics()
+        self._autocomplete = AutocompleteIndex()
+        self._search: Optional[TrigramIndex] = None  # built on first fuzzy search
+        for key, song in self.library['songs'].items():
+            self._artist_index.add(key, song)
+            self._statistics.add(song)
+        self._autocomplete.load(self.library['songs'].items())
+    
+    def _put_song(self, key: str, song: Dict[str, Any]):
+        """Insert or replace a song in memory, keeping indexes in sync."""
+        songs = self.library['songs']
+        existing = songs.get(key)
+        if existing is not None:
+            self._artist_index.remove(key, existing)
+            self._statistics.remove(existing)
+            self._autocomplete.remove(key, existing)
+            self._unindex_names(key, existing)
+        songs[key] = song
+        self._artist_index.add(key, song)
+        self._statistics.add(song)
+        self._autocomplete.add(key, song)
+        self._index_names(key, song)
+    
+    def _remove_song(self, key: str) -> Optional[Dict[str, Any]]:
+        """Remove a song from memory, keeping indexes in sync."""
+        existing = self.library['songs'].pop(key, None)
+        if existing is not None:
+            self._artist_index.remove(key, existing)
+            self._statistics.remove(existing)
+            self._autocomplete.remove(key, existing)
+            self._unindex_names(key, existing)
+        return existing
+    
+    def _index_names(self, key: str, song: Dict[str, Any]):
+        """Add a song's title and artist to the fuzzy search index (once built)."""
+        if self._search is not None:
+            self._search.add(song.get('name'), ("song", key))
+            self._search.add(song.get('artist'), ("artist",))
+    
+    def _unindex_names(self, key: str, song: Dict[str, Any]):
+        """Remove a song's title and artist from the fuzzy search index (once built)."""
+        if self._search is not None:
+            self._search.remove(song.get('name'), ("song", key))
+            self._search.remove(song.get('artist'), ("artist",))
+    
+    def _replay_wal(self, repair: bool = False):
+        """
+        Apply log entries not applied yet (all of them after a reload).
+        
+        Replay stops at the first entry that cannot be parsed. Without the
+        file lock that may be another process's append in progress, and is
+        picked up by a later call. With repair (file lock held) it is a
+        write torn by a crash, and the log is truncated there so later
+        appends start on a clean line.
+        
+        Args:
+            repair: Truncate the log after the last valid entry
+        """
+        if not os.path.exists(self.wal_path):
+            return
+        
+        with open(self.wal_path, 'rb') as f:
+            f.seek(self._wal_bytes)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    self._apply_wal_entry(loads(line))
+                except Exception:
+                    break
+                self._wal_bytes += len(line)
+                self._wal_entries += 1
+        
+        if repair and self._wal_bytes < os.path.getsize(self.wal_path):
+            print(f"Metadata library log: discarding torn entry after {self._wal_entries} entries")
+            with open(self.wal_path, 'r+b') as f:
+                f.truncate(self._wal_bytes)
+    
+    def _apply_wal_entry(self, entry: Dict[str, Any]):
+        """Apply one log entry to the in-memory library."""
+        if entry["op"] == "put":
+            self._put_song(entry["key"], entry["song"])
+        elif entry["op"] == "del":
+            self._remove_song(entry["key"])
+        else:
+            raise ValueError(f"Unknown log operation: {entry['op']}")
+        
+        if entry.get("ts"):
+            self.library.setdefault('statistics', {})['last_updated'] = entry["ts"]
+    
+    def _commit(self, entries: List[Dict[str, Any]], allow_checkpoint: bool = True):
+        """
+        Durably record changes already applied to the in-memory library.
+        
+        Caller must hold the file lock and the write lock, and must have
+        called _sync(repair=True) before applying the changes. Small batches are appended to the log (O(batch) I/O); large ones,
+        or a log that has grown past its limits, trigger a checkpoint.
+        
+        Args:
+            entries: Log entries ({"op": "put"|"del", "key": ..., "song": ...})
+            allow_checkpoint: False to always append, leaving the checkpoint
+                to the caller (used by streaming imports)
+        """
+        if not entries:
+            return
+        
+        now = datetime.now().isoformat()
+        self.library.setdefault('statistics', {})['last_updated'] = now
+        self._update_statistics()
+        
+        if allow_checkpoint and len(entries) >= WAL_CHECKPOINT_ENTRIES:
+            self._checkpoint_locked()
+            return
+        
+        data = b"".join(dumps({**entry, "ts": now}) + b"\n" for entry in entries)
+        os.makedirs(self.data_dir, exist_ok=True)
+        with open(self.wal_path, 'ab') as f:
+            f.write(data)
+            f.flush()
+            if WAL_FSYNC:
+                os.fsync(f.fileno())
+        
+        self._wal_entries += len(entries)
+        self._wal_bytes += len(data)
+        
+        if allow_checkpoint and (self._wal_entries >= WAL_CHECKPOINT_ENTRIES
+                                 or self._wal_bytes >= WAL_CHECKPOINT_BYTES):
+            self._checkpoint_locked()
+    
+    def checkpoint(self):
+        """Write a full snapshot of the library and empty the log (if it has entries)."""
+        with file_lock(self._file_lock_path):
+            # The statistics live in the library dict, so they change under
+            # the write lock; the snapshot itself only needs readers kept
+            # consistent (other writers wait for the file lock)
+            with self._lock.write():
+                self._sync(repair=True)
+                self._update_statistics()
+            with self._lock.read():
+                if self._wal_entries or not os.path.exists(self.library_path):
+                    self._checkpoint_locked()
+    
+    def _checkpoint_locked(self):
+        """
+        Checkpoint while holding the file lock and the read or write lock
+        (statistics must already be up to date).
+        """
         try:
-            # Ensure directory exists
             os.makedirs(self.data_dir, exist_ok=True)
             
-            # Update statistics
-            self._update_statistics()
+            # Snapshot first, then truncate the log. A crash in between only
+            # means the log is replayed again, and every entry is idempotent.
+            atomic_write_json(self.library_path, self.library)
+            with open(self.wal_path, 'wb'):
+                pass
+            self._snapshot_signature = file_signature(self.library_path)
+            self._wal_entries = 0
+            self._wal_bytes = 0
             
-            # Save to file
-            with open(self.library_path, 'w', encoding='utf-8') as f:
-                json.dump(self.library, f, indent=2, ensure_ascii=False)
-                
-            print(f"Metadata library saved: {len(self.library['songs'])} songs")
+            print(f"Metadata library checkpointed: {len(self.library['songs'])} songs")
             
         except Exception as e:
             print(f"Error saving metadata library: {e}")
             raise
     
     def _update_statistics(self):
-        """Update library statistics."""
-        songs = self.library.get('songs', {})
-        artists = set(song.get('artist', '').lower() for song in songs.values())
-        
+        """Update the statistics stored in the snapshot (write lock held)."""
         self.library['statistics'] = {
-            "total_songs": len(songs),
-            "total_artists": len(artists),
-            "last_updated": datetime.now().isoformat()
+            "total_songs": len(self.library['songs']),
+            "total_artists": self._statistics.snapshot()['total_artists'],
+            "last_updated": self.library.get('statistics', {}).get(
+                'last_updated', datetime.now().isoformat()
+            )
         }
     
+    def get_version(self) -> str:
+        """
+        Get a version token for the library contents.
+        
+        Built from the snapshot's identity and the log length, so every
+        worker reports the same token for the same contents.
+        
+        Returns:
+            Token that changes whenever any worker changes the library
+        """
+        self._refresh()
+        with self._lock.read():
+            inode, mtime_ns, _ = self._snapshot_signature or (0, 0, 0)
+            return f"{inode:x}.{mtime_ns:x}.{self._wal_bytes}"
+    
     def _make_song_key(self, song_id: str, provider: str) -> str:
         """Create unique key for song."""
         return f"{provider}_{song_id}"
@@ -102,6 +404,8 @@ class MetadataLibrary:
             Song metadata if found, None otherwise
         """
         key = self._make_song_key(song_id, provider)
+        self._refresh()
+        # A single dict lookup is atomic, and entries are never modified in place
         return self.library.get('songs', {}).get(key)
     
     def save_song_metadata(
@@ -131,152 +435,252 @@ class MetadataLibrary:
         """
         key = self._make_song_key(song_id, provider)
         
-        # Check if song already exists
-        existing = self.library['songs'].get(key)
-        
-        song_entry = {
-            'id': song_id,
-            'provider': provider,
-            'name': name,
-            'artist': artist,
-            'album': album,
-            'release_date': release_date,
-            'metadata': {
-                'decade': metadata.get('decade'),
-                'genre': metadata.get('genre'),
-                'style': metadata.get('style'),
-                'mood': metadata.get('mood'),
-                'difficulty': metadata.get('difficulty'),
-                'notes': metadata.get('notes', '')
-            },
-            'added_date': existing.get('added_date') if existing else datetime.now().isoformat(),
-            'last_updated': datetime.now().isoformat(),
-            'times_used': existing.get('times_used', 0) + 1 if existing else 1
-        }
-        
-        self.library['songs'][key] = song_entry
-        self._save_library()
+        with file_lock(self._file_lock_path), self._lock.write():
+            self._sync(repair=True)
+            
+            # Check if song already exists
+            existing = self.library['songs'].get(key)
+            
+            song_entry = build_song_entry(
+                song_id, provider, name, artist, album, release_date, metadata, existing
+            )
+            
+            self._put_song(key, song_entry)
+            self._commit([{"op": "put", "key": key, "song": song_entry}])
         
         return song_entry
     
+    def delete_song(self, song_id: str, provider: str) -> bool:
+        """
+        Remove a song from the library.
+        
+        Args:
+            song_id: Song ID from provider
+            provider: Music provider
+            
+        Returns:
+            True if the song was removed, False if it was not in the library
+        """
+        key = self._make_song_key(song_id, provider)
+        with file_lock(self._file_lock_path), self._lock.write():
+            self._sync(repair=True)
+            if self._remove_song(key) is None:
+                return False
+            
+            self._commit([{"op": "del", "key": key}])
+        return True
+    
     def search_by_artist(self, artist_name: str) -> List[Dict[str, Any]]:
         """
         Find all songs by an artist in the library.
         
+        Uses the artist index, so the cost is proportional to the number of
+        songs by this artist rather than the size of the library.
+        
         Args:
-            artist_name: Artist name to search for
+            artist_name: Artist name to search for (case-insensitive)
             
         Returns:
             List of songs by this artist
         """
-        artist_lower = artist_name.lower()
-        matching_songs = []
-        
-        for song in self.library.get('songs', {}).values():
-            if song.get('artist', '').lower() == artist_lower:
-                matching_songs.append(song)
-        
-        return matching_songs
+        self._refresh()
+        with self._lock.read():
+            songs = self.library['songs']
+            return [songs[key] for key in self._artist_index.song_keys(artist_name)]
     
     def get_artist_suggestions(self, artist_name: str) -> Dict[str, Any]:
         """
         Get metadata suggestions based on user's history with this artist.
         
+        Suggestions come from running per-artist counters and are cached
+        until one of the artist's songs changes.
+        
         Args:
             artist_name: Artist name
             
         Returns:
             Suggested metadata based on most common values
         """
-        songs = self.search_by_artist(artist_name)
+        self._refresh()
+        with self._lock.read():
+            return self._artist_index.suggestions(artist_name, self.library['songs'])
+    
+    def autocomplete(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        Suggest artists and song titles starting with the typed text.
         
-        if not songs:
-            return {
-                'found': False,
-                'count': 0
-            }
+        Uses a sorted prefix index over normalized names (case and accents
+        ignored), ranked by times_used.
         
-        # Collect metadata from all songs by this artist
-        genres = [s['metadata'].get('genre') for s in songs if s['metadata'].get('genre')]
-        styles = [s['metadata'].get('style') for s in songs if s['metadata'].get('style')]
-        moods = [s['metadata'].get('mood') for s in songs if s['metadata'].get('mood')]
+        Args:
+            query: Text typed so far
+            limit: Maximum suggestions of each kind
+            
+        Returns:
+            Matching artists and songs, most used first
+        """
+        self._refresh()
+        with self._lock.read():
+            if not self._autocomplete.has_pending_changes():
+                return self._autocomplete.complete(query, self.library['songs'], limit)
         
-        # Find most common values
-        genre_counts = Counter(genres)
-        style_counts = Counter(styles)
-        mood_counts = Counter(moods)
+        # Merging buffered index changes modifies the index, so the first
+        # search after a change runs alone
+        with self._lock.write():
+            return self._autocomplete.complete(query, self.library['songs'], limit)
+    
+    def fuzzy_search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Find songs and artists whose names approximately match the query.
         
-        return {
-            'found': True,
-            'count': len(songs),
-            'songs': songs,
-            'suggestions': {
-                'genre': genre_counts.most_common(1)[0][0] if genre_counts else None,
-                'style': style_counts.most_common(1)[0][0] if style_counts else None,
-                'mood': mood_counts.most_common(1)[0][0] if mood_counts else None,
-            },
-            'genre_distribution': dict(genre_counts),
-            'style_distribution': dict(style_counts),
-            'mood_distribution': dict(mood_counts)
-        }
+        Uses a trigram index with bounded edit distance, so spelling
+        variants ("Guns N Roses" / "Guns N' Roses") are found without
+        scanning the library. The index is built on first use and then
+        kept up to date by every change.
+        
+        Args:
+            query: Name to look for
+            limit: Maximum number of results
+            
+        Returns:
+            Matches ordered by edit distance
+        """
+        self._refresh()
+        if self._search is None:
+            with self._lock.write():
+                if self._search is None:
+                    self._search = TrigramIndex()
+                    for key, song in self.library['songs'].items():
+                        self._index_names(key, song)
+        
+        with self._lock.read():
+            return self._fuzzy_search(query, limit)
+    
+    def _fuzzy_search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Run a fuzzy search while holding the read lock."""
+        songs = self.library['songs']
+        results = []
+        for match in self._search.search(query, limit):
+            for ref, count in match.refs.items():
+                result = {
+                    "source": "library",
+                    "value": match.text,
+                    "distance": match.distance,
+                    "similarity": match.similarity
+                }
+                if ref[0] == "artist":
+                    result.update({"field": "artist", "song_count": count})
+                else:
+                    song = songs[ref[1]]
+                    result.update({
+                        "field": "name",
+                        "id": song.get('id'),
+                        "provider": song.get('provider'),
+                        "artist": song.get('artist')
+                    })
+                results.append(result)
+                if len(results) >= limit:
+                    return results
+        return results
     
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get comprehensive library statistics.
         
+        All aggregates are running counters updated on every change, so
+        this costs O(1) regardless of library size.
+        
         Returns:
             Dictionary with library statistics
         """
-        songs = self.library.get('songs', {})
-        
-        if not songs:
+        self._refresh()
+        with self._lock.read():
+            stats = self._statistics.snapshot()
+            if not stats['total_songs']:
+                return dict(stats)
+            
             return {
-                'total_songs': 0,
-                'total_artists': 0,
-                'genres': {},
-                'styles': {},
-                'moods': {},
-                'decades': {},
-                'top_artists': []
+                **stats,
+                'last_updated': self.library.get('statistics', {}).get('last_updated')
             }
-        
-        # Collect metadata
-        artists = [s.get('artist') for s in songs.values()]
-        genres = [s['metadata'].get('genre') for s in songs.values() if s['metadata'].get('genre')]
-        styles = [s['metadata'].get('style') for s in songs.values() if s['metadata'].get('style')]
-        moods = [s['metadata'].get('mood') for s in songs.values() if s['metadata'].get('mood')]
-        decades = [s['metadata'].get('decade') for s in songs.values() if s['metadata'].get('decade')]
-        
-        # Count occurrences
-        artist_counts = Counter(artists)
-        genre_counts = Counter(genres)
-        style_counts = Counter(styles)
-        mood_counts = Counter(moods)
-        decade_counts = Counter(decades)
-        
-        return {
-            'total_songs': len(songs),
-            'total_artists': len(set(artists)),
-            'genres': dict(genre_counts),
-            'styles': dict(style_counts),
-            'moods': dict(mood_counts),
-            'decades': dict(decade_counts),
-            'top_artists': [
-                {'artist': artist, 'count': count}
-                for artist, count in artist_counts.most_common(10)
-            ],
-            'most_common_genre': genre_counts.most_common(1)[0] if genre_counts else None,
-            'most_common_decade': decade_counts.most_common(1)[0] if decade_counts else None,
-            'last_updated': self.library.get('statistics', {}).get('last_updated')
-        }
     
     def get_all_songs(self) -> List[Dict[str, Any]]:
         """Get all songs in the library."""
-        return list(self.library.get('songs', {}).values())
+        self._refresh()
+        with self._lock.read():
+            return list(self.library.get('songs', {}).values())
+    
+    def iter_songs(self, since: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over library songs without copying them.
+        
+        Only the list of keys is snapshotted (under the read lock), so the
+        library can change while a slow consumer iterates: songs removed in
+        the meantime are skipped.
+        
+        Args:
+            since: Only songs whose last_updated is at or after this ISO timestamp
+            
+        Yields:
+            (key, song) pairs
+        """
+        self._refresh()
+        with self._lock.read():
+            songs = self.library['songs']
+            keys = list(songs)
+        for key in keys:
+            song = songs.get(key)
+            if song is None:
+                continue
+            if since and song.get('last_updated', '') < since:
+                continue
+            yield key, song
     
     def export_library(self) -> Dict[str, Any]:
         """Export entire library."""
-        return self.library
+        self._refresh()
+        with self._lock.read():
+            return {**self.library, 'songs': dict(self.library['songs'])}
+    
+    def get_export_header(self) -> Dict[str, Any]:
+        """Top-level export members other than songs (version, created, statistics)."""
+        self._refresh()
+        with self._lock.read():
+            return {key: value for key, value in self.library.items() if key != 'songs'}
+    
+    def merge_songs(
+        self,
+        songs: Iterable[Tuple[str, Dict[str, Any]]],
+        allow_checkpoint: bool = True
+    ) -> int:
+        """
+        Merge songs into the library and commit them together.
+        
+        A song is taken when it is not in the library yet or when its
+        last_updated is newer than the stored entry.
+        
+        Args:
+            songs: (key, song) pairs
+            allow_checkpoint: False to append the batch to the log without
+                checkpointing (call checkpoint() once all batches are merged)
+            
+        Returns:
+            Number of songs added or replaced
+        """
+        songs = list(songs)
+        changes = []
+        
+        with file_lock(self._file_lock_path), self._lock.write():
+            self._sync(repair=True)
+            library_songs = self.library['songs']
+            for key, song in songs:
+                existing = library_songs.get(key)
+                if not existing or song.get('last_updated', '') > existing.get('last_updated', ''):
+                    self._put_song(key, song)
+                    changes.append({"op": "put", "key": key, "song": song})
+            
+            self._commit(changes, allow_checkpoint=allow_checkpoint)
+        return len(changes)
     
     def import_library(self, data: Dict[str, Any]) -> int:
         """
@@ -288,19 +692,22 @@ class MetadataLibrary:
         Returns:
             Number of songs imported
         """
-        imported_count = 0
-        
-        for key, song in data.get('songs', {}).items():
-            # Only import if not already present or if newer
-            existing = self.library['songs'].get(key)
-            
-            if not existing or song.get('last_updated', '') > existing.get('last_updated', ''):
-                self.library['songs'][key] = song
-                imported_count += 1
-        
-        self._save_library()
-        return imported_count
+        return self.merge_songs(data.get('songs', {}).items())
+
 
+def create_metadata_library(data_dir: str = "data"):
+    """
+    Create the metadata library for the configured backend.
+    
+    Args:
+        data_dir: Directory to store library data
+        
+    Returns:
+        MetadataLibrary, or SQLiteMetadataLibrary when
+        METADATA_LIBRARY_BACKEND=sqlite
+    """
+    if LIBRARY_BACKEND == "sqlite":
+        from app.sqlite_library import SQLiteMetadataLibrary
+        return SQLiteMetadataLibrary(data_dir)
+    return MetadataLibrary(data_dir)
 
-# Global instance
-metadata_library = MetadataLibrary()
@@ -24,10 +24,15 @@ class GameStartRequest(BaseModel):
     query: str = Field(default="", min_length=0)
     num_rounds: int = Field(default=10, ge=1, le=50)
     demo_mode: bool = Field(default=False)
+    leniency: Literal["strict", "normal", "easy"] = Field(
+        default="normal",
+        description="How forgiving guess checking is: exact names only, also small typos, or also names that sound right"
+    )
     
     # For custom mode
     custom_list_id: Optional[str] = Field(default=None, description="ID of custom song list")
     custom_filters: Optional[dict] = Field(default=None, description="Filters for custom list (decade, genre, style, mood, difficulty)")
+    player_name: Optional[str] = Field(default=None, max_length=40, description="Name shown on the list's leaderboard")
 
 
 class Artist(BaseModel):
@@ -76,6 +81,52 @@ class GuessResponse(BaseModel):
     is_final_guess: bool = False
 
 
+class PlayerGuess(BaseModel):
+    """One player's guess in a batch."""
+    player_id: str
+    guess: str
+    second_guess: bool = Field(default=False, description="True if the player already saw the title hint")
+
+
+class BatchGuessRequest(BaseModel):
+    """Guesses from every player in a room for the same round (event mode)."""
+    session_id: str
+    round_number: Optional[int] = Field(default=None, ge=0, description="Round to check against (defaults to the current round)")
+    guesses: List[PlayerGuess] = Field(default_factory=list, max_length=5000)
+
+
+class PlayerGuessResult(BaseModel):
+    """Result of one player's guess in a batch."""
+    player_id: str
+    correct: bool
+    points_earned: float
+
+
+class BatchGuessResponse(BaseModel):
+    """Results of a batch of guesses, in request order."""
+    round_number: int
+    correct_answer: str
+    correct_count: int
+    results: List[PlayerGuessResult]
+
+
+class RoomCreateRequest(BaseModel):
+    """Open a multiplayer room on a host's game session."""
+    session_id: str
+
+
+class RoomCreateResponse(BaseModel):
+    """A new room: players join with the code, the host keeps the token."""
+    code: str
+    host_token: str
+    total_rounds: int
+
+
+class RoomHostRequest(BaseModel):
+    """Host action on a room."""
+    host_token: str
+
+
 class GameStats(BaseModel):
     """Final game statistics."""
     total_rounds: int
@@ -209,6 +209,3 @@ class LocalMusicEnricher:
         else:
             return 'Contemporary'
 
-
-# Global instance
-local_enricher = LocalMusicEnricher()
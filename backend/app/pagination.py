@@ -0,0 +1,124 @@
+"""
+Pagination Helpers
+
+Cursor pagination, field projection and NDJSON streaming for large
+song collections returned by the admin API.
+"""
+
+import base64
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+from app.serialization import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(offset: int) -> str:
+    """
+    Encode a position as an opaque cursor.
+    
+    Args:
+        offset: Index of the next item to return
+    
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps({"o": offset}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Cursor string, or None for the first page
+    
+    Returns:
+        Index of the next item to return
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return 0
+    
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded))["o"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
+
+def parse_fields(
+    fields: Optional[Union[str, List[str]]],
+    model: Type[BaseModel]
+) -> Optional[List[str]]:
+    """
+    Parse and validate a field projection.
+    
+    Args:
+        fields: Comma-separated string or list of field names
+        model: Model the fields must belong to
+    
+    Returns:
+        List of field names, or None for all fields
+    
+    Raises:
+        ValueError: If a field does not exist on the model
+    """
+    if not fields:
+        return None
+    
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    
+    names = [f.strip() for f in fields if f.strip()]
+    unknown = [f for f in names if f not in model.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return names or None
+
+
+def project(item: BaseModel, fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Convert a model to a dict, keeping only the requested fields."""
+    if fields:
+        return item.model_dump(include=set(fields))
+    return item.model_dump()
+
+
+def paginate(
+    items: Sequence[Any],
+    cursor: Optional[str],
+    page_size: Optional[int]
+) -> Tuple[Sequence[Any], Optional[str]]:
+    """
+    Slice one page out of a sequence.
+    
+    Args:
+        items: Full sequence
+        cursor: Cursor from the previous page (None for the first page)
+        page_size: Items per page (None for DEFAULT_PAGE_SIZE)
+    
+    Returns:
+        Tuple of (page items, cursor for the next page or None)
+    """
+    start = decode_cursor(cursor)
+    end = min(start + (page_size or DEFAULT_PAGE_SIZE), len(items))
+    next_cursor = encode_cursor(end) if end < len(items) else None
+    return items[start:end], next_cursor
+
+
+def ndjson_lines(items: Iterable[BaseModel], fields: Optional[List[str]] = None) -> Iterator[bytes]:
+    """Yield one JSON document per line, serializing items lazily."""
+    for item in items:
+        yield dumps(project(item, fields)) + b"\n"
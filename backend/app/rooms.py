@@ -0,0 +1,359 @@
+"""
+Multiplayer Rooms
+
+One authoritative round timeline shared by every player in a room (event
+mode). The host starts a normal game, opens a room on its session and
+controls the rounds; players join with the room code and send guesses
+over a WebSocket.
+
+Updates for the whole room are encoded to JSON once and the same payload
+is queued on every connection. Each connection drains its own queue, so
+a slow client only delays itself, and one that falls too far behind is
+disconnected instead of buffering without limit. Scoreboard updates are
+coalesced to at most one per SCOREBOARD_INTERVAL however many guesses
+arrive.
+
+Rooms live in memory in one worker, like game sessions.
+"""
+
+import asyncio
+import heapq
+import secrets
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import WebSocket
+
+from app.game_manager import GameSessionData
+from app.serialization import dumps
+from src.guess_matcher import match_guess
+
+# Room codes avoid look-alike characters (0/O, 1/I)
+CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+CODE_LENGTH = 5
+
+# Seconds between scoreboard broadcasts while guesses come in
+SCOREBOARD_INTERVAL = 0.5
+SCOREBOARD_SIZE = 10
+
+# Updates a connection may have waiting before it is dropped
+SEND_QUEUE_SIZE = 64
+
+MAX_ROOM_PLAYERS = 5000
+
+FIRST_GUESS_POINTS = 2.0
+SECOND_GUESS_POINTS = 1.0
+
+
+def encode_event(event: Dict[str, Any]) -> str:
+    """Encode an update once for sending to any number of sockets."""
+    return dumps(event).decode("utf-8")
+
+
+class Connection:
+    """One WebSocket and the updates waiting to be sent to it."""
+    
+    def __init__(self, websocket: WebSocket, player_id: Optional[str] = None):
+        self.websocket = websocket
+        self.player_id = player_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+    
+    def send(self, payload: Optional[str]) -> bool:
+        """
+        Queue an encoded update (None stops the sender).
+        
+        Returns:
+            False if the client is too far behind to keep
+        """
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            return False
+    
+    async def run_sender(self):
+        """Send queued updates in order until stopped or the socket fails."""
+        try:
+            while True:
+                payload = await self.queue.get()
+                if payload is None:
+                    break
+                await self.websocket.send_text(payload)
+        except Exception:
+            pass
+        finally:
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+
+
+class Broadcaster:
+    """Fans encoded updates out to every connection of a room."""
+    
+    def __init__(self):
+        self.connections: set = set()
+    
+    def connect(self, connection: Connection):
+        """Start sending room updates to a connection."""
+        self.connections.add(connection)
+    
+    def disconnect(self, connection: Connection):
+        """Stop sending to a connection and let its sender finish."""
+        if connection in self.connections:
+            self.connections.discard(connection)
+            connection.send(None)
+    
+    def publish(self, event: Dict[str, Any]):
+        """Encode an update once and queue it on every connection."""
+        payload = encode_event(event)
+        lagging = [
+            connection for connection in self.connections
+            if not connection.send(payload)
+        ]
+        for connection in lagging:
+            self.connections.discard(connection)
+            asyncio.ensure_future(connection.websocket.close(code=1008))
+
+
+class RoomPlayer:
+    """
+    A player's score and their guesses in the current round.
+    
+    player_id is public (it is on the scoreboard); rejoin_token is sent
+    only to the player's own socket and is what a reconnect must present.
+    """
+    
+    __slots__ = ("player_id", "rejoin_token", "name", "score", "round", "attempts", "correct")
+    
+    def __init__(self, player_id: str, name: str):
+        self.player_id = player_id
+        self.rejoin_token = secrets.token_urlsafe(16)
+        self.name = name
+        self.score = 0.0
+        self.round = -1
+        self.attempts = 0
+        self.correct = False
+    
+    @property
+    def done(self) -> bool:
+        """Whether the player has no guesses left this round."""
+        return self.correct or self.attempts >= 2
+
+
+class Room:
+    """A shared game: the host's songs and answer keys, and every player."""
+    
+    def __init__(self, code: str, session: GameSessionData):
+        """
+        Open a room on a host's game session.
+        
+        Args:
+            code: Code players join with
+            session: Host session supplying songs, answer keys and leniency
+        """
+        self.code = code
+        self.host_token = secrets.token_urlsafe(16)
+        self.session_id = session.session_id
+        self.songs = session.songs
+        self.answer_keys = session.answer_keys
+        self.leniency = session.leniency
+        self.total_rounds = len(session.songs)
+        self.current_round = -1
+        self.round_open = False
+        self.finished = False
+        self.players: Dict[str, RoomPlayer] = {}
+        self._players_by_token: Dict[str, RoomPlayer] = {}
+        self.broadcaster = Broadcaster()
+        self.last_activity = datetime.now()
+        self._scoreboard_task: Optional[asyncio.Task] = None
+    
+    def is_host(self, token: Optional[str]) -> bool:
+        """Check a host token in constant time."""
+        return bool(token) and secrets.compare_digest(token, self.host_token)
+    
+    def join(self, name: str, rejoin_token: Optional[str] = None) -> RoomPlayer:
+        """
+        Add a player, or return an existing one rejoining with their token.
+        
+        An unknown rejoin token joins as a new player, so a stale token
+        cannot be used to probe for others.
+        
+        Raises:
+            ValueError: If the room is full
+        """
+        self.last_activity = datetime.now()
+        player = self._players_by_token.get(rejoin_token) if rejoin_token else None
+        if player is not None:
+            return player
+        if len(self.players) >= MAX_ROOM_PLAYERS:
+            raise ValueError("Room is full")
+        player = RoomPlayer(secrets.token_urlsafe(8), (name or "").strip()[:40] or "Player")
+        self.players[player.player_id] = player
+        self._players_by_token[player.rejoin_token] = player
+        self.schedule_scoreboard()
+        return player
+    
+    def state(self) -> Dict[str, Any]:
+        """Public room state (no answers)."""
+        return {
+            "code": self.code,
+            "current_round": self.current_round,
+            "total_rounds": self.total_rounds,
+            "round_open": self.round_open,
+            "finished": self.finished,
+            "player_count": len(self.players)
+        }
+    
+    def scoreboard(self, size: int = SCOREBOARD_SIZE) -> List[Dict[str, Any]]:
+        """Top players by score."""
+        top = heapq.nlargest(size, self.players.values(), key=lambda p: p.score)
+        return [
+            {"player_id": p.player_id, "name": p.name, "score": p.score}
+            for p in top
+        ]
+    
+    def guess(self, player: RoomPlayer, guess: str) -> Dict[str, Any]:
+        """
+        Score a player's guess for the open round.
+        
+        The first guess earns FIRST_GUESS_POINTS; a wrong one reveals the
+        title and allows a second guess worth SECOND_GUESS_POINTS.
+        
+        Returns:
+            guess_result update for that player only
+        """
+        self.last_activity = datetime.now()
+        if not self.round_open:
+            return {"type": "error", "detail": "No round in progress"}
+        if player.round != self.current_round:
+            player.round, player.attempts, player.correct = self.current_round, 0, False
+        if player.done:
+            return {"type": "error", "detail": "Already answered this round"}
+        
+        song = self.songs[self.current_round]
+        player.attempts += 1
+        correct = match_guess(guess, self.answer_keys[self.current_round], self.leniency)
+        points = 0.0
+        if correct:
+            points = FIRST_GUESS_POINTS if player.attempts == 1 else SECOND_GUESS_POINTS
+            player.score += points
+            player.correct = True
+            self.schedule_scoreboard()
+        
+        return {
+            "type": "guess_result",
+            "round": self.current_round,
+            "correct": correct,
+            "points_earned": points,
+            "artist_hint": song['name'] if not correct else None,
+            "is_final_guess": player.done,
+            "total_score": player.score
+        }
+    
+    def end_round(self):
+        """Close the open round and reveal its answer to everyone."""
+        if not self.round_open:
+            return
+        self.round_open = False
+        song = self.songs[self.current_round]
+        correct_count = sum(
+            1 for p in self.players.values()
+            if p.round == self.current_round and p.correct
+        )
+        self.broadcaster.publish({
+            "type": "round_ended",
+            "round": self.current_round,
+            "correct_answer": ", ".join(a['name'] for a in song['artists']),
+            "title": song['name'],
+            "correct_count": correct_count,
+            "scoreboard": self.scoreboard()
+        })
+    
+    def next_round(self):
+        """End the open round, if any, and start the next one (or finish)."""
+        self.last_activity = datetime.now()
+        if self.finished:
+            return
+        self.end_round()
+        self.current_round += 1
+        if self.current_round >= self.total_rounds:
+            self.finished = True
+            self.broadcaster.publish({
+                "type": "game_over",
+                "scoreboard": self.scoreboard(),
+                "player_count": len(self.players)
+            })
+            return
+        self.round_open = True
+        self.broadcaster.publish({
+            "type": "round_started",
+            "round": self.current_round,
+            "total_rounds": self.total_rounds
+        })
+    
+    def schedule_scoreboard(self):
+        """Broadcast the scoreboard soon, folding in further changes."""
+        if self._scoreboard_task is None or self._scoreboard_task.done():
+            self._scoreboard_task = asyncio.ensure_future(self._publish_scoreboard())
+    
+    async def _publish_scoreboard(self):
+        await asyncio.sleep(SCOREBOARD_INTERVAL)
+        self.broadcaster.publish({
+            "type": "scoreboard",
+            "scoreboard": self.scoreboard(),
+            "player_count": len(self.players)
+        })
+    
+    def is_expired(self, timeout_minutes: int = 120) -> bool:
+        """Check if nobody is connected and the room has been idle."""
+        return (
+            not self.broadcaster.connections
+            and datetime.now() - self.last_activity > timedelta(minutes=timeout_minutes)
+        )
+
+
+class RoomManager:
+    """Manages all open rooms by code."""
+    
+    def __init__(self):
+        self.rooms: Dict[str, Room] = {}
+    
+    def create_room(self, session: GameSessionData) -> Room:
+        """
+        Open a room on a host's game session.
+        
+        Args:
+            session: Host session supplying the songs
+        
+        Returns:
+            The new room, with a code not used by any open room
+        """
+        self.cleanup_expired_rooms()
+        code = self._new_code()
+        while code in self.rooms:
+            code = self._new_code()
+        room = Room(code, session)
+        self.rooms[code] = room
+        return room
+    
+    @staticmethod
+    def _new_code() -> str:
+        return "".join(secrets.choice(CODE_ALPHABET) for _ in range(CODE_LENGTH))
+    
+    def get_room(self, code: str) -> Optional[Room]:
+        """Get a room by code (case-insensitive)."""
+        return self.rooms.get((code or "").upper())
+    
+    def delete_room(self, code: str):
+        """Close a room."""
+        self.rooms.pop((code or "").upper(), None)
+    
+    def cleanup_expired_rooms(self, timeout_minutes: int = 120):
+        """Remove idle rooms nobody is connected to."""
+        expired = [
+            code for code, room in self.rooms.items()
+            if room.is_expired(timeout_minutes)
+        ]
+        for code in expired:
+            del self.rooms[code]
@@ -0,0 +1,136 @@
+"""
+Fuzzy Search Index
+
+Trigram inverted index over normalized names, used to find near-duplicate
+artists and titles ("Guns N Roses" vs "Guns N' Roses") without scanning
+every entry.
+"""
+
+from typing import Dict, Hashable, List, NamedTuple, Optional, Set
+
+from src.text_utils import bounded_levenshtein, normalize_text
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Trigrams of a normalized string, padded so short strings still have some."""
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(normalized: str) -> int:
+    """Edit distance tolerated for a query of this length."""
+    return min(3, max(1, len(normalized) // 4))
+
+
+class SearchMatch(NamedTuple):
+    """One indexed name matching a query."""
+    text: str
+    normalized: str
+    distance: int
+    similarity: float
+    refs: Dict[Hashable, int]
+
+
+class TrigramIndex:
+    """
+    Trigram postings over distinct normalized names.
+    
+    Each name keeps the references (songs, artists, lists...) that use it,
+    counted so the same name can be added by many entries. A query only
+    looks at names sharing one of its rarest trigrams, filters them by
+    length and shared-trigram count, and confirms the survivors with a
+    bounded edit distance.
+    """
+    
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._refs: Dict[str, Dict[Hashable, int]] = {}
+        self._display: Dict[str, str] = {}
+    
+    def __len__(self) -> int:
+        return len(self._refs)
+    
+    def add(self, text: Optional[str], ref: Hashable):
+        """Index a name for a reference."""
+        normalized = normalize_text(text)
+        if not normalized:
+            return
+        refs = self._refs.get(normalized)
+        if refs is None:
+            refs = self._refs[normalized] = {}
+            self._display[normalized] = text
+            for gram in trigrams(normalized):
+                self._postings.setdefault(gram, set()).add(normalized)
+        refs[ref] = refs.get(ref, 0) + 1
+    
+    def remove(self, text: Optional[str], ref: Hashable):
+        """Remove a name previously added for a reference."""
+        normalized = normalize_text(text)
+        refs = self._refs.get(normalized)
+        if refs is None or ref not in refs:
+            return
+        refs[ref] -= 1
+        if refs[ref] > 0:
+            return
+        del refs[ref]
+        if refs:
+            return
+        
+        del self._refs[normalized]
+        del self._display[normalized]
+        for gram in trigrams(normalized):
+            names = self._postings[gram]
+            names.discard(normalized)
+            if not names:
+                del self._postings[gram]
+    
+    def search(self, query: str, limit: int = 20, max_distance: Optional[int] = None) -> List[SearchMatch]:
+        """
+        Find names within a small edit distance of the query.
+        
+        Args:
+            query: Text to look for (normalized like indexed names)
+            limit: Maximum number of names to return
+            max_distance: Edit distance tolerated (default depends on length)
+        
+        Returns:
+            Matches ordered by distance, then trigram similarity
+        """
+        normalized = normalize_text(query)
+        if not normalized:
+            return []
+        if max_distance is None:
+            max_distance = max_edits(normalized)
+        
+        query_grams = trigrams(normalized)
+        min_shared = max(1, len(query_grams) - 3 * max_distance)
+        postings = sorted(
+            (self._postings.get(gram, set()) for gram in query_grams),
+            key=len
+        )
+        
+        # One edit touches at most 3 trigrams, so a name within max_distance
+        # shares at least min_shared of the query's trigrams, and therefore
+        # at least one of the 3 * max_distance + 1 rarest ones
+        candidates = set()
+        for names in postings[:len(postings) - min_shared + 1]:
+            candidates.update(names)
+        
+        results = []
+        for name in candidates:
+            if abs(len(name) - len(normalized)) > max_distance:
+                continue
+            shared = sum(1 for names in postings if name in names)
+            if shared < min_shared:
+                continue
+            distance = bounded_levenshtein(normalized, name, max_distance)
+            if distance is None:
+                continue
+            similarity = 2 * shared / (len(query_grams) + len(trigrams(name)))
+            results.append((distance, -similarity, name))
+        
+        results.sort()
+        return [
+            SearchMatch(self._display[name], name, distance, round(-negative, 3), self._refs[name])
+            for distance, negative, name in results[:limit]
+        ]
@@ -0,0 +1,157 @@
+"""
+Serialization Layer
+
+Compact JSON encoding for storage files and API responses.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Storage files can optionally be zstd-compressed (set
+STORAGE_COMPRESSION=zstd and install zstandard). Reading detects the
+format from the file contents, so existing pretty-printed JSON files keep
+loading and files can be migrated lazily on their next write.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised without the extra installed
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised without the extra installed
+    zstandard = None
+
+
+# Frame header that starts every zstd-compressed file
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# "none" (default) or "zstd"
+STORAGE_COMPRESSION = os.getenv("STORAGE_COMPRESSION", "none").lower()
+
+ZSTD_LEVEL = 3
+
+_warned_missing_zstd = False
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to compact UTF-8 JSON bytes.
+    
+    Args:
+        obj: JSON-compatible object (dicts, lists, strings, numbers, ...)
+    
+    Returns:
+        Encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse JSON from bytes or text (compact or pretty-printed).
+    
+    Args:
+        data: Encoded JSON
+    
+    Returns:
+        Decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def compression_enabled() -> bool:
+    """Whether storage writes should be zstd-compressed."""
+    if STORAGE_COMPRESSION != "zstd":
+        return False
+    if zstandard is None:
+        global _warned_missing_zstd
+        if not _warned_missing_zstd:
+            print("STORAGE_COMPRESSION=zstd but zstandard is not installed; writing plain JSON")
+            _warned_missing_zstd = True
+        return False
+    return True
+
+
+def encode_file_bytes(obj: Any, compress: Optional[bool] = None) -> bytes:
+    """
+    Encode an object the way it is written to a storage file.
+    
+    Args:
+        obj: JSON-compatible object
+        compress: Force compression on or off (defaults to STORAGE_COMPRESSION)
+    
+    Returns:
+        File contents
+    """
+    data = dumps(obj)
+    if compress is None:
+        compress = compression_enabled()
+    if compress:
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return data
+
+
+def decode_file_bytes(data: bytes) -> Any:
+    """
+    Decode storage file contents, decompressing zstd data if needed.
+    
+    Args:
+        data: Raw file contents
+    
+    Returns:
+        Decoded object
+    """
+    if data.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("File is zstd-compressed but zstandard is not installed")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return loads(data)
+
+
+def read_json_file(path: Union[str, Path]) -> Any:
+    """Read a storage file written by write_json_file (or any plain JSON file)."""
+    return decode_file_bytes(Path(path).read_bytes())
+
+
+def write_json_file(path: Union[str, Path], obj: Any, compress: Optional[bool] = None):
+    """
+    Write an object to a storage file as compact (optionally compressed) JSON.
+    
+    Args:
+        path: Destination file
+        obj: JSON-compatible object
+        compress: Force compression on or off (defaults to STORAGE_COMPRESSION)
+    """
+    Path(path).write_bytes(encode_file_bytes(obj, compress))
+
+
+class CompactJSONResponse(JSONResponse):
+    """JSON response rendered through the compact serializer."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(obj: Any, **kwargs) -> CompactJSONResponse:
+    """
+    Build a pre-serialized JSON response, skipping FastAPI's response_model
+    validation and jsonable_encoder pass.
+    
+    Args:
+        obj: JSON-compatible object (use model_dump() for pydantic models)
+        **kwargs: Extra Response arguments (status_code, headers, ...)
+    
+    Returns:
+        CompactJSONResponse
+    """
+    return CompactJSONResponse(content=obj, **kwargs)
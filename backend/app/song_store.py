@@ -0,0 +1,211 @@
+"""
+Shared Song Store
+
+One canonical copy of every song used by custom lists, keyed by
+``{provider}_{id}`` (the same key the metadata library uses).
+
+List files hold ordered references into the store plus the fields a list
+sets differently (e.g. its own difficulty):
+    
+    {"ref": "deezer_3135556", "difficulty": "hard"}
+
+so a song is stored and parsed once however many lists contain it, and
+lists that do not override anything share the same CustomSong object.
+Songs without an ID, and list files written before the store existed,
+keep full song entries; both forms load.
+
+The store is an append-only log (``songs.ndjson``, one song per line).
+A song is only ever added, never changed, so other workers catch up by
+reading the lines appended since they last looked.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.custom_lists_models import CustomSong
+from app.file_storage import file_lock
+from app.serialization import dumps, loads
+
+
+class MissingSongError(LookupError):
+    """Raised when a list references a song the store does not have."""
+
+
+def song_key(provider: Optional[str], song_id: Optional[str]) -> Optional[str]:
+    """
+    Store key of a song.
+    
+    Args:
+        provider: Music provider
+        song_id: Provider song ID
+    
+    Returns:
+        "{provider}_{id}", or None for songs without an ID
+    """
+    if not song_id:
+        return None
+    return f"{provider or 'custom'}_{song_id}"
+
+
+class SongStore:
+    """Append-only store of canonical songs shared by all lists."""
+    
+    def __init__(self, data_dir: str = "data"):
+        """
+        Initialize the song store.
+        
+        Args:
+            data_dir: Directory holding songs.ndjson
+        """
+        self.path = Path(data_dir) / "songs.ndjson"
+        self._lock_path = Path(data_dir) / ".locks" / "songs.lock"
+        self._lock = threading.Lock()
+        self._songs: Dict[str, CustomSong] = {}
+        self._offset = 0
+    
+    def __len__(self) -> int:
+        return len(self._songs)
+    
+    def _refresh(self):
+        """Load songs appended since the last read (lock held)."""
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return
+        if size <= self._offset:
+            return
+        
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                # A line still being written by another worker
+                if not line.endswith(b"\n"):
+                    break
+                self._offset += len(line)
+                try:
+                    song = CustomSong.model_validate(loads(line))
+                except Exception as e:
+                    print(f"Skipping unreadable song store entry: {e}")
+                    continue
+                self._songs.setdefault(song_key(song.provider, song.id), song)
+    
+    def get(self, key: str) -> Optional[CustomSong]:
+        """
+        Canonical song for a key.
+        
+        Args:
+            key: Store key ("{provider}_{id}")
+        
+        Returns:
+            The shared CustomSong (never mutate it), or None if unknown
+        """
+        song = self._songs.get(key)
+        if song is None:
+            with self._lock:
+                self._refresh()
+                song = self._songs.get(key)
+        return song
+    
+    def add_songs(self, songs: Iterable[CustomSong]):
+        """
+        Add songs the store does not have yet, in one append.
+        
+        Songs already stored keep their canonical values; lists record
+        their differences as overrides.
+        
+        Args:
+            songs: Songs to make available as references
+        """
+        with self._lock, file_lock(self._lock_path):
+            self._refresh()
+            new = {}
+            for song in songs:
+                key = song_key(song.provider, song.id)
+                if key and key not in self._songs and key not in new:
+                    new[key] = song
+            if not new:
+                return
+            
+            data = b"".join(dumps(song.model_dump()) + b"\n" for song in new.values())
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'ab') as f:
+                # Anything past the offset is a line torn by a worker that
+                # died mid-append; end it so it is skipped, not glued to ours
+                size = f.seek(0, os.SEEK_END)
+                if size > self._offset:
+                    data = b"\n" + data
+                f.write(data)
+                f.flush()
+            self._offset = size + len(data)
+            self._songs.update(new)
+    
+    def to_entries(self, songs: List[CustomSong]) -> List[Dict[str, Any]]:
+        """
+        List file entries for songs: references plus overrides.
+        
+        Args:
+            songs: A list's songs, in order
+        
+        Returns:
+            One entry per song ({"ref": key, ...overrides}, or the full
+            song if it has no ID)
+        """
+        self.add_songs(songs)
+        entries = []
+        for song in songs:
+            key = song_key(song.provider, song.id)
+            canonical = self.get(key) if key else None
+            if canonical is None:
+                entries.append(song.model_dump())
+                continue
+            entry = {"ref": key}
+            if song is not canonical:
+                stored = canonical.model_dump()
+                entry.update(
+                    (field, value) for field, value in song.model_dump().items()
+                    if value != stored[field]
+                )
+            entries.append(entry)
+        return entries
+    
+    def share(self, song: CustomSong) -> CustomSong:
+        """
+        The canonical object for a song equal to it, or the song itself.
+        
+        Args:
+            song: Parsed song
+        
+        Returns:
+            A CustomSong equal to song
+        """
+        key = song_key(song.provider, song.id)
+        canonical = self.get(key) if key else None
+        return canonical if canonical == song else song
+    
+    def from_entry(self, entry: Dict[str, Any]) -> CustomSong:
+        """
+        Song for a list file entry, sharing the canonical object if possible.
+        
+        Args:
+            entry: Reference with overrides, or a full song (older files)
+        
+        Returns:
+            The song
+        
+        Raises:
+            MissingSongError: If the reference is not in the store (e.g.
+                songs.ndjson was not restored with the lists). Failing the
+                load keeps the list from being saved without the song.
+        """
+        if "ref" not in entry:
+            return self.share(CustomSong.model_validate(entry))
+        
+        canonical = self.get(entry["ref"])
+        if canonical is None:
+            raise MissingSongError(f"Song store has no entry for {entry['ref']}")
+        overrides = {field: value for field, value in entry.items() if field != "ref"}
+        if not overrides:
+            return canonical
+        return canonical.model_copy(update=overrides)
@@ -0,0 +1,667 @@
+"""
+SQLite Metadata Library
+
+Optional backend for the metadata library (METADATA_LIBRARY_BACKEND=sqlite)
+with the same API as MetadataLibrary. Songs live in an indexed table in
+``metadata_library.db`` instead of one in-memory dict, so lookups, artist
+searches, statistics and imports are SQL queries and transactions, and
+several worker processes can share the database.
+
+Song, artist and album names are also indexed with FTS5 (when the SQLite
+build supports it) for autocomplete. The JSON file remains the export
+format; an existing ``metadata_library.json`` is imported on first start.
+"""
+
+import os
+import sqlite3
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.serialization import dumps, loads
+from app.library_indexes import SUGGESTION_FIELDS, artist_key
+from app.metadata_library import MetadataLibrary, build_song_entry
+from app.search_index import TrigramIndex
+from src.text_utils import normalize_text
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS songs (
+    key TEXT PRIMARY KEY,
+    id TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    name TEXT,
+    artist TEXT,
+    artist_key TEXT,
+    album TEXT,
+    name_norm TEXT,
+    artist_norm TEXT,
+    album_norm TEXT,
+    decade TEXT,
+    genre TEXT,
+    style TEXT,
+    mood TEXT,
+    difficulty TEXT,
+    added_date TEXT,
+    last_updated TEXT,
+    times_used INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_songs_artist_key ON songs(artist_key);
+CREATE INDEX IF NOT EXISTS idx_songs_decade ON songs(decade);
+CREATE INDEX IF NOT EXISTS idx_songs_genre ON songs(genre);
+CREATE INDEX IF NOT EXISTS idx_songs_style ON songs(style);
+CREATE INDEX IF NOT EXISTS idx_songs_mood ON songs(mood);
+CREATE INDEX IF NOT EXISTS idx_songs_last_updated ON songs(last_updated);
+CREATE INDEX IF NOT EXISTS idx_songs_times_used ON songs(times_used);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts USING fts5(
+    name_norm, artist_norm, album_norm,
+    content='songs', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS songs_fts_insert AFTER INSERT ON songs BEGIN
+    INSERT INTO songs_fts(rowid, name_norm, artist_norm, album_norm)
+    VALUES (new.rowid, new.name_norm, new.artist_norm, new.album_norm);
+END;
+CREATE TRIGGER IF NOT EXISTS songs_fts_delete AFTER DELETE ON songs BEGIN
+    INSERT INTO songs_fts(songs_fts, rowid, name_norm, artist_norm, album_norm)
+    VALUES ('delete', old.rowid, old.name_norm, old.artist_norm, old.album_norm);
+END;
+CREATE TRIGGER IF NOT EXISTS songs_fts_update AFTER UPDATE ON songs BEGIN
+    INSERT INTO songs_fts(songs_fts, rowid, name_norm, artist_norm, album_norm)
+    VALUES ('delete', old.rowid, old.name_norm, old.artist_norm, old.album_norm);
+    INSERT INTO songs_fts(rowid, name_norm, artist_norm, album_norm)
+    VALUES (new.rowid, new.name_norm, new.artist_norm, new.album_norm);
+END;
+"""
+
+SONG_COLUMNS = (
+    "key", "id", "provider", "name", "artist", "artist_key", "album",
+    "name_norm", "artist_norm", "album_norm", "decade", "genre", "style",
+    "mood", "difficulty", "added_date", "last_updated", "times_used", "data"
+)
+
+# Song and artist totals; artists are counted by artist_key (casefolded,
+# trimmed) without songs that have no artist, as the JSON backend does
+TOTALS_SQL = "SELECT COUNT(*), COUNT(DISTINCT NULLIF(artist_key, '')) FROM songs"
+
+# Insert, or replace only when the incoming entry is newer (import semantics)
+MERGE_SQL = (
+    f"INSERT INTO songs ({', '.join(SONG_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in SONG_COLUMNS)}) "
+    "ON CONFLICT(key) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in SONG_COLUMNS[1:])
+    + " WHERE excluded.last_updated > COALESCE(songs.last_updated, '')"
+)
+
+UPSERT_SQL = MERGE_SQL[:MERGE_SQL.index(" WHERE excluded")]
+
+# Rows fetched per query when streaming songs
+ITER_BATCH_SIZE = 500
+
+
+def song_row(key: str, song: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Column values for a song entry."""
+    metadata = song.get('metadata') or {}
+    return (
+        key,
+        str(song.get('id', '')),
+        song.get('provider', ''),
+        song.get('name'),
+        song.get('artist'),
+        artist_key(song.get('artist')),
+        song.get('album'),
+        normalize_text(song.get('name')),
+        normalize_text(song.get('artist')),
+        normalize_text(song.get('album')),
+        metadata.get('decade'),
+        metadata.get('genre'),
+        metadata.get('style'),
+        metadata.get('mood'),
+        metadata.get('difficulty'),
+        song.get('added_date'),
+        song.get('last_updated') or '',
+        song.get('times_used') or 0,
+        dumps(song).decode()
+    )
+
+
+def prefix_query(column: str, text: str) -> Optional[str]:
+    """FTS5 query matching a word sequence that starts with the given text."""
+    normalized = normalize_text(text)
+    if not normalized:
+        return None
+    # Normalized text only contains word characters and spaces, so it can
+    # be quoted as an FTS5 phrase as is
+    return f'{column} : "{normalized}" *'
+
+
+class SQLiteMetadataLibrary:
+    """
+    User's personal song metadata library stored in SQLite.
+    
+    Same public API as MetadataLibrary. One connection is shared by the
+    process and serialized with a lock; the database runs in WAL mode so
+    other workers can read while one writes.
+    """
+    
+    def __init__(self, data_dir: str = "data"):
+        """
+        Open (or create) the library database.
+        
+        Args:
+            data_dir: Directory to store library data
+        """
+        self.data_dir = data_dir
+        self.db_path = os.path.join(data_dir, "metadata_library.db")
+        os.makedirs(data_dir, exist_ok=True)
+        
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError:
+            print("SQLite FTS5 not available; autocomplete falls back to LIKE queries")
+            self._fts = False
+        
+        # Fuzzy search index, built on first use (see fuzzy_search)
+        self._search: Optional[TrigramIndex] = None
+        self._search_version: Optional[int] = None
+        self._statistics_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        
+        self._initialize()
+    
+    def _initialize(self):
+        """Import the JSON library on first start and record library metadata."""
+        if self._get_meta('created') is not None:
+            return
+        
+        json_path = os.path.join(self.data_dir, "metadata_library.json")
+        wal_path = os.path.join(self.data_dir, "metadata_library.wal")
+        if os.path.exists(json_path) or os.path.exists(wal_path):
+            legacy = MetadataLibrary(self.data_dir)
+            imported = self.merge_songs(legacy.iter_songs())
+            print(f"Imported {imported} songs from the JSON metadata library")
+        
+        with self._transaction():
+            now = datetime.now().isoformat()
+            self._set_meta('db_id', uuid.uuid4().hex[:8])
+            self._set_meta('created', now)
+            if self._get_meta('last_updated') is None:
+                self._set_meta('last_updated', now)
+    
+    # ------------------------------------------------------------------
+    # Connection helpers
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a write transaction while holding the connection lock."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+    
+    def _get_meta(self, key: str) -> Optional[str]:
+        rows = self._query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+    
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+    
+    def _bump_version(self) -> int:
+        """
+        Record a change inside a write transaction.
+        
+        Returns:
+            The version before this change
+        """
+        previous = int(self._get_meta('version') or 0)
+        self._set_meta('version', str(previous + 1))
+        self._set_meta('last_updated', datetime.now().isoformat())
+        return previous
+    
+    def _current_version(self) -> int:
+        return int(self._get_meta('version') or 0)
+    
+    def get_version(self) -> str:
+        """
+        Get a version token for the library contents.
+        
+        Returns:
+            Token that changes whenever any worker changes the library
+        """
+        rows = self._query("SELECT key, value FROM meta WHERE key IN ('db_id', 'version')")
+        meta = dict(rows)
+        return f"{meta.get('db_id')}.{meta.get('version')}"
+    
+    def checkpoint(self):
+        """Fold the SQLite write-ahead log into the database file."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    
+    def _make_song_key(self, song_id: str, provider: str) -> str:
+        """Create unique key for song."""
+        return f"{provider}_{song_id}"
+    
+    # ------------------------------------------------------------------
+    # Fuzzy search index maintenance
+    
+    def _index_changes(self, previous_version: int, removed: Iterable[Tuple[str, Dict[str, Any]]],
+                       added: Iterable[Tuple[str, Dict[str, Any]]]):
+        """
+        Apply this process's own change to the fuzzy index.
+        
+        If another worker changed the database since the index was last
+        brought up to date, the index is left stale and rebuilt on the
+        next search instead.
+        """
+        if self._search is None or self._search_version != previous_version:
+            return
+        for key, song in removed:
+            self._search.remove(song.get('name'), ("song", key))
+            self._search.remove(song.get('artist'), ("artist",))
+        for key, song in added:
+            self._search.add(song.get('name'), ("song", key))
+            self._search.add(song.get('artist'), ("artist",))
+        self._search_version = previous_version + 1
+    
+    # ------------------------------------------------------------------
+    # Songs
+    
+    def get_song_metadata(self, song_id: str, provider: str) -> Optional[Dict[str, Any]]:
+        """
+        Get metadata for a song if it exists in library.
+        
+        Args:
+            song_id: Song ID from provider
+            provider: Music provider (deezer, spotify, etc.)
+        
+        Returns:
+            Song metadata if found, None otherwise
+        """
+        rows = self._query(
+            "SELECT data FROM songs WHERE key = ?",
+            (self._make_song_key(song_id, provider),)
+        )
+        return loads(rows[0][0]) if rows else None
+    
+    def save_song_metadata(
+        self,
+        song_id: str,
+        provider: str,
+        name: str,
+        artist: str,
+        album: Optional[str],
+        release_date: Optional[str],
+        metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Save song metadata to library.
+        
+        Args:
+            song_id: Song ID from provider
+            provider: Music provider
+            name: Song name
+            artist: Artist name
+            album: Album name
+            release_date: Release date
+            metadata: User-provided metadata (genre, mood, style, etc.)
+        
+        Returns:
+            Saved song entry
+        """
+        key = self._make_song_key(song_id, provider)
+        
+        with self._transaction() as conn:
+            row = conn.execute("SELECT data FROM songs WHERE key = ?", (key,)).fetchone()
+            existing = loads(row[0]) if row else None
+            song_entry = build_song_entry(
+                song_id, provider, name, artist, album, release_date, metadata, existing
+            )
+            conn.execute(UPSERT_SQL, song_row(key, song_entry))
+            previous = self._bump_version()
+            self._index_changes(previous, [(key, existing)] if existing else [], [(key, song_entry)])
+        
+        return song_entry
+    
+    def delete_song(self, song_id: str, provider: str) -> bool:
+        """
+        Remove a song from the library.
+        
+        Args:
+            song_id: Song ID from provider
+            provider: Music provider
+        
+        Returns:
+            True if the song was removed, False if it was not in the library
+        """
+        key = self._make_song_key(song_id, provider)
+        
+        with self._transaction() as conn:
+            row = conn.execute("SELECT data FROM songs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM songs WHERE key = ?", (key,))
+            previous = self._bump_version()
+            self._index_changes(previous, [(key, loads(row[0]))], [])
+        
+        return True
+    
+    def search_by_artist(self, artist_name: str) -> List[Dict[str, Any]]:
+        """
+        Find all songs by an artist in the library (indexed lookup).
+        
+        Args:
+            artist_name: Artist name to search for (case-insensitive)
+        
+        Returns:
+            List of songs by this artist
+        """
+        rows = self._query(
+            "SELECT data FROM songs WHERE artist_key = ? ORDER BY rowid",
+            (artist_key(artist_name),)
+        )
+        return [loads(data) for (data,) in rows]
+    
+    def get_artist_suggestions(self, artist_name: str) -> Dict[str, Any]:
+        """
+        Get metadata suggestions based on user's history with this artist.
+        
+        Args:
+            artist_name: Artist name
+        
+        Returns:
+            Suggested metadata based on most common values
+        """
+        songs = self.search_by_artist(artist_name)
+        if not songs:
+            return {
+                'found': False,
+                'count': 0
+            }
+        
+        counters = {field: Counter() for field in SUGGESTION_FIELDS}
+        for song in songs:
+            metadata = song.get('metadata') or {}
+            for field in SUGGESTION_FIELDS:
+                if metadata.get(field):
+                    counters[field][metadata[field]] += 1
+        
+        return {
+            'found': True,
+            'count': len(songs),
+            'songs': songs,
+            'suggestions': {
+                field: counters[field].most_common(1)[0][0] if counters[field] else None
+                for field in SUGGESTION_FIELDS
+            },
+            'genre_distribution': dict(counters['genre']),
+            'style_distribution': dict(counters['style']),
+            'mood_distribution': dict(counters['mood'])
+        }
+    
+    def autocomplete(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        Suggest artists and song titles starting with the typed text.
+        
+        Uses the FTS5 index over normalized names (prefix of any word),
+        ranked by times_used.
+        
+        Args:
+            query: Text typed so far
+            limit: Maximum suggestions of each kind
+        
+        Returns:
+            Matching artists and songs, most used first
+        """
+        result = {'query': query, 'artists': [], 'songs': []}
+        normalized = normalize_text(query)
+        if not normalized:
+            return result
+        
+        if self._fts:
+            song_filter = "rowid IN (SELECT rowid FROM songs_fts WHERE songs_fts MATCH ?)"
+            song_params = (prefix_query("name_norm", normalized),)
+            artist_params = (prefix_query("artist_norm", normalized),)
+        else:
+            song_filter = "(name_norm LIKE ? OR name_norm LIKE ?)"
+            song_params = (f"{normalized}%", f"% {normalized}%")
+            artist_params = song_params
+        artist_filter = song_filter.replace("name_norm", "artist_norm")
+        
+        song_rows = self._query(
+            f"SELECT id, provider, name, artist, times_used FROM songs WHERE {song_filter} "
+            "ORDER BY times_used DESC, name_norm LIMIT ?",
+            song_params + (limit,)
+        )
+        artist_rows = self._query(
+            f"SELECT MIN(artist), COUNT(*), SUM(times_used) FROM songs WHERE {artist_filter} "
+            "GROUP BY artist_norm ORDER BY SUM(times_used) DESC, artist_norm LIMIT ?",
+            artist_params + (limit,)
+        )
+        
+        result['songs'] = [
+            {'id': id, 'provider': provider, 'name': name, 'artist': artist, 'times_used': used}
+            for id, provider, name, artist, used in song_rows
+        ]
+        result['artists'] = [
+            {'artist': artist, 'song_count': count, 'times_used': used}
+            for artist, count, used in artist_rows
+        ]
+        return result
+    
+    def fuzzy_search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Find songs and artists whose names approximately match the query.
+        
+        Uses the same trigram index as the JSON backend, built from the
+        name columns only and rebuilt when another worker changed the
+        database.
+        
+        Args:
+            query: Name to look for
+            limit: Maximum number of results
+        
+        Returns:
+            Matches ordered by edit distance
+        """
+        with self._lock:
+            version = self._current_version()
+            if self._search is None or self._search_version != version:
+                self._search = TrigramIndex()
+                for key, name, artist in self._conn.execute("SELECT key, name, artist FROM songs"):
+                    self._search.add(name, ("song", key))
+                    self._search.add(artist, ("artist",))
+                self._search_version = version
+            matches = self._search.search(query, limit)
+        
+        results = []
+        for match in matches:
+            for ref, count in match.refs.items():
+                result = {
+                    "source": "library",
+                    "value": match.text,
+                    "distance": match.distance,
+                    "similarity": match.similarity
+                }
+                if ref[0] == "artist":
+                    result.update({"field": "artist", "song_count": count})
+                else:
+                    rows = self._query(
+                        "SELECT id, provider, artist FROM songs WHERE key = ?", (ref[1],)
+                    )
+                    if not rows:
+                        continue
+                    result.update({
+                        "field": "name",
+                        "id": rows[0][0],
+                        "provider": rows[0][1],
+                        "artist": rows[0][2]
+                    })
+                results.append(result)
+                if len(results) >= limit:
+                    return results
+        return results
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get comprehensive library statistics (aggregate queries, cached per version).
+        
+        Returns:
+            Dictionary with library statistics
+        """
+        version = self._current_version()
+        if self._statistics_cache and self._statistics_cache[0] == version:
+            return self._statistics_cache[1]
+        
+        with self._lock:
+            total_songs, total_artists = self._conn.execute(TOTALS_SQL).fetchone()
+            
+            if not total_songs:
+                stats = {
+                    'total_songs': 0,
+                    'total_artists': 0,
+                    'genres': {},
+                    'styles': {},
+                    'moods': {},
+                    'decades': {},
+                    'top_artists': []
+                }
+            else:
+                distributions = {}
+                for column in ('genre', 'style', 'mood', 'decade'):
+                    distributions[column] = self._conn.execute(
+                        f"SELECT {column}, COUNT(*) AS n FROM songs "
+                        f"WHERE {column} IS NOT NULL AND {column} != '' "
+                        f"GROUP BY {column} ORDER BY n DESC"
+                    ).fetchall()
+                top_artists = self._conn.execute(
+                    "SELECT artist, COUNT(*) AS n FROM songs GROUP BY artist ORDER BY n DESC LIMIT 10"
+                ).fetchall()
+                
+                stats = {
+                    'total_songs': total_songs,
+                    'total_artists': total_artists,
+                    'genres': dict(distributions['genre']),
+                    'styles': dict(distributions['style']),
+                    'moods': dict(distributions['mood']),
+                    'decades': dict(distributions['decade']),
+                    'top_artists': [
+                        {'artist': artist, 'count': count} for artist, count in top_artists
+                    ],
+                    'most_common_genre': tuple(distributions['genre'][0]) if distributions['genre'] else None,
+                    'most_common_decade': tuple(distributions['decade'][0]) if distributions['decade'] else None,
+                    'last_updated': self._get_meta('last_updated')
+                }
+        
+        self._statistics_cache = (version, stats)
+        return stats
+    
+    def get_all_songs(self) -> List[Dict[str, Any]]:
+        """Get all songs in the library."""
+        return [loads(data) for (data,) in self._query("SELECT data FROM songs ORDER BY rowid")]
+    
+    def iter_songs(self, since: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over library songs in key order, one small query at a time.
+        
+        Args:
+            since: Only songs whose last_updated is at or after this ISO timestamp
+        
+        Yields:
+            (key, song) pairs
+        """
+        last_key = ""
+        while True:
+            rows = self._query(
+                "SELECT key, data FROM songs WHERE key > ? AND last_updated >= ? "
+                "ORDER BY key LIMIT ?",
+                (last_key, since or "", ITER_BATCH_SIZE)
+            )
+            for key, data in rows:
+                yield key, loads(data)
+            if len(rows) < ITER_BATCH_SIZE:
+                return
+            last_key = rows[-1][0]
+    
+    def export_library(self) -> Dict[str, Any]:
+        """Export entire library (builds the full JSON structure in memory)."""
+        return {**self.get_export_header(), "songs": dict(self.iter_songs())}
+    
+    def get_export_header(self) -> Dict[str, Any]:
+        """Top-level export members other than songs (version, created, statistics)."""
+        with self._lock:
+            total_songs, total_artists = self._conn.execute(TOTALS_SQL).fetchone()
+        return {
+            "version": "1.0",
+            "created": self._get_meta('created'),
+            "statistics": {
+                "total_songs": total_songs,
+                "total_artists": total_artists,
+                "last_updated": self._get_meta('last_updated')
+            }
+        }
+    
+    def merge_songs(
+        self,
+        songs: Iterable[Tuple[str, Dict[str, Any]]],
+        allow_checkpoint: bool = True
+    ) -> int:
+        """
+        Merge songs into the library in a single transaction.
+        
+        A song is taken when it is not in the library yet or when its
+        last_updated is newer than the stored entry.
+        
+        Args:
+            songs: (key, song) pairs
+            allow_checkpoint: Accepted for API compatibility (SQLite
+                checkpoints its own log)
+        
+        Returns:
+            Number of songs added or replaced
+        """
+        with self._transaction() as conn:
+            cursor = conn.executemany(MERGE_SQL, (song_row(key, song) for key, song in songs))
+            merged = max(cursor.rowcount, 0)
+            if merged:
+                self._bump_version()
+        return merged
+    
+    def import_library(self, data: Dict[str, Any]) -> int:
+        """
+        Import library data (merge with existing).
+        
+        Args:
+            data: Library data to import
+        
+        Returns:
+            Number of songs imported
+        """
+        return self.merge_songs(data.get('songs', {}).items())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+
+Measures how long a fresh interpreter takes to import app.main (what every
+uvicorn worker pays on startup), which heavy optional modules that pulls
+in, and whether importing touches the data directory. Each run uses a new
+process in an empty working directory, so nothing is cached in memory and
+no library or list files are found.
+
+Usage:
+    cd backend
+    python benchmarks/import_benchmark.py
+    python benchmarks/import_benchmark.py --repeat 10 --top 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Same import path as run.py: the app package and the repository's src package
+python_path = os.pathsep.join([backend_dir, os.path.dirname(backend_dir)])
+
+# Modules that should only be loaded once a request needs them
+LAZY_MODULES = ["spotipy", "requests", "src.spotify_client", "src.deezer_client", "app.sqlite_library"]
+
+PROBE = f"""
+import json, os, sys, time
+start = time.perf_counter()
+import {{module}}
+elapsed = time.perf_counter() - start
+print(json.dumps({{{{
+    "ms": elapsed * 1000,
+    "modules": len(sys.modules),
+    "loaded": [name for name in {LAZY_MODULES!r} if name in sys.modules],
+    "files": sorted(os.listdir(".")),
+}}}}))
+"""
+
+
+def run_probe(module: str, cwd: str) -> dict:
+    """Import the module in a new interpreter and return its measurements."""
+    env = dict(os.environ, PYTHONPATH=python_path, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(module: str, cwd: str, top: int):
+    """Top-level imports of the module with the largest cumulative time (-X importtime)."""
+    env = dict(os.environ, PYTHONPATH=python_path)
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    ).stderr
+    
+    # Children are listed before their parent, indented two spaces per level
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            timings.append((int(cumulative) / 1000, name.strip()))
+        elif depth == 0:
+            if name.strip() == module:
+                return sorted(timings, reverse=True)[:top]
+            timings = []
+    return []
+
+
+def run(module: str, repeat: int, top: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [run_probe(module, tmp) for _ in range(repeat)]
+        times = [result["ms"] for result in results]
+        last = results[-1]
+        
+        print(f"Importing {module} ({repeat} fresh interpreters)\n")
+        print(f"  best      {min(times):8.1f} ms")
+        print(f"  median    {statistics.median(times):8.1f} ms")
+        print(f"  modules   {last['modules']:8d}")
+        print(f"  loaded    {', '.join(last['loaded']) or '(none of ' + ', '.join(LAZY_MODULES) + ')'}")
+        print(f"  files     {', '.join(last['files']) or '(working directory untouched)'}")
+        
+        if top:
+            print(f"\nSlowest direct imports:")
+            for ms, name in slowest_imports(module, tmp, top):
+                print(f"  {ms:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    run(args.module, args.repeat, args.top)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Storage Serialization Benchmark
+
+Compares load time, save time and file size of a custom song list stored
+as the original pretty-printed JSON with every song inline (json + .dict()),
+and as the shipped format: song references into the shared SongStore,
+written as compact JSON through app.serialization, with and without zstd
+compression. The time to load the song store itself (once per worker) is
+reported separately.
+
+Usage:
+    cd backend
+    python benchmarks/storage_benchmark.py
+    python benchmarks/storage_benchmark.py --sizes 1000 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend directory to Python path so we can import the app package
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from app.custom_lists_models import CustomSong, CustomSongList
+from app.song_store import SongStore, song_key
+from app import serialization
+
+GENRES = ["Rock", "Pop", "Hip Hop", "Jazz", "Electronic", "Soul"]
+DECADES = ["1970s", "1980s", "1990s", "2000s", "2010s"]
+
+
+def make_list(num_songs: int) -> CustomSongList:
+    """Build a list with realistic-looking song entries."""
+    songs = [
+        CustomSong(
+            id=str(3000000 + i),
+            name=f"Song Title Number {i}",
+            artist=f"Artist {i % 997}",
+            album=f"Album {i % 311}",
+            preview_url=f"https://cdns-preview.example.com/stream/{i:08d}.mp3",
+            decade=DECADES[i % len(DECADES)],
+            genre=GENRES[i % len(GENRES)],
+            style="Classic",
+            mood="Upbeat",
+            provider="deezer",
+        )
+        for i in range(num_songs)
+    ]
+    return CustomSongList(id="benchmark", name="Benchmark List", songs=songs)
+
+
+def legacy_save(path: Path, custom_list: CustomSongList):
+    """Original storage format: indented JSON via the pydantic round trip."""
+    path.write_text(json.dumps(custom_list.model_dump(), indent=2))
+
+
+def legacy_load(path: Path) -> CustomSongList:
+    return CustomSongList(**json.loads(path.read_text()))
+
+
+def compact_save(path: Path, custom_list: CustomSongList, store: SongStore, compress: bool):
+    """Shipped format: references into the song store (as CustomListManager._save_list)."""
+    data = custom_list.model_dump(exclude={"songs"})
+    data["songs"] = store.to_entries(custom_list.songs)
+    serialization.write_json_file(path, data, compress=compress)
+
+
+def compact_load(path: Path, store: SongStore) -> CustomSongList:
+    """Resolve references against a loaded store (as CustomListManager._load_list)."""
+    data = serialization.read_json_file(path)
+    custom_list = CustomSongList.model_validate({**data, "songs": []})
+    custom_list.songs = [store.from_entry(entry) for entry in data["songs"]]
+    return custom_list
+
+
+def store_load(store_dir: str, key: str) -> SongStore:
+    """Load a song store from disk, as a new worker does on first use."""
+    store = SongStore(store_dir)
+    store.get(key)
+    return store
+
+
+def best_of(func, repeat: int) -> float:
+    """Fastest wall time of several runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(sizes, repeat: int):
+    formats = [
+        ("legacy json", lambda p, l, s: legacy_save(p, l), lambda p, s: legacy_load(p)),
+        ("compact", lambda p, l, s: compact_save(p, l, s, False), compact_load),
+    ]
+    if serialization.zstandard is not None:
+        formats.append(("compact+zstd", lambda p, l, s: compact_save(p, l, s, True), compact_load))
+    else:
+        print("zstandard not installed; skipping compressed format")
+    
+    encoder = "orjson" if serialization.orjson is not None else "stdlib json"
+    print(f"Encoder: {encoder}\n")
+    print(f"{'songs':>8}  {'format':<14} {'save ms':>9} {'load ms':>9} {'size KB':>10}")
+    print("-" * 56)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            custom_list = make_list(size)
+            store_dir = os.path.join(tmp, str(size))
+            store = SongStore(store_dir)
+            # Songs enter the store once, when first added to any list
+            store.add_songs(custom_list.songs)
+            for name, save, load in formats:
+                path = Path(store_dir) / f"{name.replace('+', '-')}.json"
+                save_ms = best_of(lambda: save(path, custom_list, store), repeat)
+                load_ms = best_of(lambda: load(path, store), repeat)
+                size_kb = path.stat().st_size / 1024
+                print(f"{size:>8}  {name:<14} {save_ms:>9.1f} {load_ms:>9.1f} {size_kb:>10.1f}")
+            
+            key = song_key("deezer", custom_list.songs[0].id)
+            load_ms = best_of(lambda: store_load(store_dir, key), repeat)
+            size_kb = store.path.stat().st_size / 1024
+            print(f"{size:>8}  {'song store':<14} {'-':>9} {load_ms:>9.1f} {size_kb:>10.1f}")
+            print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -7,6 +7,15 @@ Usage:
     
 Or with uvicorn directly:
     uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
+
+Stored data (custom lists, the metadata library, leaderboards and play
+counts) is safe to share between processes, so production can run one
+worker per core:
+    uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers 4
+
+Game sessions, rooms and their event streams stay in the worker that
+created them, so several workers need a proxy with sticky sessions in
+front (e.g. nginx ip_hash).
 """
 
 import sys
@@ -2,11 +2,26 @@
 Music Guessing Game - Core Package
 
 This package contains the modular components of the music guessing game.
+Components are imported on first access, so using one module (e.g. the
+Deezer client) does not load the SDKs of the others.
 """
 
-from src.spotify_client import SpotifyClient
-from src.game_engine import GameEngine
-from src.audio_player import AudioPlayer
+import importlib
+
+_EXPORTS = {
+    'SpotifyClient': 'src.spotify_client',
+    'GameEngine': 'src.game_engine',
+    'AudioPlayer': 'src.audio_player',
+}
 
 __all__ = ['SpotifyClient', 'GameEngine', 'AudioPlayer']
 __version__ = '1.0.0'
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'src' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
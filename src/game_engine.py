@@ -7,6 +7,8 @@ Core game logic including round management, scoring, hints, and user interaction
 from typing import Dict, Any, List, Optional
 import random
 
+from src.guess_matcher import build_answer_key, match_guess
+
 
 class GameEngine:
     """
@@ -163,23 +165,19 @@ class GameEngine:
         """
         Check if a guess matches the correct title.
         
-        Uses case-insensitive substring matching for flexibility.
+        Ignores case, accents, punctuation, a leading "The", featured
+        artists and bracketed suffixes, and forgives small typos in longer
+        answers (see src.guess_matcher). Fragments such as "a" no longer
+        match.
         
         Args:
             guess (str): User's guess
             correct_title (str): Actual song title
             
         Returns:
-            bool: True if guess is correct or partially matches
+            bool: True if guess is correct
         """
-        if not guess:
-            return False
-        
-        guess_lower = guess.lower().strip()
-        title_lower = correct_title.lower().strip()
-        
-        # Exact match or substring match
-        return guess_lower == title_lower or guess_lower in title_lower
+        return match_guess(guess, build_answer_key(correct_title))
     
     def _display_hints(self, song: Dict[str, Any], show_artist: bool = False):
         """
@@ -0,0 +1,265 @@
+"""
+Guess Matching Module
+
+Decides whether a typed guess names the right artist or title while
+forgiving case, accents, punctuation, "The", featured artists, "&" vs
+"and" and, depending on the game's leniency, small typos and phonetic
+spellings ("Nervana", "Fil Colins"). Names too short for a reliable
+phonetic key (Queen, ABBA) only get the typo allowance; sound-alike
+spellings of those ("Quin") can be added as artist aliases.
+
+The answer side is normalized once into an AnswerKey (when a game is
+created), so checking a guess only normalizes the guess and compares it
+to a few precomputed strings. match_guesses checks a whole room's guesses
+for the same round at once.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.text_utils import (
+    bitparallel_distances, bounded_levenshtein, normalize_text, phonetic_key
+)
+
+# Guesses shorter than this (letters and digits, spaces ignored) must match
+# exactly, so "a" or "qu" cannot fuzzily match anything
+MIN_FUZZY_LENGTH = 4
+
+# Typos tolerated by answer length: (minimum length, edits)
+FUZZY_EDITS = ((15, 3), (9, 2), (MIN_FUZZY_LENGTH, 1))
+
+# Shorter phonetic keys match too many ordinary words to be used: "Queen"
+# ("kan") would accept "Kane" and "Coin" as well as "Quin", "Muse" ("mas")
+# "Miss"
+MIN_PHONETIC_LENGTH = 4
+
+# How forgiving guess checking is, per game:
+#   strict - normalized forms only (case, accents, punctuation, "The"...)
+#   normal - also small typos, in proportion to the answer length
+#   easy   - also guesses that sound like the answer
+LENIENCY_LEVELS = ("strict", "normal", "easy")
+DEFAULT_LENIENCY = "normal"
+
+_FEATURING = {"feat", "ft", "featuring"}
+_AND = {"and", "n"}
+_AMPERSAND = re.compile(r"\s*[&+]\s*")
+# "(Remastered 2011)", "[Live]", " - Radio Edit"
+_SUFFIXES = re.compile(r"\s*[\(\[].*?[\)\]]|\s+-\s+.*$")
+
+
+def answer_tokens(text: Optional[str]) -> Tuple[str, ...]:
+    """
+    Split text into the words that are compared.
+    
+    Args:
+        text (Optional[str]): Artist name, title or guess
+    
+    Returns:
+        Tuple[str, ...]: Normalized words, with "&"/"n" spelled "and", a
+            leading "the" dropped and anything from "feat." on removed
+    """
+    words = normalize_text(_AMPERSAND.sub(" and ", text or "")).split()
+    for i, word in enumerate(words):
+        if i and word in _FEATURING:
+            words = words[:i]
+            break
+    if len(words) > 1 and words[0] == "the":
+        words = words[1:]
+    return tuple("and" if word in _AND else word for word in words)
+
+
+def normalize_answer(text: Optional[str]) -> str:
+    """
+    Reduce an answer or guess to the string that is compared.
+    
+    Words are joined without spaces, so "Jay Z", "JAY-Z" and "jayz" agree.
+    
+    Args:
+        text (Optional[str]): Text to normalize
+    
+    Returns:
+        str: Compact normalized form (e.g. "Guns N' Roses" -> "gunsandroses")
+    """
+    return "".join(answer_tokens(text))
+
+
+def allowed_edits(length: int) -> int:
+    """
+    Typos tolerated for an answer of this normalized length.
+    
+    Args:
+        length (int): Length of the normalized answer
+    
+    Returns:
+        int: Maximum edit distance accepted (0 for short answers)
+    """
+    for min_length, edits in FUZZY_EDITS:
+        if length >= min_length:
+            return edits
+    return 0
+
+
+class AnswerKey(NamedTuple):
+    """
+    Precomputed accepted forms of one answer.
+    
+    exact holds every accepted normalized form, for an O(1) lookup. forms
+    lists those that also tolerate typos, with the number of edits each
+    allows: the answer and its alternatives, each also without a bracketed
+    or " - " suffix and without "and". phonetic holds the phonetic keys of
+    the forms (only built for easy games).
+    """
+    answer: str
+    exact: FrozenSet[str]
+    forms: Tuple[Tuple[str, int], ...]
+    phonetic: FrozenSet[str] = frozenset()
+
+
+def answer_variants(text: str) -> Tuple[str, ...]:
+    """
+    Normalized forms under which an answer is accepted.
+    
+    Args:
+        text (str): Artist name, title or alias
+    
+    Returns:
+        Tuple[str, ...]: Distinct non-empty forms, the full answer first
+    """
+    variants = []
+    for version in (text, _SUFFIXES.sub("", text)):
+        tokens = answer_tokens(version)
+        variants.append("".join(tokens))
+        if "and" in tokens[1:-1]:
+            variants.append("".join(token for token in tokens if token != "and"))
+    return tuple(dict.fromkeys(form for form in variants if form))
+
+
+def build_answer_key(
+    answer: str,
+    alternatives: Iterable[str] = (),
+    phonetic: bool = False
+) -> AnswerKey:
+    """
+    Normalize an answer once so guesses can be checked cheaply.
+    
+    Args:
+        answer (str): Correct artist name or song title
+        alternatives (Iterable[str]): Other accepted answers, e.g. the
+            other credited artists and their aliases
+        phonetic (bool): Also precompute phonetic keys (for easy games)
+    
+    Returns:
+        AnswerKey: Accepted forms of the answer
+    """
+    forms = {}
+    sounds = set()
+    for text in (answer, *alternatives):
+        text = text or ""
+        for form in answer_variants(text):
+            forms.setdefault(form, allowed_edits(len(form)))
+        if phonetic:
+            for version in (text, _SUFFIXES.sub("", text)):
+                sounds.add(phonetic_key(" ".join(answer_tokens(version))))
+    return AnswerKey(
+        answer,
+        frozenset(forms),
+        tuple((form, edits) for form, edits in forms.items() if edits),
+        frozenset(sound for sound in sounds if len(sound) >= MIN_PHONETIC_LENGTH)
+    )
+
+
+def match_guess(
+    guess: Optional[str],
+    key: AnswerKey,
+    leniency: str = DEFAULT_LENIENCY
+) -> bool:
+    """
+    Check a guess against a precomputed answer key.
+    
+    Args:
+        guess (Optional[str]): Text typed by the player
+        key (AnswerKey): Key built by build_answer_key
+        leniency (str): One of LENIENCY_LEVELS
+    
+    Returns:
+        bool: True if the guess equals one of the accepted forms or, when
+            the leniency allows and the guess is long enough to be fuzzy,
+            is within a form's typo allowance or sounds like the answer
+    """
+    tokens = answer_tokens(guess)
+    normalized = "".join(tokens)
+    if not normalized:
+        return False
+    if normalized in key.exact:
+        return True
+    
+    if leniency == "strict" or len(normalized) < MIN_FUZZY_LENGTH:
+        return False
+    for form, edits in key.forms:
+        if bounded_levenshtein(normalized, form, edits) is not None:
+            return True
+    
+    return (
+        leniency == "easy"
+        and bool(key.phonetic)
+        and phonetic_key(" ".join(tokens)) in key.phonetic
+    )
+
+
+def match_guesses(
+    guesses: Iterable[Optional[str]],
+    key: AnswerKey,
+    leniency: str = DEFAULT_LENIENCY
+) -> List[bool]:
+    """
+    Check many players' guesses against the same answer key.
+    
+    Gives the same results as calling match_guess on each guess, but
+    identical guesses are checked once, exact matches are settled by set
+    lookups, and the rest are scored against each accepted form in one
+    bit-parallel edit distance pass.
+    
+    Args:
+        guesses (Iterable[Optional[str]]): Texts typed by the players
+        key (AnswerKey): Key built by build_answer_key
+        leniency (str): One of LENIENCY_LEVELS
+    
+    Returns:
+        List[bool]: Whether each guess is correct, in order
+    """
+    tokens_by_guess = [answer_tokens(guess) for guess in guesses]
+    results: Dict[str, bool] = {}
+    pending: Dict[str, Tuple[str, ...]] = {}
+    for tokens in tokens_by_guess:
+        normalized = "".join(tokens)
+        if normalized in results or normalized in pending:
+            continue
+        if normalized in key.exact:
+            results[normalized] = True
+        elif (
+            not normalized
+            or leniency == "strict"
+            or len(normalized) < MIN_FUZZY_LENGTH
+        ):
+            results[normalized] = False
+        else:
+            pending[normalized] = tokens
+    
+    for form, edits in key.forms:
+        if not pending:
+            break
+        candidates = [
+            guess for guess in pending if abs(len(guess) - len(form)) <= edits
+        ]
+        for guess, distance in zip(candidates, bitparallel_distances(form, candidates)):
+            if distance <= edits:
+                results[guess] = True
+                del pending[guess]
+    
+    for normalized, tokens in pending.items():
+        results[normalized] = (
+            leniency == "easy"
+            and bool(key.phonetic)
+            and phonetic_key(" ".join(tokens)) in key.phonetic
+        )
+    return [results["".join(tokens)] for tokens in tokens_by_guess]
@@ -0,0 +1,225 @@
+"""
+Text Normalization Module
+
+Shared folding of song titles and artist names so that searching and
+guess matching treat "Beyoncé", "BEYONCE" and "beyonce" alike.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+# Apostrophes are dropped ("Guns N' Roses" -> "guns n roses"), any other
+# punctuation becomes a word break ("AC/DC" -> "ac dc")
+_APOSTROPHES = re.compile(r"['’‘`]")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def fold_text(text: Optional[str]) -> str:
+    """
+    Casefold text and strip accents.
+    
+    Args:
+        text (Optional[str]): Text to fold (None is treated as empty)
+    
+    Returns:
+        str: Folded text, punctuation and spacing unchanged
+    """
+    if not text:
+        return ""
+    if text.isascii():
+        return text.casefold()
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return stripped.casefold()
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Fold text and reduce it to lowercase words separated by single spaces.
+    
+    Args:
+        text (Optional[str]): Text to normalize
+    
+    Returns:
+        str: Normalized text (e.g. "Don't Stop Me Now!" -> "dont stop me now")
+    """
+    folded = _APOSTROPHES.sub("", fold_text(text))
+    return _NON_WORD.sub(" ", folded).strip()
+
+
+def word_suffixes(text: Optional[str], max_words: int = 6) -> List[str]:
+    """
+    Normalized text starting at each of its first words.
+    
+    Used to index names so a prefix of any word matches, e.g.
+    "The Beatles" -> ["the beatles", "beatles"].
+    
+    Args:
+        text (Optional[str]): Text to split
+        max_words (int): Maximum number of suffixes to return
+    
+    Returns:
+        List[str]: Distinct suffixes, longest first
+    """
+    words = normalize_text(text).split(" ")
+    if words == [""]:
+        return []
+    suffixes = []
+    for i in range(min(len(words), max_words)):
+        suffix = " ".join(words[i:])
+        if suffix not in suffixes:
+            suffixes.append(suffix)
+    return suffixes
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Edit distance between two strings, giving up once it exceeds a bound.
+    
+    Only a diagonal band of width 2 * max_distance + 1 is computed and the
+    loop exits as soon as every cell in a row is over the bound, so the
+    cost is O(len * max_distance) rather than O(len(a) * len(b)).
+    
+    Args:
+        a (str): First string
+        b (str): Second string
+        max_distance (int): Largest distance of interest
+    
+    Returns:
+        Optional[int]: The distance, or None if it is greater than max_distance
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+    
+    too_far = max_distance + 1
+    previous = [j if j <= max_distance else too_far for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        lo = max(1, i - max_distance)
+        hi = min(len(b), i + max_distance)
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= max_distance else too_far
+        row_min = current[0]
+        char = a[i - 1]
+        for j in range(lo, hi + 1):
+            cost = previous[j - 1] + (char != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost if cost < too_far else too_far
+            if current[j] < row_min:
+                row_min = current[j]
+        if row_min > max_distance:
+            return None
+        previous = current
+    
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else None
+
+
+def bitparallel_distances(pattern: str, texts: Iterable[str]) -> List[int]:
+    """
+    Edit distance from one pattern to many texts.
+    
+    Uses Myers' bit-vector algorithm: the pattern's character masks are
+    built once, and each text is then scored with a handful of integer
+    operations per character, whatever the pattern length.
+    
+    Args:
+        pattern (str): String compared against every text
+        texts (Iterable[str]): Strings to score
+    
+    Returns:
+        List[int]: Levenshtein distance of each text, in order
+    """
+    length = len(pattern)
+    if not length:
+        return [len(text) for text in texts]
+    
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    
+    distances = []
+    for text in texts:
+        plus, minus, distance = full, 0, length
+        for char in text:
+            eq = masks.get(char, 0)
+            xv = eq | minus
+            xh = (((eq & plus) + plus) ^ plus) | eq
+            hp = minus | ~(xh | plus)
+            hm = plus & xh
+            if hp & last:
+                distance += 1
+            elif hm & last:
+                distance -= 1
+            hp = ((hp << 1) | 1) & full
+            hm = (hm << 1) & full
+            plus = hm | ~(xv | hp) & full
+            minus = hp & xv
+        distances.append(distance)
+    return distances
+
+
+# Phonetic encoding: (pattern, replacement) applied in order to each word.
+# A simplified Metaphone: similar-sounding spellings of names
+# ("Nervana"/"Nirvana", "Fil Colins"/"Phil Collins") get the same key.
+# Keys of short names ("Quin"/"Queen") also collide with ordinary words,
+# so guess matching ignores them (see guess_matcher.MIN_PHONETIC_LENGTH).
+_PHONETIC_RULES = [
+    (re.compile(r"^(?:kn|gn|pn|wr|ps)"), lambda m: m.group(0)[1]),
+    (re.compile(r"^x"), lambda m: "s"),
+    (re.compile(r"^wh"), lambda m: "w"),
+    (re.compile(r"mb$"), lambda m: "m"),
+    (re.compile(r"sch"), lambda m: "sk"),
+    (re.compile(r"tch|ch|sh|si(?=o)|ti(?=[ao])"), lambda m: "X"),
+    (re.compile(r"ph"), lambda m: "f"),
+    (re.compile(r"th"), lambda m: "0"),
+    (re.compile(r"dg(?=[eiy])"), lambda m: "j"),
+    (re.compile(r"gh(?![aeiou])"), lambda m: ""),
+    (re.compile(r"c(?=[eiy])"), lambda m: "s"),
+    (re.compile(r"g(?=[eiy])"), lambda m: "j"),
+    (re.compile(r"ck|c|q"), lambda m: "k"),
+    (re.compile(r"x"), lambda m: "ks"),
+    (re.compile(r"z"), lambda m: "s"),
+    (re.compile(r"v"), lambda m: "f"),
+    (re.compile(r"d"), lambda m: "t"),
+    (re.compile(r"[wy](?![aeiou])"), lambda m: ""),
+    (re.compile(r"(?<=[aeiou])h|h(?![aeiou])"), lambda m: ""),
+]
+_DOUBLED = re.compile(r"(.)\1+")
+_VOWELS = re.compile(r"[aeiou]+")
+
+
+def phonetic_key(text: Optional[str]) -> str:
+    """
+    Encode text by how it sounds rather than how it is spelled.
+    
+    Each word keeps its consonant sounds ("X" for "sh"/"ch", "0" for "th"),
+    doubled sounds collapsed, and an "a" for each leading or interior run
+    of vowels; trailing vowels are dropped. "Phil Collins" and "Fil Colins"
+    both encode to "falkalans", while "Nurofen" ("narafan") stays apart
+    from "Nirvana" ("narfan").
+    
+    Args:
+        text (Optional[str]): Text to encode (normalized first)
+    
+    Returns:
+        str: Phonetic key of all words joined, e.g. "Nervana" -> "narfan"
+    """
+    codes = []
+    for word in normalize_text(text).split():
+        for pattern, replacement in _PHONETIC_RULES:
+            word = pattern.sub(replacement, word)
+        word = _VOWELS.sub("a", _DOUBLED.sub(r"\1", word))
+        if len(word) > 1:
+            word = word.rstrip("a")
+        codes.append(word)
+    return "".join(codes)
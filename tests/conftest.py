@@ -0,0 +1,13 @@
+"""
+Shared test setup
+
+Backend tests import the API modules the way the server does (``app.*``
+from backend/), so backend/ is put on the import path.
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
@@ -0,0 +1,122 @@
+"""
+Unit tests for artist aliases and credited-artist answer keys
+
+Tests the alias store (editing, imports, seeding, sharing between
+workers) and which artist names a round's answer key accepts.
+"""
+
+import pytest
+
+from app.artist_aliases import ArtistAliasStore, artist_initials
+from app.game_manager import build_artist_key, credited_artists
+from src.guess_matcher import match_guess
+
+
+def track(*names):
+    """A track crediting the given artists."""
+    return {"artists": [{"name": name} for name in names]}
+
+
+class TestCreditedArtists:
+    """Test suite for credited_artists and build_artist_key."""
+    
+    def test_featured_artists_are_credited(self):
+        """Test that guests named in the credit and co-artists are accepted."""
+        assert credited_artists(track("Eminem feat. Rihanna")) == ["Eminem", "Rihanna"]
+        assert credited_artists(track("Calvin Harris", "Dua Lipa")) == ["Calvin Harris", "Dua Lipa"]
+        assert credited_artists(track()) == ["Unknown Artist"]
+        
+        key = build_artist_key(track("Daft Punk ft. Pharrell Williams"))
+        assert match_guess("Pharrell Williams", key)
+        assert key.answer == "Daft Punk ft. Pharrell Williams"
+    
+    @pytest.mark.parametrize("artist, fragment", [
+        ("Earth, Wind & Fire", "Earth"),
+        ("Tyler, The Creator", "Tyler"),
+        ("Tyler, The Creator", "Creator"),
+        ("Crosby, Stills, Nash & Young", "Stills"),
+    ])
+    def test_names_with_commas_are_not_split(self, artist, fragment):
+        """Test that part of a band name is not accepted as the artist."""
+        assert credited_artists(track(artist)) == [artist]
+        key = build_artist_key(track(artist))
+        assert not match_guess(fragment, key)
+        assert match_guess(artist.lower(), key)
+    
+    def test_aliases_of_every_credited_artist(self, tmp_path):
+        """Test that aliases of the primary and featured artists match."""
+        aliases = ArtistAliasStore(str(tmp_path))
+        aliases.set_aliases("Guns N' Roses", ["GNR"])
+        aliases.set_aliases("Michael Jackson", ["MJ"])
+        
+        key = build_artist_key(track("Slash feat. Michael Jackson", "Guns N' Roses"), aliases)
+        assert match_guess("mj", key)
+        assert match_guess("GNR", key)
+        assert not match_guess("MJ", build_artist_key(track("Slash")))
+
+
+class TestArtistAliasStore:
+    """Test suite for ArtistAliasStore."""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        """
+        Fixture creating an empty alias store in a temporary directory.
+        
+        Returns:
+            ArtistAliasStore: New store
+        """
+        return ArtistAliasStore(str(tmp_path))
+    
+    def test_set_and_look_up(self, store):
+        """Test lookups ignore case and "The", and aliases are cleaned."""
+        stored = store.set_aliases("The Beatles", [" Fab Four ", "fab four", "Beatles", ""])
+        
+        assert stored == ["Fab Four"]
+        assert store.aliases_for("beatles") == ["Fab Four"]
+        assert store.canonical_artists("FAB FOUR") == {"The Beatles"}
+        assert store.canonical_artists("Wings") == set()
+        
+        store.set_aliases("BEATLES", [])
+        assert store.get_all() == {}
+    
+    def test_delete_artist(self, store):
+        """Test that deleting reports whether the artist had aliases."""
+        store.set_aliases("Michael Jackson", ["MJ"])
+        
+        assert store.delete_artist("michael jackson")
+        assert not store.delete_artist("Michael Jackson")
+        assert store.canonical_artists("MJ") == set()
+    
+    def test_import_merges_or_replaces(self, store):
+        """Test bulk imports count only new aliases."""
+        store.set_aliases("Michael Jackson", ["MJ"])
+        
+        added = store.import_aliases({"michael jackson": ["MJ", "King of Pop"], "Prince": ["TAFKAP"]})
+        assert added == 2
+        assert store.get_all()["Michael Jackson"] == ["MJ", "King of Pop"]
+        
+        assert store.import_aliases({"Queen": ["Freddie's band"]}, replace=True) == 1
+        assert list(store.get_all()) == ["Queen"]
+    
+    def test_seed_from_artist_initials(self, store):
+        """Test that multi-word artists are seeded with their initials."""
+        assert artist_initials("The Red Hot Chili Peppers") == "RHCP"
+        assert artist_initials("Guns N' Roses") == "GNR"
+        assert artist_initials("Simon & Garfunkel") == "SG"
+        assert artist_initials("Queen") is None
+        
+        assert store.seed_from_artists(["Red Hot Chili Peppers", "Queen"]) == 1
+        assert store.seed_from_artists(["Red Hot Chili Peppers"]) == 0
+        assert store.canonical_artists("rhcp") == {"Red Hot Chili Peppers"}
+    
+    def test_other_instance_sees_changes(self, store, tmp_path):
+        """Test that a second worker's store reloads the changed file."""
+        other = ArtistAliasStore(str(tmp_path))
+        assert other.aliases_for("Guns N' Roses") == []
+        
+        store.set_aliases("Guns N' Roses", ["GNR"])
+        assert other.aliases_for("guns n roses") == ["GNR"]
+        
+        other.set_aliases("Michael Jackson", ["MJ"])
+        assert set(store.get_all()) == {"Guns N' Roses", "Michael Jackson"}
@@ -0,0 +1,409 @@
+"""
+Integration tests for the backend API
+
+Runs the FastAPI app in-process with every service pointed at a temporary
+directory (through app.dependency_overrides).
+"""
+
+import gzip
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.artist_aliases import ArtistAliasStore
+from app.custom_list_manager import CustomListManager
+from app.custom_lists_models import CustomSong
+from app.deck_pool import DeckPool
+from app.dependencies import (
+    get_artist_aliases, get_custom_list_manager, get_deck_pool, get_leaderboard,
+    get_metadata_library, get_room_manager, get_session_manager
+)
+from app.game_manager import GameSessionManager
+from app.http_cache import make_etag
+from app.leaderboard import LeaderboardService
+from app.main import app
+from app.metadata_library import MetadataLibrary
+from app.pagination import MAX_PAGE_SIZE
+from app.rooms import RoomManager
+
+
+def parse_sse(body):
+    """Split an event stream into (id, event, data) tuples."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def provide(service):
+    """Dependency override returning a fixed service."""
+    return lambda: service
+
+
+def receive_until(websocket, event_type):
+    """Read room updates until one of the given type arrives."""
+    while True:
+        message = websocket.receive_json()
+        if message["type"] == event_type:
+            return message
+
+
+class TestBackendAPI:
+    """Test suite for the HTTP and WebSocket routes."""
+    
+    @pytest.fixture
+    def services(self, tmp_path):
+        """
+        Fixture providing fresh services on a temporary data directory.
+        
+        Returns:
+            dict: Service instances keyed by their provider
+        """
+        manager = CustomListManager(str(tmp_path / "data" / "custom_lists"))
+        services = {
+            get_custom_list_manager: manager,
+            get_deck_pool: DeckPool(manager),
+            get_session_manager: GameSessionManager(),
+            get_room_manager: RoomManager(),
+            get_leaderboard: LeaderboardService(str(tmp_path / "data" / "leaderboards")),
+            get_metadata_library: MetadataLibrary(str(tmp_path / "data")),
+            get_artist_aliases: ArtistAliasStore(str(tmp_path / "data"))
+        }
+        for provider, service in services.items():
+            app.dependency_overrides[provider] = provide(service)
+        yield services
+        app.dependency_overrides.clear()
+        services[get_deck_pool].shutdown()
+    
+    @pytest.fixture
+    def client(self, services):
+        """
+        Fixture providing a test client with Deezer lookups disabled.
+        
+        Returns:
+            TestClient: Client for the app
+        """
+        with patch("app.deck_pool.refresh_deezer_preview_url", return_value=None):
+            with TestClient(app) as client:
+                yield client
+    
+    @pytest.fixture
+    def list_id(self, services):
+        """
+        Fixture creating a list of five songs by distinct artists.
+        
+        Returns:
+            str: The list's ID
+        """
+        songs = [
+            CustomSong(id=str(i), name=f"Song {i}", artist=artist, provider="deezer")
+            for i, artist in enumerate(["Queen", "Oasis", "Blur", "Pulp", "Suede"])
+        ]
+        return services[get_custom_list_manager].create_list("Party", songs=songs).id
+    
+    def start_game(self, client, list_id, num_rounds=2, **fields):
+        """Start a custom-list game and return its session."""
+        response = client.post("/api/game/start", json={
+            "provider": "custom", "mode": "custom", "custom_list_id": list_id,
+            "num_rounds": num_rounds, **fields
+        })
+        assert response.status_code == 200
+        return response.json()
+    
+    def play_wrong(self, client, session_id, rounds):
+        """Miss both guesses of every round."""
+        for round_number in range(rounds):
+            for _ in range(2):
+                client.post("/api/game/guess", json={
+                    "session_id": session_id, "guess": "nobody", "round_number": round_number
+                })
+    
+    def test_bulk_upsert_songs(self, client, list_id):
+        """Test that valid songs are upserted in one call and bad ones rejected."""
+        response = client.post(f"/api/admin/lists/{list_id}/songs:bulk", json={"songs": [
+            {"id": "0", "name": "Renamed", "artist": "Queen"},
+            {"id": "9", "name": "New song", "artist": "Muse"},
+            {"id": " ", "name": "Blank ID", "artist": "Nobody"},
+            {"name": "No ID"}
+        ]}).json()
+        
+        assert (response["created"], response["updated"], response["rejected"]) == (1, 1, 2)
+        assert response["song_count"] == 6
+        assert [result["status"] for result in response["results"]] == [
+            "updated", "created", "rejected", "rejected"
+        ]
+        songs = client.get(f"/api/admin/lists/{list_id}").json()["songs"]
+        assert (songs[0]["name"], songs[-1]["id"]) == ("Renamed", "9")
+        
+        missing = client.post("/api/admin/lists/missing/songs:bulk", json={"songs": []})
+        assert missing.status_code == 404
+    
+    def test_lists_conditional_get(self, client, list_id):
+        """Test ETags on the list index and a list, and that edits change them."""
+        for url in ("/api/admin/lists", f"/api/admin/lists/{list_id}"):
+            first = client.get(url)
+            etag = first.headers["ETag"]
+            cached = client.get(url, headers={"If-None-Match": etag})
+            assert cached.status_code == 304
+            assert cached.content == b""
+        
+        client.put(f"/api/admin/lists/{list_id}", json={"name": "Renamed"})
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+    
+    def test_conditional_get_of_missing_list(self, client, services):
+        """Test that an old ETag does not turn a missing list into a 304."""
+        manager = services[get_custom_list_manager]
+        list_id = manager.create_list("Gone").id
+        etag = client.get(f"/api/admin/lists/{list_id}").headers["ETag"]
+        manager.delete_list(list_id)
+        
+        assert client.get(f"/api/admin/lists/{list_id}", headers={"If-None-Match": etag}).status_code == 404
+        unknown = make_etag("list", "unknown", manager.get_list_version("unknown"), "0")
+        assert client.get("/api/admin/lists/unknown", headers={"If-None-Match": unknown}).status_code == 404
+    
+    def test_library_conditional_get(self, client, services):
+        """Test that library ETags change when a song is saved."""
+        library = services[get_metadata_library]
+        etag = client.get("/api/admin/library/stats").headers["ETag"]
+        assert client.get("/api/admin/library/stats", headers={"If-None-Match": etag}).status_code == 304
+        
+        library.save_song_metadata("1", "deezer", "Wonderwall", "Oasis", None, None, {})
+        assert client.get("/api/admin/library/stats", headers={"If-None-Match": etag}).status_code == 200
+    
+    def test_list_songs_cursor_pagination(self, client, list_id):
+        """Test walking a list's songs page by page with projected fields."""
+        names, cursor = [], None
+        while True:
+            params = {"limit": 2, "fields": "name"}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get(f"/api/admin/lists/{list_id}", params=params).json()
+            assert page["total"] == 5
+            assert all(song.keys() == {"name"} for song in page["songs"])
+            names.extend(song["name"] for song in page["songs"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert names == [f"Song {i}" for i in range(5)]
+        bad = client.get(f"/api/admin/lists/{list_id}", params={"cursor": "garbage"})
+        assert bad.status_code == 400
+    
+    def test_filter_pages_and_ndjson(self, client, list_id):
+        """Test filtered pages, NDJSON streaming and the page size limit."""
+        body = {"list_id": list_id, "page_size": 3, "fields": ["id"]}
+        page = client.post("/api/admin/lists/filter", json=body).json()
+        assert [song["id"] for song in page["songs"]] == ["0", "1", "2"]
+        
+        streamed = client.post("/api/admin/lists/filter", json={**body, "format": "ndjson"})
+        assert streamed.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line) for line in streamed.text.splitlines()] == page["songs"]
+        
+        too_big = client.post("/api/admin/lists/filter", json={**body, "page_size": MAX_PAGE_SIZE + 1})
+        assert too_big.status_code == 422
+    
+    def test_library_stream_import(self, client, services):
+        """Test importing NDJSON in batches, skipping unusable entries."""
+        lines = [
+            json.dumps({"id": str(i), "provider": "deezer", "name": f"Song {i}", "artist": "Queen",
+                        "metadata": {"genre": "Rock"}})
+            for i in range(5)
+        ]
+        body = ("\n".join(lines) + '\n{"name": "No ID"}\n').encode()
+        response = client.post(
+            "/api/admin/library/import/stream", params={"batch_size": 2}, content=body,
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        summary = response.json()
+        assert (summary["imported_count"], summary["skipped"], summary["batches"]) == (5, 1, 3)
+        assert services[get_metadata_library].get_statistics()["total_artists"] == 1
+        
+        truncated = client.post(
+            "/api/admin/library/import/stream", content=b'[{"id": "9", "provider": "deezer"',
+            headers={"Content-Type": "application/json"}
+        )
+        assert truncated.status_code == 400
+    
+    def test_library_export_since_and_gzip(self, client, services):
+        """Test incremental and compressed library exports."""
+        library = services[get_metadata_library]
+        library.save_song_metadata("1", "deezer", "Bohemian Rhapsody", "Queen", None, None, {})
+        since = datetime.now().isoformat()
+        library.save_song_metadata("2", "deezer", "Wonderwall", "Oasis", None, None, {})
+        
+        exported = client.get("/api/admin/library/export", params={"format": "ndjson", "since": since})
+        assert exported.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line)["id"] for line in exported.text.splitlines()] == ["2"]
+        
+        compressed = client.get("/api/admin/library/export", params={"gzip": True})
+        assert compressed.headers["content-type"] == "application/gzip"
+        assert json.loads(gzip.decompress(compressed.content))["songs"].keys() == {"deezer_1", "deezer_2"}
+        
+        assert client.get("/api/admin/library/export", params={"since": "yesterday"}).status_code == 400
+    
+    def test_fuzzy_search(self, client, services, list_id):
+        """Test that /search finds near matches in the library and in lists."""
+        services[get_metadata_library].save_song_metadata(
+            "9", "deezer", "Paradise City", "Guns N' Roses", None, None, {}
+        )
+        
+        result = client.get("/api/admin/search", params={"q": "guns n roses"}).json()
+        library_matches = [(match["value"], match["field"]) for match in result["library"]]
+        assert library_matches == [("Guns N' Roses", "artist")]
+        assert result["lists"] == []
+        
+        result = client.get("/api/admin/search", params={"q": "oassis"}).json()
+        assert [(match["list_id"], match["value"]) for match in result["lists"]] == [(list_id, "Oasis")]
+        assert client.get("/api/admin/search", params={"q": ""}).status_code == 422
+    
+    def test_artist_alias_routes(self, client, services):
+        """Test editing, importing and seeding artist aliases."""
+        response = client.put("/api/admin/aliases/Guns N' Roses", json={"aliases": ["GNR", "gnr"]})
+        assert response.json()["aliases"] == ["GNR"]
+        assert client.get("/api/admin/aliases/guns n roses").json()["aliases"] == ["GNR"]
+        
+        imported = client.post("/api/admin/aliases/import", json={"artists": {"Michael Jackson": ["MJ"]}})
+        assert imported.json()["added_count"] == 1
+        
+        services[get_metadata_library].save_song_metadata(
+            "1", "deezer", "Give It Away", "Red Hot Chili Peppers", None, None, {}
+        )
+        seeded = client.post("/api/admin/aliases/seed").json()
+        assert (seeded["added_count"], seeded["artists_scanned"]) == (1, 1)
+        
+        listed = client.get("/api/admin/aliases").json()
+        assert listed["count"] == 3
+        assert listed["artists"]["Red Hot Chili Peppers"] == ["RHCP"]
+        
+        assert client.delete("/api/admin/aliases/Michael Jackson").status_code == 200
+        assert client.delete("/api/admin/aliases/Michael Jackson").status_code == 404
+        replaced = client.post("/api/admin/aliases/import", json={"artists": {}, "replace": True})
+        assert replaced.status_code == 200
+        assert client.get("/api/admin/aliases").json()["count"] == 0
+    
+    def test_guess_batch(self, client, services, list_id):
+        """Test scoring a room's guesses for one round in one call."""
+        session_id = self.start_game(client, list_id)["session_id"]
+        session = services[get_session_manager].get_session(session_id)
+        artist = session.songs[1]["artists"][0]["name"]
+        
+        response = client.post("/api/game/guess/batch", json={
+            "session_id": session_id,
+            "round_number": 1,
+            "guesses": [
+                {"player_id": "ann", "guess": artist.upper()},
+                {"player_id": "bob", "guess": "nobody"},
+                {"player_id": "cat", "guess": artist, "second_guess": True}
+            ]
+        })
+        result = response.json()
+        assert (result["round_number"], result["correct_count"]) == (1, 2)
+        assert result["correct_answer"] == artist
+        assert [(r["player_id"], r["points_earned"]) for r in result["results"]] == [
+            ("ann", 2.0), ("bob", 0.0), ("cat", 1.0)
+        ]
+        assert session.current_round == 0
+        assert not session.first_guess_made
+        
+        current = client.post("/api/game/guess/batch", json={"session_id": session_id, "guesses": []})
+        assert (current.json()["round_number"], current.json()["results"]) == (0, [])
+        
+        missing_round = client.post(
+            "/api/game/guess/batch", json={"session_id": session_id, "round_number": 5}
+        )
+        assert missing_round.status_code == 400
+        missing_session = client.post("/api/game/guess/batch", json={"session_id": "nope", "guesses": []})
+        assert missing_session.status_code == 404
+    
+    def test_room_round(self, client, list_id, services):
+        """Test a player guessing in a round the host starts over WebSockets."""
+        session_id = self.start_game(client, list_id, num_rounds=1)["session_id"]
+        room = client.post("/api/rooms", json={"session_id": session_id}).json()
+        artist = services[get_session_manager].get_session(session_id).songs[0]["artists"][0]["name"]
+        
+        base = f"/api/rooms/{room['code']}/ws"
+        with client.websocket_connect(f"{base}?host_token={room['host_token']}") as host, \
+                client.websocket_connect(f"{base}?name=Ann") as player:
+            assert receive_until(host, "welcome")["is_host"] is True
+            assert receive_until(player, "welcome")["name"] == "Ann"
+            
+            host.send_json({"type": "next_round"})
+            assert receive_until(player, "round_started")["round"] == 0
+            player.send_json({"type": "guess", "guess": artist})
+            result = receive_until(player, "guess_result")
+            assert (result["correct"], result["points_earned"]) == (True, 2.0)
+            
+            host.send_json({"type": "next_round"})
+            assert receive_until(player, "round_ended")["correct_count"] == 1
+            assert receive_until(player, "game_over")["scoreboard"][0]["score"] == 2.0
+    
+    def test_room_rejoin_needs_private_token(self, client, list_id, services):
+        """Test that a public player ID cannot take over a seat but the rejoin token can."""
+        session_id = self.start_game(client, list_id, num_rounds=1)["session_id"]
+        room = client.post("/api/rooms", json={"session_id": session_id}).json()
+        artist = services[get_session_manager].get_session(session_id).songs[0]["artists"][0]["name"]
+        base = f"/api/rooms/{room['code']}/ws"
+        
+        with client.websocket_connect(f"{base}?name=Ann") as player:
+            welcome = receive_until(player, "welcome")
+            client.post(f"/api/rooms/{room['code']}/next_round", json={"host_token": room["host_token"]})
+            player.send_json({"type": "guess", "guess": artist})
+            assert receive_until(player, "guess_result")["total_score"] == 2.0
+        
+        scoreboard = client.get(f"/api/rooms/{room['code']}").json()["scoreboard"]
+        assert scoreboard == [{"player_id": welcome["player_id"], "name": "Ann", "score": 2.0}]
+        
+        with client.websocket_connect(f"{base}?name=Eve&player_id={welcome['player_id']}") as other:
+            impostor = receive_until(other, "welcome")
+            assert impostor["player_id"] != welcome["player_id"]
+            assert impostor["score"] == 0.0
+        
+        with client.websocket_connect(f"{base}?rejoin_token={welcome['rejoin_token']}") as player:
+            rejoined = receive_until(player, "welcome")
+            assert (rejoined["player_id"], rejoined["name"], rejoined["score"]) == (
+                welcome["player_id"], "Ann", 2.0
+            )
+    
+    def test_event_stream_resumes_after_last_event_id(self, client, list_id):
+        """Test that a reconnecting client gets only the events it missed."""
+        session_id = self.start_game(client, list_id)["session_id"]
+        self.play_wrong(client, session_id, 2)
+        url = f"/api/game/session/{session_id}/events"
+        
+        assert [event[1] for event in parse_sse(client.get(url).text)] == ["state", "game_over"]
+        
+        events = parse_sse(client.get(url, headers={"Last-Event-ID": "0"}).text)
+        assert events[0][:2] == (None, "state")
+        assert events[-1][1] == "game_over"
+        ids = [int(event_id) for event_id, _, _ in events[1:]]
+        assert ids == sorted(ids)
+        
+        resumed = parse_sse(client.get(url, headers={"Last-Event-ID": str(ids[2])}).text)
+        assert resumed[0][1] == "state"
+        assert resumed[1:] == events[4:]
+        assert sum(event[1] == "game_over" for event in resumed) == 1
+        
+        assert client.get("/api/game/session/unknown/events").status_code == 404
+    
+    def test_finished_game_on_leaderboard(self, client, list_id):
+        """Test that a finished custom-list game is ranked once."""
+        session_id = self.start_game(client, list_id, player_name="Ann")["session_id"]
+        self.play_wrong(client, session_id, 2)
+        self.play_wrong(client, session_id, 2)
+        
+        board = client.get(f"/api/game/leaderboard/{list_id}", params={"session_id": session_id}).json()
+        assert board["total_entries"] == 1
+        assert board["you"]["player_name"] == "Ann"
+        assert client.get("/api/game/leaderboard/bad.id").status_code == 400
+    
+    def test_start_game_with_unhashable_filter(self, client, list_id):
+        """Test that a list-valued filter is a 404 rather than a server error."""
+        response = client.post("/api/game/start", json={
+            "provider": "custom", "mode": "custom", "custom_list_id": list_id,
+            "num_rounds": 2, "custom_filters": {"genre": ["Rock"]}
+        })
+        assert response.status_code == 404
@@ -0,0 +1,219 @@
+"""
+Unit tests for CustomListManager
+
+Tests buffered play counts, bulk song upserts, cache invalidation
+between workers (two managers on one directory), content versions and
+the shared song store.
+"""
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.custom_list_manager import CustomListManager
+from app.custom_lists_models import CustomSong
+from app.file_storage import atomic_write_json
+from app.serialization import read_json_file
+from app.song_store import MissingSongError, SongStore
+
+
+def make_song(song_id, name="Song", artist="Artist", **fields):
+    """Build a Deezer song for a list."""
+    return CustomSong(id=song_id, name=name, artist=artist, provider="deezer", **fields)
+
+
+class TestCustomListManager:
+    """Test suite for CustomListManager storage behaviour."""
+    
+    @pytest.fixture
+    def storage_dir(self, tmp_path):
+        """
+        Fixture providing a custom list directory inside a temporary data dir.
+        
+        Returns:
+            str: Path of data/custom_lists
+        """
+        return str(tmp_path / "data" / "custom_lists")
+    
+    def test_play_counts_buffered_until_flush(self, storage_dir):
+        """Test that plays are counted in memory and written by one flush."""
+        manager = CustomListManager(storage_dir)
+        custom_list = manager.create_list("Party")
+        list_file = manager._get_list_path(custom_list.id)
+        written = list_file.stat().st_mtime_ns
+        
+        for _ in range(3):
+            manager.increment_play_count(custom_list.id)
+        
+        assert manager.get_list(custom_list.id).times_played == 3
+        assert not manager._get_play_counts_path().exists()
+        
+        assert manager.flush_play_counts() == 3
+        assert manager.flush_play_counts() == 0
+        assert read_json_file(manager._get_play_counts_path())["counts"] == {custom_list.id: 3}
+        assert list_file.stat().st_mtime_ns == written
+    
+    def test_play_counts_from_workers_add_up(self, storage_dir):
+        """Test that flushes from two workers add to each other."""
+        first = CustomListManager(storage_dir)
+        second = CustomListManager(storage_dir)
+        list_id = first.create_list("Party").id
+        
+        first.increment_play_count(list_id)
+        second.increment_play_count(list_id)
+        second.increment_play_count(list_id)
+        first.flush_play_counts()
+        second.flush_play_counts()
+        
+        assert first.get_list(list_id).times_played == 3
+        assert second.get_list(list_id).times_played == 3
+    
+    def test_other_worker_sees_changes(self, storage_dir):
+        """Test that a worker's cached list is refreshed after another worker edits it."""
+        first = CustomListManager(storage_dir)
+        second = CustomListManager(storage_dir)
+        list_id = first.create_list("Party").id
+        
+        assert second.get_list(list_id).songs == []
+        first.add_song(list_id, make_song("1"))
+        
+        assert [song.id for song in second.get_list(list_id).songs] == ["1"]
+        assert [summary.song_count for summary in second.list_all_summaries()] == [1]
+    
+    def test_counting_plays_does_not_wait_for_flush(self, storage_dir):
+        """Test that plays are counted while a flush is writing, and none are lost."""
+        manager = CustomListManager(storage_dir)
+        list_id = manager.create_list("Party").id
+        manager.increment_play_count(list_id)
+        
+        writing = threading.Event()
+        release = threading.Event()
+        write = atomic_write_json
+        
+        def slow_write(path, data):
+            writing.set()
+            release.wait(5)
+            write(path, data)
+        
+        with patch("app.custom_list_manager.atomic_write_json", side_effect=slow_write):
+            flusher = threading.Thread(target=manager.flush_play_counts)
+            flusher.start()
+            assert writing.wait(5)
+            
+            counter = threading.Thread(target=manager.increment_play_count, args=(list_id,))
+            counter.start()
+            counter.join(1)
+            assert not counter.is_alive()
+            assert manager.get_list(list_id).times_played == 2
+            
+            release.set()
+            flusher.join(5)
+        
+        assert manager.get_list(list_id).times_played == 2
+        assert manager.flush_play_counts() == 1
+        assert manager.get_list(list_id).times_played == 2
+    
+    def test_upsert_songs(self, storage_dir):
+        """Test that a batch creates new songs and replaces existing ones in place."""
+        manager = CustomListManager(storage_dir)
+        list_id = manager.create_list("Party").id
+        manager.add_song(list_id, make_song("1", name="Old"))
+        
+        custom_list, statuses = manager.upsert_songs(list_id, [
+            make_song("2"), make_song("1", name="New"), make_song("2", name="Again")
+        ])
+        
+        assert statuses == ["created", "updated", "updated"]
+        assert [(song.id, song.name) for song in custom_list.songs] == [("1", "New"), ("2", "Again")]
+        assert manager.get_list(list_id).songs == custom_list.songs
+        assert manager.upsert_songs("missing", [make_song("1")]) is None
+    
+    def test_content_version_ignores_play_counts(self, storage_dir):
+        """Test that flushing plays changes the list version but not the content version."""
+        manager = CustomListManager(storage_dir)
+        list_id = manager.create_list("Party").id
+        list_version = manager.get_list_version(list_id)
+        content_version = manager.get_content_version(list_id)
+        
+        manager.increment_play_count(list_id)
+        assert manager.get_list_version(list_id) != list_version
+        manager.flush_play_counts()
+        assert manager.get_content_version(list_id) == content_version
+        
+        manager.add_song(list_id, make_song("1"))
+        assert manager.get_content_version(list_id) != content_version
+
+
+class TestSongStore:
+    """Test suite for song references shared between lists."""
+    
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """
+        Fixture providing a manager on an empty data directory.
+        
+        Returns:
+            CustomListManager: Manager storing songs in tmp_path/data
+        """
+        return CustomListManager(str(tmp_path / "data" / "custom_lists"))
+    
+    def test_lists_store_references_and_overrides(self, manager):
+        """Test that a song in two lists is stored once, with per-list overrides."""
+        first = manager.create_list("Rock").id
+        second = manager.create_list("Quiz").id
+        manager.add_song(first, make_song("1", "Bohemian Rhapsody", "Queen"))
+        manager.add_song(second, make_song("1", "Bohemian Rhapsody", "Queen", difficulty="hard"))
+        
+        lines = manager.song_store.path.read_bytes().splitlines()
+        assert len(lines) == 1
+        entries = read_json_file(manager._get_list_path(second))["songs"]
+        assert entries == [{"ref": "deezer_1", "difficulty": "hard"}]
+        
+        reloaded = CustomListManager(str(manager.storage_dir))
+        assert reloaded.get_list(first).songs[0].difficulty == "medium"
+        assert reloaded.get_list(second).songs[0].difficulty == "hard"
+        assert reloaded.get_list(second).songs[0].name == "Bohemian Rhapsody"
+    
+    def test_legacy_list_files_load(self, manager):
+        """Test that list files with full songs load and are converted on save."""
+        list_id = manager.create_list("Old").id
+        path = manager._get_list_path(list_id)
+        data = read_json_file(path)
+        data["songs"] = [make_song("7", "Wonderwall", "Oasis").model_dump()]
+        path.write_text(json.dumps(data))
+        
+        reloaded = CustomListManager(str(manager.storage_dir))
+        assert [song.name for song in reloaded._load_list(list_id).songs] == ["Wonderwall"]
+        
+        reloaded.add_song(list_id, make_song("8"))
+        assert read_json_file(path)["songs"][0] == {"ref": "deezer_7"}
+    
+    def test_missing_reference_fails_instead_of_dropping_song(self, manager):
+        """Test that a list whose song is gone from the store does not load or save."""
+        list_id = manager.create_list("Party").id
+        manager.add_song(list_id, make_song("1"))
+        manager.song_store.path.unlink()
+        
+        reloaded = CustomListManager(str(manager.storage_dir))
+        with pytest.raises(MissingSongError):
+            reloaded.get_list(list_id)
+        with pytest.raises(MissingSongError):
+            reloaded.add_song(list_id, make_song("2"))
+        assert read_json_file(manager._get_list_path(list_id))["songs"] == [{"ref": "deezer_1"}]
+    
+    def test_store_reads_songs_appended_by_other_workers(self, tmp_path):
+        """Test that a store picks up other workers' appends, but not a partial line."""
+        first = SongStore(str(tmp_path))
+        second = SongStore(str(tmp_path))
+        first.add_songs([make_song("1", "Wonderwall", "Oasis")])
+        
+        assert second.get("deezer_1").name == "Wonderwall"
+        with open(first.path, 'ab') as f:
+            f.write(b'{"id": "2", "name": "Half')
+        assert second.get("deezer_2") is None
+        
+        second.add_songs([make_song("1"), make_song("3", "Creep", "Radiohead")])
+        assert len(second) == 2
+        assert first.get("deezer_3").name == "Creep"
@@ -0,0 +1,101 @@
+"""
+Unit tests for DeckPool
+
+Tests ready decks, refilling at the low-water mark and dropping decks
+built before a list changed. Preview URL refreshes are patched out.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.custom_list_manager import CustomListManager
+from app.custom_lists_models import CustomSong
+from app.deck_pool import DeckPool, deck_key
+
+
+class TestDeckPool:
+    """Test suite for the game deck pool."""
+    
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """
+        Fixture providing a manager with one five-song list.
+        
+        Returns:
+            CustomListManager: Manager on a temporary directory
+        """
+        manager = CustomListManager(str(tmp_path / "data" / "custom_lists"))
+        songs = [
+            CustomSong(id=str(i), name=f"Song {i}", artist="Artist", provider="deezer", genre="Rock")
+            for i in range(5)
+        ]
+        manager.create_list("Party", songs=songs)
+        return manager
+    
+    @pytest.fixture(autouse=True)
+    def no_deezer(self):
+        """Fixture replacing Deezer preview refreshes with a fixed URL."""
+        with patch("app.deck_pool.refresh_deezer_preview_url", return_value="https://fresh") as refresh:
+            yield refresh
+    
+    def make_pool(self, manager, **kwargs):
+        """Pool whose refills run inline, so tests see their result at once."""
+        pool = DeckPool(manager, **kwargs)
+        pool._schedule_refill = pool._refill
+        return pool
+    
+    def list_id(self, manager):
+        """ID of the fixture's list."""
+        return manager.list_all_summaries()[0].id
+    
+    def test_deck_key_is_canonical(self):
+        """Test that equal filters share a key and any JSON filter value works."""
+        assert deck_key("a", {"mood": "Happy", "genre": "Rock"}, 5) == deck_key(
+            "a", {"genre": "Rock", "mood": "Happy", "decade": "", "unknown": 1}, 5
+        )
+        assert deck_key("a", None, 5) == deck_key("a", {}, 5)
+        key = deck_key("a", {"genre": ["Rock", "Pop"], "mood": {"any": True}}, 5)
+        assert hash(key) == hash(deck_key("a", {"mood": {"any": True}, "genre": ["Rock", "Pop"]}, 5))
+    
+    def test_build_deck(self, manager):
+        """Test that a deck has the requested rounds with fresh previews."""
+        key = deck_key(self.list_id(manager), {"genre": "Rock", "unknown": "x"}, 3)
+        deck = DeckPool(manager).build_deck(key)
+        
+        assert len(deck.songs) == len(deck.tracks) == 3
+        assert {song["preview_url"] for song in deck.songs} == {"https://fresh"}
+        assert DeckPool(manager).build_deck(deck_key(key[0], {"genre": "Jazz"}, 3)) is None
+    
+    def test_take_refills_only_below_low_water(self, manager):
+        """Test that the first take starts a refill and later ones wait for the mark."""
+        pool = self.make_pool(manager, pool_size=3, low_water=1)
+        key = deck_key(self.list_id(manager), None, 2)
+        
+        with patch.object(pool, "build_deck", wraps=pool.build_deck) as build:
+            assert pool.take(key) is None
+            assert build.call_count == 3
+            assert pool.take(key) is not None
+            assert pool.take(key) is not None
+            assert build.call_count == 3
+            assert pool.take(key) is not None
+            assert build.call_count == 6
+    
+    def test_decks_dropped_after_list_change(self, manager):
+        """Test that decks built before an edit are not handed out."""
+        pool = self.make_pool(manager)
+        list_id = self.list_id(manager)
+        key = deck_key(list_id, None, 2)
+        pool.take(key)
+        
+        manager.update_list(list_id, name="Renamed party")
+        with patch.object(pool, "build_deck", return_value=None):
+            assert pool.take(key) is None
+    
+    def test_unhashable_filter_matches_nothing(self, manager):
+        """Test that a list-valued filter builds no deck instead of failing."""
+        pool = self.make_pool(manager)
+        key = deck_key(self.list_id(manager), {"genre": ["Rock"]}, 2)
+        
+        assert pool.take(key) is None
+        assert pool.build_deck(key) is None
@@ -0,0 +1,45 @@
+"""
+Unit tests for the shared service providers
+
+Tests that lazy_singleton builds its instance once, on first use.
+"""
+
+import threading
+import time
+
+from app.dependencies import lazy_singleton
+
+
+class TestLazySingleton:
+    """Test suite for lazy_singleton."""
+    
+    def test_built_once_on_first_use(self):
+        """Test that concurrent first calls share one instance."""
+        built = []
+        
+        @lazy_singleton
+        def get_service():
+            time.sleep(0.01)
+            built.append(object())
+            return built[-1]
+        
+        assert not get_service.is_created()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_service())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(built) == 1
+        assert all(result is built[0] for result in results)
+        assert get_service.is_created()
+    
+    def test_reset_drops_instance(self):
+        """Test that reset() makes the next call build a new instance."""
+        get_service = lazy_singleton(object)
+        first = get_service()
+        
+        get_service.reset()
+        assert not get_service.is_created()
+        assert get_service() is not first
@@ -0,0 +1,64 @@
+"""
+Unit tests for backend file storage primitives
+
+Tests cross-process file locks and atomic writes.
+"""
+
+import multiprocessing
+import os
+import stat
+
+from app.file_storage import atomic_write_bytes, file_lock
+
+
+def _locked_increment(counter_path, lock_path, times):
+    """Read-modify-write a counter file under the lock (run in a child process)."""
+    for _ in range(times):
+        with file_lock(lock_path):
+            with open(counter_path) as f:
+                value = int(f.read())
+            with open(counter_path, "w") as f:
+                f.write(str(value + 1))
+
+
+class TestFileStorage:
+    """Test suite for file_lock and atomic_write_bytes."""
+    
+    def test_file_lock_serializes_processes(self, tmp_path):
+        """Test that updates from several processes under the lock are not lost."""
+        counter_path = tmp_path / "counter"
+        counter_path.write_text("0")
+        lock_path = tmp_path / ".locks" / "counter.lock"
+        
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_locked_increment, args=(counter_path, lock_path, 200))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        
+        assert counter_path.read_text() == "800"
+    
+    def test_atomic_write_replaces_contents(self, tmp_path):
+        """Test that a write replaces the file and leaves no temp files."""
+        path = tmp_path / "data.json"
+        atomic_write_bytes(path, b"old")
+        atomic_write_bytes(path, b"new")
+        
+        assert path.read_bytes() == b"new"
+        assert os.listdir(tmp_path) == ["data.json"]
+    
+    def test_atomic_write_keeps_permissions(self, tmp_path):
+        """Test that rewriting a file keeps its mode and new files honour the umask."""
+        path = tmp_path / "library.json"
+        atomic_write_bytes(path, b"first")
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+        
+        os.chmod(path, 0o640)
+        atomic_write_bytes(path, b"second")
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
@@ -79,13 +79,15 @@ class TestGameEngine:
         )
         assert result is True
     
-    def test_validate_guess_substring_match(self, game_engine):
-        """Test partial/substring matching."""
-        result = game_engine._validate_guess(
-            'bohemian',
-            'Bohemian Rhapsody'
-        )
-        assert result is True
+    def test_validate_guess_rejects_fragment(self, game_engine):
+        """Test that a fragment of the title is not accepted."""
+        assert game_engine._validate_guess('a', 'Bohemian Rhapsody') is False
+        assert game_engine._validate_guess('bohemian', 'Bohemian Rhapsody') is False
+    
+    def test_validate_guess_typo_and_accents(self, game_engine):
+        """Test that small typos and missing accents are forgiven."""
+        assert game_engine._validate_guess('Bohemian Rapsody', 'Bohemian Rhapsody') is True
+        assert game_engine._validate_guess('Deja Vu', 'Déjà Vu') is True
     
     def test_validate_guess_with_whitespace(self, game_engine):
         """Test that whitespace is properly trimmed."""
@@ -291,7 +293,7 @@ class TestGameEngine:
         # Should only play 2 rounds
         assert stats['total'] == 2
     
-    @patch('builtins.input', side_effect=['', 'bohemian', '', 'bohemian'])
+    @patch('builtins.input', side_effect=['', 'bohemian rhapsody', '', 'bohemian rhapsody'])
     def test_play_game_multiple_rounds(
         self,
         mock_input,
@@ -313,7 +315,7 @@ class TestGameEngine:
         assert stats['total'] == 2
         assert stats['score'] == 2.0  # Both correct on first try
     
-    @patch('builtins.input', side_effect=['', 'bohemian', 'no'])
+    @patch('builtins.input', side_effect=['', 'bohemian rhapsody', 'no'])
     def test_play_game_early_exit(
         self,
         mock_input,
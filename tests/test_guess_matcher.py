@@ -0,0 +1,109 @@
+"""
+Unit tests for guess matching
+
+Tests answer normalization, precomputed answer keys, fuzzy and phonetic
+matching.
+"""
+
+from src.guess_matcher import (
+    LENIENCY_LEVELS, allowed_edits, build_answer_key, match_guess,
+    match_guesses, normalize_answer
+)
+
+
+class TestGuessMatcher:
+    """Test suite for guess matching functions."""
+    
+    def test_normalize_answer(self):
+        """Test that case, accents, punctuation and spacing are ignored."""
+        assert normalize_answer('JAY-Z') == 'jayz'
+        assert normalize_answer('Beyoncé') == 'beyonce'
+        assert normalize_answer("Guns N' Roses") == 'gunsandroses'
+        assert normalize_answer('Simon & Garfunkel') == 'simonandgarfunkel'
+    
+    def test_normalize_answer_the_and_featuring(self):
+        """Test that a leading "The" and featured artists are dropped."""
+        assert normalize_answer('The Beatles') == 'beatles'
+        assert normalize_answer('Drake feat. Rihanna') == 'drake'
+        assert normalize_answer('The The') == 'the'
+    
+    def test_answer_key_variants(self):
+        """Test that bracketed suffixes and "and" are optional."""
+        key = build_answer_key('Let It Be (Remastered 2009)')
+        assert match_guess('let it be', key) is True
+        assert match_guess('Guns and Roses', build_answer_key("Guns N' Roses")) is True
+        assert match_guess('Guns Roses', build_answer_key("Guns N' Roses")) is True
+    
+    def test_match_guess_typos(self):
+        """Test that typos are tolerated in proportion to the answer length."""
+        assert match_guess('Led Zepplin', build_answer_key('Led Zeppelin')) is True
+        assert match_guess('Nervana', build_answer_key('Nirvana')) is True
+        assert match_guess('Metallica', build_answer_key('Nirvana')) is False
+    
+    def test_match_guess_min_length(self):
+        """Test that short guesses must match exactly."""
+        assert match_guess('a', build_answer_key('ABBA')) is False
+        assert match_guess('U2', build_answer_key('U2')) is True
+        assert match_guess('U3', build_answer_key('U2')) is False
+        assert match_guess('', build_answer_key('Queen')) is False
+        assert allowed_edits(3) == 0
+    
+    def test_answer_key_alternatives(self):
+        """Test that alternative answers (other artists, aliases) are accepted."""
+        key = build_answer_key("Guns N' Roses", ['GNR', 'Slash'])
+        assert match_guess('gnr', key) is True
+        assert match_guess('Slsh', key) is True
+        assert match_guess('Sting', key) is False
+        assert match_guess('Guns N Roses', key) is True
+        assert 'gnr' in key.exact
+    
+    def test_match_guess_leniency(self):
+        """Test that each leniency level accepts progressively more."""
+        key = build_answer_key('Nirvana', phonetic=True)
+        assert match_guess('NIRVANA', key, 'strict') is True
+        assert match_guess('Nirvanna', key, 'strict') is False
+        assert match_guess('Nirvanna', key, 'normal') is True
+        assert match_guess('Nurvahna', key, 'normal') is False
+        assert match_guess('Nurvahna', key, 'easy') is True
+        assert match_guess('Metallica', key, 'easy') is False
+    
+    def test_phonetic_keys_only_when_requested(self):
+        """Test that phonetic keys are opt-in."""
+        assert build_answer_key('Phil Collins').phonetic == frozenset()
+        assert match_guess('Fill Colins', build_answer_key('Phil Collins'), 'easy') is False
+        key = build_answer_key('Phil Collins', phonetic=True)
+        assert match_guess('Fill Colins', key, 'easy') is True
+    
+    def test_phonetic_tier_rejects_sound_alike_words(self):
+        """Test that short names get no phonetic key and vowels keep words apart."""
+        collisions = {
+            'Queen': ['Keane', 'Kenny', 'Coin', 'Kane'],
+            'ABBA': ['Ebbe', 'Abbey'],
+            'Muse': ['Miss', 'Moose'],
+            'Nirvana': ['nurofen'],
+        }
+        for answer, guesses in collisions.items():
+            key = build_answer_key(answer, phonetic=True)
+            for guess in guesses:
+                assert match_guess(guess, key, 'easy') is False, (answer, guess)
+        assert build_answer_key('Queen', phonetic=True).phonetic == frozenset()
+    
+    def test_short_names_need_an_alias(self):
+        """Test that "Quin" only matches "Queen" once it is an alias."""
+        assert match_guess('Quin', build_answer_key('Queen', phonetic=True), 'easy') is False
+        key = build_answer_key('Queen', ['Quin'], phonetic=True)
+        assert match_guess('quin', key, 'strict') is True
+        assert match_guess('Kane', key, 'easy') is False
+    
+    def test_match_guesses_agrees_with_match_guess(self):
+        """Test that batch results equal checking each guess alone."""
+        key = build_answer_key("Guns N' Roses", ['GNR', 'Slash'], phonetic=True)
+        guesses = [
+            'guns n roses', 'Guns and Roses', 'gnr', 'Slsh', 'gunz n rozes',
+            'Nirvana', '', 'a', None, 'GNR', 'guns n roses'
+        ]
+        for leniency in LENIENCY_LEVELS:
+            assert match_guesses(guesses, key, leniency) == [
+                match_guess(guess, key, leniency) for guess in guesses
+            ]
+        assert match_guesses([], key) == []
@@ -0,0 +1,89 @@
+"""
+Unit tests for LeaderboardService
+
+Tests ranking, ties, one entry per game, time windows and persistence.
+"""
+
+import json
+import os
+
+import pytest
+
+from app.leaderboard import LeaderboardService
+
+
+class TestLeaderboardService:
+    """Test suite for per-list leaderboards."""
+    
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        """
+        Fixture providing a leaderboard directory.
+        
+        Returns:
+            str: Path of the directory (not created yet)
+        """
+        return str(tmp_path / "leaderboards")
+    
+    def test_ranks_and_ties(self, data_dir):
+        """Test that higher scores rank first and ties share a rank."""
+        service = LeaderboardService(data_dir)
+        service.record("party", 5, 10, "Ann", "s1")
+        service.record("party", 8, 10, "Bob", "s2")
+        tied = service.record("party", 5, 10, "Cy", "s3")
+        
+        assert tied["rank"] == 2
+        board = service.top("party")
+        assert [(entry["player_name"], entry["rank"]) for entry in board["top"]] == [
+            ("Bob", 1), ("Ann", 2), ("Cy", 2)
+        ]
+        assert all("session_id" not in entry for entry in board["top"])
+        assert service.top("party", limit=1, session_id="s3")["you"]["rank"] == 2
+    
+    def test_one_entry_per_session(self, data_dir):
+        """Test that a game cannot be recorded twice."""
+        service = LeaderboardService(data_dir)
+        assert service.record("party", 5, 10, session_id="s1") is not None
+        assert service.record("party", 9, 10, session_id="s1") is None
+        assert service.top("party")["total_entries"] == 1
+    
+    def test_scores_reloaded_from_log(self, data_dir):
+        """Test that a new service reads back the appended scores."""
+        LeaderboardService(data_dir).record("party", 7, 10, "Ann", "s1")
+        with open(os.path.join(data_dir, "party.ndjson"), 'ab') as f:
+            f.write(b'{"score": 3, "torn')
+        
+        board = LeaderboardService(data_dir).top("party", session_id="s1")
+        assert board["total_entries"] == 1
+        assert board["you"]["player_name"] == "Ann"
+    
+    def test_record_after_torn_line(self, data_dir):
+        """Test that a score appended after a crashed write is not lost."""
+        LeaderboardService(data_dir).record("party", 7, 10, "Ann", "s1")
+        with open(os.path.join(data_dir, "party.ndjson"), 'ab') as f:
+            f.write(b'{"score": 3, "torn')
+        
+        service = LeaderboardService(data_dir)
+        assert service.record("party", 5, 10, "Bob", "s2")["rank"] == 2
+        board = LeaderboardService(data_dir).top("party")
+        assert [entry["player_name"] for entry in board["top"]] == ["Ann", "Bob"]
+    
+    def test_today_window(self, data_dir):
+        """Test that older scores only count toward the all-time board."""
+        os.makedirs(data_dir)
+        old = {"score": 9.0, "total_rounds": 10, "player_name": "Old",
+               "session_id": "old", "recorded_at": "2000-01-01T20:00:00"}
+        with open(os.path.join(data_dir, "party.ndjson"), 'w') as f:
+            f.write(json.dumps(old) + "\n")
+        service = LeaderboardService(data_dir)
+        
+        entry = service.record("party", 4, 10, "New", "new")
+        assert (entry["rank"], entry["rank_today"]) == (2, 1)
+        assert service.top("party", window="today")["total_entries"] == 1
+        assert service.top("party", window="today", session_id="old")["you"] is None
+    
+    @pytest.mark.parametrize("list_id", ["../etc", "a/b", "", "x" * 65])
+    def test_invalid_list_id(self, data_dir, list_id):
+        """Test that list IDs unsafe as file names are refused."""
+        assert LeaderboardService(data_dir).record(list_id, 5, 10) is None
+        assert not os.path.exists(data_dir)
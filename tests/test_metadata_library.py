@@ -0,0 +1,248 @@
+"""
+Unit tests for the metadata library
+
+Tests the write-ahead log and checkpoints, the artist index,
+autocomplete, statistics, streaming import parsing and export, and
+that the JSON and SQLite backends agree.
+"""
+
+import asyncio
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from app.library_stream import (
+    ImportFormatError, export_chunks, gzip_chunks, iter_import_records
+)
+from app.metadata_library import MetadataLibrary
+from app.sqlite_library import SQLiteMetadataLibrary
+
+
+def save(library, song_id, name, artist, **metadata):
+    """Save a Deezer song with the given metadata."""
+    return library.save_song_metadata(song_id, "deezer", name, artist, None, None, metadata)
+
+
+async def _chunks(data, size):
+    """Yield a request body in small pieces."""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def parse_import(data, ndjson, size=7):
+    """Parse an import body fed in chunks of `size` bytes."""
+    async def collect():
+        return [record async for record in iter_import_records(_chunks(data, size), ndjson)]
+    return asyncio.run(collect())
+
+
+class TestMetadataLibrary:
+    """Test suite for the JSON metadata library."""
+    
+    @pytest.fixture
+    def library(self, tmp_path):
+        """
+        Fixture creating an empty library in a temporary directory.
+        
+        Returns:
+            MetadataLibrary: New library
+        """
+        return MetadataLibrary(str(tmp_path))
+    
+    def test_saves_are_replayed_from_the_log(self, library, tmp_path):
+        """Test that saves only append to the log and survive a restart."""
+        save(library, "1", "Bohemian Rhapsody", "Queen", genre="Rock")
+        save(library, "2", "Wonderwall", "Oasis")
+        library.delete_song("2", "deezer")
+        
+        assert len(Path(library.wal_path).read_bytes().splitlines()) == 3
+        
+        reopened = MetadataLibrary(str(tmp_path))
+        assert reopened.get_song_metadata("1", "deezer")["metadata"]["genre"] == "Rock"
+        assert reopened.get_song_metadata("2", "deezer") is None
+    
+    def test_torn_log_entry_discarded(self, library, tmp_path):
+        """Test that a half-written final entry is dropped and later saves still load."""
+        save(library, "1", "Bohemian Rhapsody", "Queen")
+        with open(library.wal_path, 'ab') as f:
+            f.write(b'{"op": "put", "key": "deezer_2", "so')
+        
+        reopened = MetadataLibrary(str(tmp_path))
+        assert reopened.get_statistics()["total_songs"] == 1
+        save(reopened, "3", "Wonderwall", "Oasis")
+        
+        songs = MetadataLibrary(str(tmp_path)).get_all_songs()
+        assert sorted(song["id"] for song in songs) == ["1", "3"]
+    
+    def test_checkpoint_writes_snapshot_and_empties_log(self, library, tmp_path):
+        """Test that a checkpoint folds the log into the snapshot."""
+        save(library, "1", "Bohemian Rhapsody", "Queen")
+        library.checkpoint()
+        
+        assert Path(library.wal_path).read_bytes() == b""
+        reopened = MetadataLibrary(str(tmp_path))
+        assert reopened.get_song_metadata("1", "deezer")["name"] == "Bohemian Rhapsody"
+        assert reopened.library["statistics"]["total_songs"] == 1
+    
+    def test_artist_index_ignores_case(self, library):
+        """Test artist lookups and suggestions across spellings of one artist."""
+        save(library, "1", "Bohemian Rhapsody", "Queen", genre="Rock")
+        save(library, "2", "Bicycle Race", "queen ", genre="Rock")
+        save(library, "3", "Wonderwall", "Oasis", genre="Britpop")
+        
+        assert {song["id"] for song in library.search_by_artist("QUEEN")} == {"1", "2"}
+        suggestions = library.get_artist_suggestions("Queen")
+        assert suggestions["count"] == 2
+        assert suggestions["suggestions"]["genre"] == "Rock"
+        
+        library.delete_song("1", "deezer")
+        assert library.get_artist_suggestions("queen")["count"] == 1
+    
+    def test_autocomplete_by_prefix(self, library):
+        """Test that titles and artists are suggested from the typed prefix."""
+        save(library, "1", "Bohemian Rhapsody", "Queen")
+        save(library, "2", "Wonderwall", "Oasis")
+        
+        assert [song["id"] for song in library.autocomplete("rhap")["songs"]] == ["1"]
+        assert [artist["artist"] for artist in library.autocomplete("OAS")["artists"]] == ["Oasis"]
+        assert library.autocomplete("zzz")["songs"] == []
+        
+        save(library, "3", "Bohemian Like You", "The Dandy Warhols")
+        assert {song["id"] for song in library.autocomplete("boh")["songs"]} == {"1", "3"}
+    
+    def test_autocomplete_returns_callers_query(self, library):
+        """Test that cached suggestions echo each caller's own spelling."""
+        save(library, "1", "Björk", "Björk")
+        
+        assert library.autocomplete("BJÖ")["query"] == "BJÖ"
+        second = library.autocomplete("bjo")
+        assert second["query"] == "bjo"
+        assert [song["id"] for song in second["songs"]] == ["1"]
+    
+    def test_statistics_count_artists_once(self, library):
+        """Test that statistics and the snapshot agree on the artist total."""
+        save(library, "1", "Bohemian Rhapsody", "Queen", genre="Rock")
+        save(library, "2", "Bicycle Race", "queen", genre="Rock")
+        library.save_song_metadata("3", "deezer", "Untitled", None, None, None, {})
+        
+        stats = library.get_statistics()
+        assert stats["total_songs"] == 3
+        assert stats["total_artists"] == 1
+        assert stats["genres"] == {"Rock": 2}
+        assert library.get_export_header()["statistics"]["total_artists"] == 1
+    
+    def test_statistics_follow_updates_and_deletes(self, library):
+        """Test that running counters move when a song changes or is removed."""
+        save(library, "1", "Bohemian Rhapsody", "Queen", genre="Rock", decade="1970s")
+        save(library, "1", "Bohemian Rhapsody", "Queen", genre="Opera", decade="1970s")
+        
+        stats = library.get_statistics()
+        assert (stats["genres"], stats["decades"]) == ({"Opera": 1}, {"1970s": 1})
+        
+        library.delete_song("1", "deezer")
+        assert library.get_statistics()["total_songs"] == 0
+        assert library.get_statistics()["total_artists"] == 0
+    
+    def test_streaming_import_parses_small_chunks(self, library):
+        """Test that every import format parses when split mid-entry and mid-character."""
+        songs = {
+            "deezer_1": {"id": "1", "provider": "deezer", "name": "Björk", "artist": "Björk"},
+            "deezer_2": {"id": "2", "provider": "deezer", "name": "Wonderwall", "plays": 12}
+        }
+        export = json.dumps({"version": 2, "songs": songs, "statistics": {}}, ensure_ascii=False)
+        array = json.dumps(list(songs.values()), ensure_ascii=False)
+        ndjson = "\n".join(json.dumps(song) for song in songs.values()) + "\n\n"
+        
+        for size in (1, 3, 7):
+            assert parse_import(export.encode(), ndjson=False, size=size) == list(songs.items())
+            assert parse_import(array.encode(), ndjson=False, size=size) == list(songs.items())
+            assert parse_import(ndjson.encode(), ndjson=True, size=size) == list(songs.items())
+        
+        assert parse_import(b'[{"name": "No ID"}, 5]', ndjson=False) == [None, None]
+        assert library.merge_songs(parse_import(array.encode(), ndjson=False)) == 2
+        assert library.get_song_metadata("1", "deezer")["artist"] == "Björk"
+    
+    def test_streaming_import_rejects_malformed_bodies(self):
+        """Test that truncated or invalid bodies raise ImportFormatError."""
+        with pytest.raises(ImportFormatError):
+            parse_import(b'[{"id": "1", "provider": "deezer"}', ndjson=False)
+        with pytest.raises(ImportFormatError):
+            parse_import(b'"songs"', ndjson=False)
+        with pytest.raises(ImportFormatError, match="line 2"):
+            parse_import(b'{"id": "1"}\n{"id": ', ndjson=True)
+    
+    def test_streaming_import_and_export_round_trip(self, library, tmp_path):
+        """Test that an export parsed in small chunks imports the same songs."""
+        save(library, "1", "Bohemian Rhapsody", "Queen", genre="Rock")
+        save(library, "2", "Wonderwall", "Oasis")
+        
+        exported = b"".join(export_chunks(library.iter_songs(), "json", library.get_export_header()))
+        assert json.loads(exported)["songs"].keys() == {"deezer_1", "deezer_2"}
+        records = parse_import(exported, ndjson=False)
+        
+        target = MetadataLibrary(str(tmp_path / "copy"))
+        assert target.merge_songs(records) == 2
+        assert target.get_song_metadata("1", "deezer")["metadata"]["genre"] == "Rock"
+        
+        array = b"".join(export_chunks(library.iter_songs(), "array"))
+        assert parse_import(array, ndjson=False) == records
+        ndjson = gzip.decompress(b"".join(gzip_chunks(export_chunks(library.iter_songs(), "ndjson"))))
+        assert parse_import(ndjson, ndjson=True) == records
+    
+    def test_merge_keeps_newer_entries(self, library):
+        """Test that an import does not overwrite a song with an older copy."""
+        song = save(library, "1", "Bohemian Rhapsody", "Queen")
+        older = {**song, "name": "Old title", "last_updated": "2000-01-01T00:00:00"}
+        
+        assert library.merge_songs([("deezer_1", older)]) == 0
+        assert library.get_song_metadata("1", "deezer")["name"] == "Bohemian Rhapsody"
+
+
+class TestSQLiteMetadataLibrary:
+    """Test suite for the SQLite backend."""
+    
+    def test_matches_json_backend(self, tmp_path):
+        """Test that both backends report the same lookups and totals."""
+        libraries = [
+            MetadataLibrary(str(tmp_path / "json")),
+            SQLiteMetadataLibrary(str(tmp_path / "sqlite"))
+        ]
+        for library in libraries:
+            save(library, "1", "Bohemian Rhapsody", "Queen", genre="Rock")
+            save(library, "2", "Bicycle Race", "queen", genre="Rock")
+            library.save_song_metadata("3", "deezer", "Untitled", None, None, None, {})
+        
+        for library in libraries:
+            stats = library.get_statistics()
+            assert (stats["total_songs"], stats["total_artists"]) == (3, 1)
+            assert library.get_export_header()["statistics"]["total_artists"] == 1
+            assert {song["id"] for song in library.search_by_artist("QUEEN")} == {"1", "2"}
+            assert library.get_artist_suggestions("Queen")["suggestions"]["genre"] == "Rock"
+            assert [song["id"] for song in library.autocomplete("bic")["songs"]] == ["2"]
+            assert library.fuzzy_search("bicycle rase")[0]["value"] == "Bicycle Race"
+    
+    def test_imports_json_library_on_first_start(self, tmp_path):
+        """Test that an existing JSON library and its log are carried over."""
+        json_library = MetadataLibrary(str(tmp_path))
+        save(json_library, "1", "Bohemian Rhapsody", "Queen")
+        json_library.checkpoint()
+        save(json_library, "2", "Wonderwall", "Oasis")
+        
+        library = SQLiteMetadataLibrary(str(tmp_path))
+        assert library.get_statistics()["total_songs"] == 2
+        assert library.get_song_metadata("2", "deezer")["artist"] == "Oasis"
+        
+        library.delete_song("2", "deezer")
+        assert SQLiteMetadataLibrary(str(tmp_path)).get_statistics()["total_songs"] == 1
+    
+    def test_version_shared_between_instances(self, tmp_path):
+        """Test that a save through one connection changes the other's version."""
+        first = SQLiteMetadataLibrary(str(tmp_path))
+        second = SQLiteMetadataLibrary(str(tmp_path))
+        version = second.get_version()
+        
+        save(first, "1", "Bohemian Rhapsody", "Queen")
+        assert second.get_version() != version
+        assert second.get_song_metadata("1", "deezer")["name"] == "Bohemian Rhapsody"
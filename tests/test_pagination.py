@@ -0,0 +1,57 @@
+"""
+Unit tests for the admin API pagination helpers
+
+Tests cursor encoding, page slicing, field projection and NDJSON lines.
+"""
+
+import json
+
+import pytest
+
+from app.custom_lists_models import CustomSong
+from app.pagination import (
+    DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor, ndjson_lines, paginate, parse_fields
+)
+
+
+class TestPagination:
+    """Test suite for cursor pagination."""
+    
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes to the offset it encodes."""
+        assert decode_cursor(encode_cursor(250)) == 250
+        assert decode_cursor(None) == 0
+    
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(-1), "eyJvIjoiMSJ9"])
+    def test_invalid_cursor_rejected(self, cursor):
+        """Test that malformed or negative cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+    
+    def test_pages_cover_every_item_once(self):
+        """Test walking all pages with the returned cursors."""
+        items = list(range(25))
+        seen, cursor = [], None
+        while True:
+            page, cursor = paginate(items, cursor, 10)
+            seen.extend(page)
+            if cursor is None:
+                break
+        assert seen == items
+    
+    def test_default_page_size(self):
+        """Test that pages are bounded when no size is given."""
+        page, cursor = paginate(list(range(DEFAULT_PAGE_SIZE + 5)), None, None)
+        assert len(page) == DEFAULT_PAGE_SIZE
+        assert decode_cursor(cursor) == DEFAULT_PAGE_SIZE
+    
+    def test_field_projection(self):
+        """Test that only requested fields are kept and unknown ones rejected."""
+        fields = parse_fields("name, artist", CustomSong)
+        song = CustomSong(id="1", name="Wonderwall", artist="Oasis")
+        
+        line = next(ndjson_lines([song], fields))
+        assert json.loads(line) == {"name": "Wonderwall", "artist": "Oasis"}
+        assert line.endswith(b"\n")
+        with pytest.raises(ValueError):
+            parse_fields("name,bogus", CustomSong)
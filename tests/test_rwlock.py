@@ -0,0 +1,97 @@
+"""
+Unit tests for the reader-writer lock
+
+Tests shared reads, exclusive writes and writer preference.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.rwlock import ReadWriteLock
+
+
+def start(target):
+    """Run a function in a daemon thread."""
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestReadWriteLock:
+    """Test suite for ReadWriteLock."""
+    
+    def test_readers_share_the_lock(self):
+        """Test that several readers hold the lock at the same time."""
+        lock = ReadWriteLock()
+        barrier = threading.Barrier(3, timeout=2)
+        
+        def reader():
+            with lock.read():
+                barrier.wait()
+        
+        threads = [start(reader) for _ in range(2)]
+        barrier.wait()
+        for thread in threads:
+            thread.join(2)
+    
+    def test_writer_excludes_readers(self):
+        """Test that a reader waits until the writer releases the lock."""
+        lock = ReadWriteLock()
+        events = []
+        
+        def reader():
+            with lock.read():
+                events.append("read")
+        
+        with lock.write():
+            thread = start(reader)
+            time.sleep(0.05)
+            events.append("write done")
+        thread.join(2)
+        
+        assert events == ["write done", "read"]
+    
+    def test_waiting_writer_blocks_new_readers(self):
+        """Test that readers arriving after a waiting writer go after it."""
+        lock = ReadWriteLock()
+        events = []
+        
+        def writer():
+            with lock.write():
+                events.append("write")
+        
+        def reader():
+            with lock.read():
+                events.append("late read")
+        
+        with lock.read():
+            writer_thread = start(writer)
+            time.sleep(0.05)
+            reader_thread = start(reader)
+            time.sleep(0.05)
+            assert events == []
+        writer_thread.join(2)
+        reader_thread.join(2)
+        
+        assert events == ["write", "late read"]
+    
+    def test_released_on_error(self):
+        """Test that an exception inside either lock releases it."""
+        lock = ReadWriteLock()
+        with pytest.raises(RuntimeError):
+            with lock.write():
+                raise RuntimeError
+        with pytest.raises(RuntimeError):
+            with lock.read():
+                raise RuntimeError
+        
+        acquired = []
+        
+        def writer():
+            with lock.write():
+                acquired.append(True)
+        
+        start(writer).join(2)
+        assert acquired == [True]
@@ -0,0 +1,62 @@
+"""
+Unit tests for the fuzzy search index
+
+Tests trigram candidate filtering, edit-distance ranking and reference
+counting.
+"""
+
+from app.search_index import TrigramIndex, max_edits, trigrams
+
+
+class TestTrigramIndex:
+    """Test suite for TrigramIndex."""
+    
+    def test_finds_spelling_variants(self):
+        """Test that punctuation, case and small typos still match."""
+        index = TrigramIndex()
+        index.add("Guns N' Roses", "a")
+        index.add("The Rolling Stones", "b")
+        index.add("Queen", "c")
+        
+        matches = index.search("guns n roses")
+        assert [match.text for match in matches] == ["Guns N' Roses"]
+        assert matches[0].refs == {"a": 1}
+        
+        typo = index.search("the rolling stnoes")
+        assert [(match.text, match.distance) for match in typo] == [("The Rolling Stones", 2)]
+        assert index.search("Oasis") == []
+        assert index.search("") == []
+    
+    def test_orders_by_distance(self):
+        """Test that closer names come first and the limit applies."""
+        index = TrigramIndex()
+        for name in ["Beatles", "Beatle", "Beadles"]:
+            index.add(name, name)
+        
+        matches = index.search("beatles", limit=2)
+        assert [(match.text, match.distance) for match in matches] == [("Beatles", 0), ("Beatle", 1)]
+        assert index.search("beatles", max_distance=0)[0].text == "Beatles"
+        assert len(index.search("beatles", max_distance=0)) == 1
+    
+    def test_reference_counts(self):
+        """Test that a name stays indexed until every reference removes it."""
+        index = TrigramIndex()
+        index.add("Queen", "list-1")
+        index.add("queen", "list-1")
+        index.add("Queen", "list-2")
+        assert len(index) == 1
+        assert index.search("queen")[0].refs == {"list-1": 2, "list-2": 1}
+        
+        index.remove("Queen", "list-1")
+        index.remove("Queen", "list-2")
+        assert index.search("queen")[0].refs == {"list-1": 1}
+        index.remove("Queen", "list-1")
+        index.remove("Queen", "unknown")
+        assert len(index) == 0
+        assert index.search("queen") == []
+    
+    def test_short_names_have_trigrams(self):
+        """Test padding and the length-based edit budget."""
+        assert trigrams("ab") == {"  a", " ab", "ab "}
+        assert max_edits("abc") == 1
+        assert max_edits("a" * 40) == 3
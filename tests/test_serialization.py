@@ -0,0 +1,46 @@
+"""
+Unit tests for the storage serialization layer
+
+Tests compact encoding, reading legacy pretty-printed files and optional
+zstd compression.
+"""
+
+import json
+
+import pytest
+
+from app import serialization
+from app.serialization import dumps, loads, read_json_file, write_json_file
+
+
+class TestSerialization:
+    """Test suite for storage file encoding."""
+    
+    def test_dumps_is_compact_and_round_trips(self):
+        """Test that encoded JSON has no padding and decodes to the same object."""
+        data = {"name": "Beyoncé", "songs": [1, 2.5, None, True]}
+        encoded = dumps(data)
+        
+        assert b" " not in encoded.replace("Beyoncé".encode(), b"")
+        assert loads(encoded) == data
+        assert loads(encoded.decode()) == data
+    
+    def test_reads_legacy_pretty_printed_files(self, tmp_path):
+        """Test that files written before the compact format still load."""
+        path = tmp_path / "list.json"
+        path.write_text(json.dumps({"id": "abc", "songs": []}, indent=2))
+        
+        assert read_json_file(path) == {"id": "abc", "songs": []}
+    
+    def test_compressed_files_detected_on_read(self, tmp_path):
+        """Test that zstd files are written smaller and read back transparently."""
+        if serialization.zstandard is None:
+            pytest.skip("zstandard not installed")
+        data = {"songs": [{"name": f"Song {i}", "artist": "Artist"} for i in range(200)]}
+        plain, compressed = tmp_path / "plain.json", tmp_path / "compressed.json"
+        write_json_file(plain, data, compress=False)
+        write_json_file(compressed, data, compress=True)
+        
+        assert compressed.read_bytes().startswith(serialization.ZSTD_MAGIC)
+        assert compressed.stat().st_size < plain.stat().st_size
+        assert read_json_file(compressed) == read_json_file(plain) == data
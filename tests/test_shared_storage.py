@@ -0,0 +1,90 @@
+"""
+Tests for sharing stored data between worker processes
+
+Each test opens the same directory from two service instances (or
+several forked processes), the way uvicorn workers do.
+"""
+
+import multiprocessing
+
+from app import metadata_library
+from app.leaderboard import LeaderboardService
+from app.metadata_library import MetadataLibrary
+
+
+def save(library, song_id, name="Song", artist="Artist"):
+    """Save a Deezer song."""
+    return library.save_song_metadata(song_id, "deezer", name, artist, None, None, {})
+
+
+def _save_songs(data_dir, worker, count):
+    """Save songs from a child process (checkpointing often)."""
+    metadata_library.WAL_CHECKPOINT_ENTRIES = 7
+    library = MetadataLibrary(data_dir)
+    for i in range(count):
+        save(library, f"{worker}-{i}")
+
+
+class TestSharedMetadataLibrary:
+    """Test suite for a metadata library used by several workers."""
+    
+    def test_workers_see_each_others_saves(self, tmp_path):
+        """Test that appends and deletes from one worker reach the other."""
+        first = MetadataLibrary(str(tmp_path))
+        second = MetadataLibrary(str(tmp_path))
+        
+        save(first, "1", "Wonderwall", "Oasis")
+        assert second.get_song_metadata("1", "deezer")["name"] == "Wonderwall"
+        assert [song["id"] for song in second.search_by_artist("oasis")] == ["1"]
+        
+        save(second, "1", "Wonderwall", "Oasis")
+        assert first.get_song_metadata("1", "deezer")["times_used"] == 2
+        first.delete_song("1", "deezer")
+        assert second.get_statistics()["total_songs"] == 0
+        assert first.get_version() == second.get_version()
+    
+    def test_checkpoint_keeps_other_workers_saves(self, tmp_path):
+        """Test that a checkpoint includes, and does not drop, another worker's songs."""
+        first = MetadataLibrary(str(tmp_path))
+        second = MetadataLibrary(str(tmp_path))
+        save(first, "1")
+        save(second, "2")
+        
+        first.checkpoint()
+        save(second, "3")
+        second.checkpoint()
+        
+        assert {song["id"] for song in first.get_all_songs()} == {"1", "2", "3"}
+        assert {song["id"] for song in MetadataLibrary(str(tmp_path)).get_all_songs()} == {"1", "2", "3"}
+    
+    def test_concurrent_processes_lose_no_saves(self, tmp_path):
+        """Test saves from several processes, with checkpoints in between."""
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_save_songs, args=(str(tmp_path), worker, 30))
+            for worker in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        
+        library = MetadataLibrary(str(tmp_path))
+        assert library.get_statistics()["total_songs"] == 120
+
+
+class TestSharedLeaderboard:
+    """Test suite for leaderboards recorded by several workers."""
+    
+    def test_workers_rank_each_others_scores(self, tmp_path):
+        """Test that scores recorded by one worker count in the other's ranks."""
+        first = LeaderboardService(str(tmp_path))
+        second = LeaderboardService(str(tmp_path))
+        assert first.top("party")["total_entries"] == 0
+        
+        second.record("party", 9, 10, "Bob", "s1")
+        entry = first.record("party", 5, 10, "Ann", "s2")
+        
+        assert entry["rank"] == 2
+        assert second.top("party")["total_entries"] == 2
+        assert first.record("party", 7, 10, "Ann", "s1") is None
@@ -0,0 +1,61 @@
+"""
+Unit tests for text normalization helpers
+
+Tests folding, normalization and word suffixes used for search.
+"""
+
+from src.text_utils import (
+    bitparallel_distances, bounded_levenshtein, fold_text, normalize_text,
+    phonetic_key, word_suffixes
+)
+
+
+class TestTextUtils:
+    """Test suite for text normalization functions."""
+    
+    def test_fold_text_strips_accents_and_case(self):
+        """Test that accents and case are ignored."""
+        assert fold_text('Beyoncé') == 'beyonce'
+        assert fold_text('MOTÖRHEAD') == 'motorhead'
+    
+    def test_fold_text_empty(self):
+        """Test that None and empty strings fold to empty."""
+        assert fold_text(None) == ''
+        assert fold_text('') == ''
+    
+    def test_normalize_text_punctuation(self):
+        """Test that apostrophes are dropped and other punctuation splits words."""
+        assert normalize_text("Guns N' Roses") == 'guns n roses'
+        assert normalize_text('AC/DC') == 'ac dc'
+        assert normalize_text("  Don't  Stop Me Now! ") == 'dont stop me now'
+    
+    def test_word_suffixes(self):
+        """Test that every word start is indexed."""
+        assert word_suffixes('The Beatles') == ['the beatles', 'beatles']
+        assert word_suffixes('') == []
+    
+    def test_word_suffixes_max_words(self):
+        """Test that the number of suffixes is bounded."""
+        assert len(word_suffixes('a b c d e f g h', max_words=3)) == 3
+    
+    def test_phonetic_key_sound_alikes(self):
+        """Test that different spellings of the same sounds share a key."""
+        assert phonetic_key('Nervana') == phonetic_key('Nirvana')
+        assert phonetic_key('Quin') == phonetic_key('Queen')
+        assert phonetic_key('Phil Collins') == phonetic_key('Fil Colins')
+        assert phonetic_key('Beyonsay') == phonetic_key('Beyoncé')
+        assert phonetic_key('Madonna') != phonetic_key('Metallica')
+        assert phonetic_key('Nurofen') != phonetic_key('Nirvana')
+    
+    def test_phonetic_key_empty(self):
+        """Test that empty text has an empty key."""
+        assert phonetic_key(None) == ''
+        assert phonetic_key('!!') == ''
+    
+    def test_bitparallel_distances(self):
+        """Test that bulk distances agree with the banded edit distance."""
+        texts = ['kitten', 'sitting', '', 'kitchen', 'k' * 80]
+        expected = [bounded_levenshtein('kitten', text, 80) for text in texts]
+        assert bitparallel_distances('kitten', texts) == expected
+        assert bitparallel_distances('kitten', ['sitting']) == [3]
+        assert bitparallel_distances('', ['abc']) == [3]